@@ -15,7 +15,7 @@ from app.config import get_settings
 from app.models.state import FleetStatus, MinerState, CommandLog, SystemConfig
 from app.services.fleet_manager import get_fleet_manager
 from app.services.awesome_miner import get_awesome_miner_client
-from app.services.miner_discovery import get_discovery_service
+from app.services.miner_discovery import get_discovery_service, parse_chip_board
 from app.services.vnish_power import get_vnish_power_service, VALID_FREQUENCIES
 
 logger = structlog.get_logger()
@@ -507,7 +507,7 @@ async def health_check():
         # Direct mode - check if we have miners
         discovery = get_discovery_service()
         miners_count = len(discovery.miners)
-        online_count = sum(1 for m in discovery.miners if m.is_online)
+        online_count = discovery.online_count
         
         return {
             "healthy": online_count > 0 or True,  # Healthy even with no miners (discovery mode)
@@ -922,7 +922,7 @@ async def calculate_power_allocation(request: PowerAllocationRequest):
     # Get all online miners
     miners = [
         {'ip': m.ip, 'id': m.id, 'is_mining': m.is_mining, 'is_online': m.is_online}
-        for m in discovery.miners
+        for m in discovery.miners_sorted_by_ip
         if m.is_online
     ]
     
@@ -944,7 +944,8 @@ async def calculate_power_allocation(request: PowerAllocationRequest):
     allocation = vnish.get_power_allocation(
         request.target_power_kw,
         miners,
-        full_power_watts=1460
+        full_power_watts=1460,
+        presorted=True
     )
     
     # Summarize
@@ -1235,7 +1236,7 @@ async def remove_miner(miner_id: str):
         )
     
     discovery = get_discovery_service()
-    success = discovery.remove_miner(miner_id)
+    success = await discovery.remove_miner(miner_id)
     
     return {
         "success": success,
@@ -1831,51 +1832,41 @@ async def get_chip_hashrate(miner_ip: str):
             dead_chips = 0
             
             for board_idx, board_data in enumerate(chip_hr_data):
-                chips = []
-                hashrates = []
-                
                 # Parse Asic00, Asic01, ... AsicNN format
-                for key, value in sorted(board_data.items()):
-                    if key.startswith("Asic"):
-                        try:
-                            chip_idx = int(key.replace("Asic", ""))
-                            hr = int(value) if value else 0
-                            hashrates.append(hr)
-                            
-                            # Determine chip status based on hashrate
-                            # Typical good S9 chip: 60-75 MH/s
-                            status = "ok"
-                            if hr == 0:
-                                status = "dead"
-                                dead_chips += 1
-                            elif hr < 40:
-                                status = "warning"
-                                warning_chips += 1
-                            else:
-                                healthy_chips += 1
-                            
-                            chips.append({
-                                "index": chip_idx,
-                                "hashrate_mhs": hr,
-                                "status": status
-                            })
-                            total_chips += 1
-                        except (ValueError, TypeError):
-                            pass
+                indices, hashrates = parse_chip_board(board_data)
+                if not hashrates:
+                    continue
+                
+                # Determine chip status based on hashrate
+                # Typical good S9 chip: 60-75 MH/s
+                statuses = [
+                    "dead" if hr == 0 else "warning" if hr < 40 else "ok"
+                    for hr in hashrates
+                ]
+                board_dead = hashrates.count(0)
+                board_warning = statuses.count("warning")
+                dead_chips += board_dead
+                warning_chips += board_warning
+                healthy_chips += len(hashrates) - board_dead - board_warning
+                total_chips += len(hashrates)
+                
+                chips = [
+                    {"index": chip_idx, "hashrate_mhs": hr, "status": status}
+                    for chip_idx, hr, status in zip(indices, hashrates, statuses)
+                ]
                 
                 # Calculate board stats
-                if hashrates:
-                    non_zero_rates = [h for h in hashrates if h > 0]
-                    boards.append({
-                        "id": board_idx + 1,
-                        "chips": chips,
-                        "chip_count": len(chips),
-                        "avg_hashrate_mhs": round(sum(non_zero_rates) / len(non_zero_rates), 1) if non_zero_rates else 0,
-                        "min_hashrate_mhs": min(non_zero_rates) if non_zero_rates else 0,
-                        "max_hashrate_mhs": max(non_zero_rates) if non_zero_rates else 0,
-                        "total_hashrate_ghs": round(sum(hashrates) / 1000, 2),
-                        "bad_chips": sum(1 for c in chips if c["status"] != "ok")
-                    })
+                non_zero_rates = [h for h in hashrates if h > 0]
+                boards.append({
+                    "id": board_idx + 1,
+                    "chips": chips,
+                    "chip_count": len(chips),
+                    "avg_hashrate_mhs": round(sum(non_zero_rates) / len(non_zero_rates), 1) if non_zero_rates else 0,
+                    "min_hashrate_mhs": min(non_zero_rates) if non_zero_rates else 0,
+                    "max_hashrate_mhs": max(non_zero_rates) if non_zero_rates else 0,
+                    "total_hashrate_ghs": round(sum(hashrates) / 1000, 2),
+                    "bad_chips": board_dead + board_warning
+                })
             
             return {
                 "success": True,
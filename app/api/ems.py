@@ -4,7 +4,7 @@ EMS API Routes.
 These routes implement the EMS protocol specification for third-party device integration.
 All endpoints are exposed under /api/ prefix.
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi import status as http_status
 from fastapi.responses import JSONResponse
 import structlog
@@ -16,7 +16,7 @@ from app.models.ems import (
     CommandResponse,
     RunningStatus
 )
-from app.services.maestro import get_maestro
+from app.services.maestro import Maestro, get_maestro
 
 logger = structlog.get_logger()
 
@@ -71,7 +71,7 @@ router = APIRouter(prefix="/api", tags=["EMS Protocol"])
         }
     }
 )
-async def get_status():
+async def get_status(maestro: Maestro = Depends(get_maestro)):
     """
     Get the current operational status of the mining fleet.
     
@@ -82,8 +82,6 @@ async def get_status():
     - Current active power consumption (kW)
     """
     try:
-        maestro = get_maestro()
-        
         return StatusResponse(
             is_available_for_dispatch=maestro.is_available,
             running_status=maestro.running_status.value,
@@ -151,7 +149,7 @@ async def get_status():
         }
     }
 )
-async def activate(request: ActivateRequest):
+async def activate(request: ActivateRequest, maestro: Maestro = Depends(get_maestro)):
     """
     Activate the mining fleet at the requested power level.
     
@@ -160,8 +158,6 @@ async def activate(request: ActivateRequest):
     a 400 error is returned.
     """
     try:
-        maestro = get_maestro()
-        
         logger.info(
             "Activation request received",
             power_kw=request.activation_power_in_kw
@@ -241,7 +237,10 @@ async def activate(request: ActivateRequest):
         }
     }
 )
-async def deactivate(request: DeactivateRequest = None):
+async def deactivate(
+    request: DeactivateRequest = None,
+    maestro: Maestro = Depends(get_maestro)
+):
     """
     Deactivate the mining fleet and return to standby mode.
     
@@ -249,8 +248,6 @@ async def deactivate(request: DeactivateRequest = None):
     this is a no-op and success is returned.
     """
     try:
-        maestro = get_maestro()
-        
         logger.info("Deactivation request received")
         
         success, message = await maestro.deactivate()
@@ -33,6 +33,7 @@ class Settings(BaseSettings):
     vnish_username: str = "root"  # Vnish Web API username
     vnish_password: str = "root"  # Vnish Web API password
     vnish_port: int = 80  # Vnish Web API port
+    vnish_http_backend: str = "aiohttp"  # Vnish CGI HTTP client: "aiohttp" (shared connector) or "httpx"
     
     # IPs to exclude from miner discovery (non-miner devices: gateway, server, switches)
     discovery_exclude_ips: str = "192.168.95.2,192.168.95.6,192.168.95.10,192.168.95.131"
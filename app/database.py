@@ -295,6 +295,35 @@ class DatabaseService:
             db.refresh(miner)
             return miner
     
+    def upsert_miners_batch(self, miners: List[Dict[str, Any]]):
+        """
+        Create or update multiple miner records in a single transaction.
+        
+        Args:
+            miners: List of field dicts, each including 'ip'
+        """
+        if not miners:
+            return
+        now = datetime.utcnow()
+        with get_db() as db:
+            ips = [m["ip"] for m in miners]
+            existing = {
+                record.ip: record
+                for record in db.query(MinerRecord).filter(MinerRecord.ip.in_(ips))
+            }
+            for fields in miners:
+                record = existing.get(fields["ip"])
+                if record:
+                    for key, value in fields.items():
+                        if hasattr(record, key) and value is not None:
+                            setattr(record, key, value)
+                else:
+                    record = MinerRecord(**fields)
+                    existing[record.ip] = record
+                    db.add(record)
+                record.last_seen = now
+            db.commit()
+    
     def update_miner_last_seen(self, ip: str):
         """Update miner's last_seen timestamp."""
         with get_db() as db:
@@ -26,7 +26,9 @@ logging.basicConfig(
 )
 from app.api.ems import router as ems_router
 from app.api.dashboard_v2 import router as dashboard_router
+from app.services.awesome_miner import get_awesome_miner_client
 from app.services.maestro import get_maestro
+from app.services.miner_discovery import get_vnish_transport
 
 # Configure structured logging
 structlog.configure(
@@ -70,6 +72,8 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down Grid Stabilization server")
     await maestro.stop()
+    await get_vnish_transport().aclose()
+    await get_awesome_miner_client().close()
 
 
 # Create FastAPI application
@@ -32,6 +32,10 @@ class MinerState(BaseModel):
     last_update: datetime = Field(default_factory=datetime.utcnow)
     error: Optional[str] = None
     
+    class Config:
+        # Snapshots: built once per poll and never edited afterwards
+        frozen = True
+    
     @property
     def is_available(self) -> bool:
         """Check if miner is available for dispatch."""
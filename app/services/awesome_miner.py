@@ -15,6 +15,16 @@ from app.models.miner import MinerInfo, MinerStatus
 
 logger = structlog.get_logger()
 
+# Keep connections alive across poll cycles (the default 5s expiry equals
+# the poll interval, so every poll reconnected) and cap batch fan-out.
+_POOL_LIMITS = httpx.Limits(
+    max_connections=64,
+    max_keepalive_connections=64,
+    keepalive_expiry=90.0,
+)
+# Connect-level retries; httpcore backs off exponentially between attempts
+_CONNECT_RETRIES = 2
+
 
 class AwesomeMinerError(Exception):
     """Exception raised for AwesomeMiner API errors."""
@@ -45,8 +55,12 @@ class AwesomeMinerClient:
             
             self._client = httpx.AsyncClient(
                 base_url=self.base_url,
-                timeout=httpx.Timeout(10.0, connect=5.0),
-                headers=headers
+                # No pool timeout: batch operations queue for a free connection
+                timeout=httpx.Timeout(10.0, connect=5.0, pool=None),
+                headers=headers,
+                transport=httpx.AsyncHTTPTransport(
+                    limits=_POOL_LIMITS, retries=_CONNECT_RETRIES
+                ),
             )
         return self._client
     
@@ -426,6 +426,10 @@ class FleetManager:
             except asyncio.CancelledError:
                 pass
             logger.info("Stopped power regulation loop")
+        
+        await self.discovery.aclose()
+        if self.vnish_power is not None:
+            await self.vnish_power.close()
     
     async def _polling_loop(self):
         """Background loop that polls miner status."""
@@ -976,6 +980,7 @@ class FleetManager:
         total_rated_kw = 0.0
         online_count = 0
         mining_count = 0
+        transitioning_count = 0
         
         # Idle power consumption for control board (18W per miner when online but not mining)
         IDLE_POWER_KW = 0.018
@@ -996,6 +1001,10 @@ class FleetManager:
             # This ensures we know total fleet capacity
             total_rated_kw += state.rated_power_kw
             
+            # Counted here so the meter calibration below needn't re-walk the fleet
+            if miner.is_transitioning:
+                transitioning_count += 1
+            
             if state.is_online:
                 online_count += 1
                 if state.is_mining:
@@ -1043,7 +1052,6 @@ class FleetManager:
                 # Guard 4: clamp final EMA value to sane range
                 _MIN_PER_MINER_KW = 1.5   # Minimum (underclocked / low-power)
                 _MAX_PER_MINER_KW = 4.0   # Maximum (S19 95TH rated 3250 W)
-                transitioning_count = sum(1 for m in miners if m.is_transitioning)
                 transitioning_pct = (transitioning_count / len(miners) * 100) if miners else 0
 
                 if (mining_count >= 5
@@ -1709,21 +1717,22 @@ class FleetManager:
         # Define full power per miner (watts) - use first miner's rated power or default
         full_power_watts = int(all_miners[0].rated_power_watts) if all_miners else 1460
         
-        # Calculate power allocation using VnishPowerService
+        # Calculate power allocation using VnishPowerService; the registry
+        # keeps an IP-ordered view, so the allocator need not sort
+        miners_by_ip = {m.ip: m for m in all_miners}
         miner_info_list = [
             {'ip': m.ip, 'id': m.id, 'is_mining': m.is_mining, 'is_online': m.is_online}
-            for m in all_miners
+            for m in self.discovery.miners_sorted_by_ip
+            if m.ip in miners_by_ip
         ]
         
         allocation = self.vnish_power.get_power_allocation(
             target_power_kw,
             miner_info_list,
-            full_power_watts
+            full_power_watts,
+            presorted=True
         )
         
-        for a in allocation:
-            m = next((m for m in all_miners if m.ip == a['ip']), None)
-        
         logger.info(
             "Fractional power activation",
             target_kw=target_power_kw,
@@ -1743,7 +1752,7 @@ class FleetManager:
             voltage = alloc['voltage']
             
             # Find the miner object
-            miner = next((m for m in all_miners if m.ip == ip), None)
+            miner = miners_by_ip.get(ip)
             if not miner:
                 continue
             
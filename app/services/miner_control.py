@@ -15,9 +15,11 @@ Vnish 3.9.0 S9 specifics:
 """
 import asyncio
 import json
+import re
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
+from functools import lru_cache
 from typing import Optional, Dict, Any, List, Tuple
 
 import httpx
@@ -679,6 +681,28 @@ async def identify_miner(miner: Miner) -> bool:
     return False
 
 
+# ── Model → rated power (kW) ──────────────────────────────────────
+# Series tokens in a lowercased model string.  When a string names several
+# series, the first in _SERIES_PRIORITY wins.
+_MODEL_SERIES_RE = re.compile(r"s(?:9|17|19|21)|t(?:9|17|19)")
+_SERIES_PRIORITY = ("s9", "s17", "s19", "s21", "t9", "t17", "t19")
+_MODEL_POWER_KW: Dict[Tuple[str, str], float] = {
+    # S-series (SHA-256)
+    ("s9", ""): 1.4,
+    ("s17", ""): 2.4,
+    ("s17", "pro"): 2.8,
+    ("s19", ""): 3.25,   # S19 95TH rated 3250 W
+    ("s19", "pro"): 3.25,
+    ("s19", "xp"): 3.25,
+    ("s21", ""): 3.5,
+    # T-series
+    ("t9", ""): 1.45,
+    ("t17", ""): 2.2,
+    ("t19", ""): 3.15,
+}
+
+
+@lru_cache(maxsize=256)
 def estimate_miner_power_kw(model: str) -> float:
     """
     Estimate rated power (kW) from a miner model string.
@@ -689,27 +713,13 @@ def estimate_miner_power_kw(model: str) -> float:
     """
     m = model.lower()
 
-    # S-series (SHA-256)
-    if "s9" in m:
-        return 1.4
-    if "s17" in m:
-        return 2.8 if "pro" in m else 2.4
-    if "s19" in m:
-        if "xp" in m:
-            return 3.25
-        if "pro" in m:
-            return 3.25
-        return 3.25   # S19 95TH rated 3250 W
-    if "s21" in m:
-        return 3.5
-
-    # T-series
-    if "t9" in m:
-        return 1.45
-    if "t17" in m:
-        return 2.2
-    if "t19" in m:
-        return 3.15
+    found = _MODEL_SERIES_RE.findall(m)
+    if found:
+        series = min(found, key=_SERIES_PRIORITY.index)
+        for variant in ("xp", "pro"):
+            if variant in m and (series, variant) in _MODEL_POWER_KW:
+                return _MODEL_POWER_KW[(series, variant)]
+        return _MODEL_POWER_KW[(series, "")]
 
     # Whatsminers
     if "whatsminer" in m:
@@ -65,20 +65,34 @@ Vnish 1.x+ (S17/T17/S19) uses REST API at /api/v1/:
   Docs: https://bitbucket.org/anthill-farm/miner-dash-api/
 """
 import asyncio
+import hashlib
+import http.cookiejar
 import json
+import logging
+import os
+import random
 import re
 import socket
+import struct
 import ipaddress
+import time
 import httpx
+from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Optional, List, Dict, Any, Tuple
+from functools import lru_cache, wraps
+from operator import attrgetter, itemgetter
+from types import MappingProxyType
+from typing import Optional, List, Dict, Any, Iterator, Tuple, Mapping, NamedTuple, Union
 
+import aiohttp
 import structlog
 
 from app.config import get_settings
 logger = structlog.get_logger()
+# stdlib logger behind structlog's filter_by_level, for cheap level checks
+_stdlib_logger = logging.getLogger(__name__)
 
 
 class MinerType(str, Enum):
@@ -113,10 +127,309 @@ class FirmwareType(str, Enum):
 _MAX_MINER_POWER_WATTS = 3500.0   # S19 absolute max ~2500 W (with margin)
 _MAX_MINER_HASHRATE_GHS = 120000.0  # S19 max ~95 TH/s = 95 000 GH/s (with margin)
 
+# Version suffix in Vnish minertype strings, e.g. "Antminer S9 (vnish 3.9.0)"
+_VNISH_VERSION_RE = re.compile(r'vnish\s*(\d+\.\d+\.?\d*)', re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def _classify_firmware(minertype: str) -> Tuple[FirmwareType, str]:
+    """
+    Classify firmware from a web API minertype string.
+    
+    Args:
+        minertype: e.g. "Antminer S9 (vnish 3.9.0)"
+        
+    Returns:
+        Tuple of (firmware type, version) - version is only parsed for Vnish
+    """
+    lowered = minertype.lower()
+    if "vnish" in lowered:
+        match = _VNISH_VERSION_RE.search(minertype)
+        return FirmwareType.VNISH, match.group(1) if match else ""
+    if "braiins" in lowered or "bos" in lowered:
+        return FirmwareType.BRAIINS, ""
+    if "marathon" in lowered:
+        return FirmwareType.MARATHON, ""
+    if "antminer" in lowered:
+        # Stock firmware just shows model
+        return FirmwareType.STOCK, ""
+    return FirmwareType.UNKNOWN, ""
+
+
+# ── Vnish digest-auth challenge cache ─────────────────────────────
+# Vnish answers every unauthenticated request with a 401 digest challenge,
+# so httpx.DigestAuth pays an extra round trip on each fresh client.  We
+# cache the parsed challenge per miner and build the Authorization header
+# ourselves; the challenge is only refreshed when the miner answers 401.
+_DIGEST_PARAM_RE = re.compile(r'(\w+)=(?:"([^"]*)"|([^\s,]+))')
+
 
 @dataclass
+class _DigestChallenge:
+    """Parsed WWW-Authenticate digest challenge for one miner."""
+    realm: str
+    nonce: str
+    qop: Optional[str] = None
+    opaque: Optional[str] = None
+    algorithm: str = "MD5"
+    nonce_count: int = 0
+
+
+# Cached challenges keyed by Vnish base URL ("http://ip:port")
+_digest_challenges: Dict[str, "_DigestChallenge"] = {}
+
+
+def _md5_hex(value: str) -> str:
+    return hashlib.md5(value.encode("utf-8")).hexdigest()
+
+
+def _parse_digest_challenge(header: str) -> Optional[_DigestChallenge]:
+    """
+    Parse a ``WWW-Authenticate: Digest ...`` header.
+
+    Returns None for anything we cannot answer by hand (non-digest schemes,
+    non-MD5 algorithms, qop without "auth"); callers then fall back to
+    httpx.DigestAuth.
+    """
+    scheme, _, params = header.strip().partition(" ")
+    if scheme.lower() != "digest":
+        return None
+    fields = {
+        key.lower(): quoted or bare
+        for key, quoted, bare in _DIGEST_PARAM_RE.findall(params)
+    }
+    if "nonce" not in fields:
+        return None
+    algorithm = fields.get("algorithm", "MD5")
+    if algorithm.upper() != "MD5":
+        return None
+    qop = fields.get("qop")
+    if qop is not None:
+        if "auth" not in [q.strip() for q in qop.split(",")]:
+            return None
+        qop = "auth"
+    return _DigestChallenge(
+        realm=fields.get("realm", ""),
+        nonce=fields["nonce"],
+        qop=qop,
+        opaque=fields.get("opaque"),
+        algorithm=algorithm,
+    )
+
+
+def _build_digest_header(
+    challenge: _DigestChallenge,
+    username: str,
+    password: str,
+    method: str,
+    uri: str
+) -> str:
+    """Build an ``Authorization: Digest ...`` value (RFC 2617, MD5)."""
+    ha1 = _md5_hex(f"{username}:{challenge.realm}:{password}")
+    ha2 = _md5_hex(f"{method}:{uri}")
+    parts = [
+        f'username="{username}"',
+        f'realm="{challenge.realm}"',
+        f'nonce="{challenge.nonce}"',
+        f'uri="{uri}"',
+    ]
+    if challenge.qop:
+        challenge.nonce_count += 1
+        nc = f"{challenge.nonce_count:08x}"
+        cnonce = os.urandom(8).hex()
+        response = _md5_hex(f"{ha1}:{challenge.nonce}:{nc}:{cnonce}:{challenge.qop}:{ha2}")
+        parts += [f"qop={challenge.qop}", f"nc={nc}", f'cnonce="{cnonce}"']
+    else:
+        response = _md5_hex(f"{ha1}:{challenge.nonce}:{ha2}")
+    parts.append(f'response="{response}"')
+    if challenge.opaque is not None:
+        parts.append(f'opaque="{challenge.opaque}"')
+    parts.append(f"algorithm={challenge.algorithm}")
+    return "Digest " + ", ".join(parts)
+
+
+# ── Vnish static-info cache ───────────────────────────────────────
+# get_system_info (firmware, model, MAC) only changes on reflash, and the
+# miner config only on our own writes, so both are cached per IP instead of
+# being re-fetched every scan.  Entries are dropped when a reboot/config
+# command is sent (see DiscoveredMiner.mark_command_sent).
+_SYSINFO_TTL_SECONDS = 86400.0
+_CONFIG_TTL_SECONDS = 60.0
+_sysinfo_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_config_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+def _cache_get(
+    cache: Dict[str, Tuple[float, Dict[str, Any]]],
+    host: str,
+    ttl: float
+) -> Optional[Dict[str, Any]]:
+    entry = cache.get(host)
+    if entry is None:
+        return None
+    stored_at, value = entry
+    if time.monotonic() - stored_at > ttl:
+        cache.pop(host, None)
+        return None
+    return dict(value)
+
+
+# Pool lists re-posted by frequency changes (see vnish_power).  Pools only
+# change through config writes, which drop this entry along with the
+# config, so it can outlive the config cache.
+_POOLS_TTL_SECONDS = 3600.0
+_pools_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+
+
+def get_cached_pools(host: str) -> Optional[List[Dict[str, Any]]]:
+    """Last known pool list for a miner, or None if unknown or expired."""
+    entry = _pools_cache.get(host)
+    if entry is None:
+        return None
+    stored_at, pools = entry
+    if time.monotonic() - stored_at > _POOLS_TTL_SECONDS:
+        _pools_cache.pop(host, None)
+        return None
+    return pools
+
+
+def cache_pools(host: str, pools: List[Dict[str, Any]]):
+    """Remember a pool list just read from a miner."""
+    _pools_cache[host] = (time.monotonic(), pools)
+
+
+def invalidate_vnish_cache(host: str, config_only: bool = False, keep_pools: bool = False):
+    """
+    Drop cached Vnish info for a miner.
+    
+    Args:
+        host: Miner IP address
+        config_only: Only drop the cached miner config and pools, keep
+            system info
+        keep_pools: Keep the pool list (the write re-posted the same pools)
+    """
+    _config_cache.pop(host, None)
+    if not keep_pools:
+        _pools_cache.pop(host, None)
+    if not config_only:
+        _sysinfo_cache.pop(host, None)
+
+
+# ── Vnish config write coalescing ─────────────────────────────────
+# Every config POST makes Vnish flush its config file (and often restart
+# cgminer).  set_pools / set_fan_config calls that arrive in a burst are
+# buffered per (host, endpoint) for a short window and sent as one POST,
+# later values winning for the same form field.
+_CONFIG_DEBOUNCE_SECONDS = 0.5
+
+
+@dataclass
+class _PendingConfigWrite:
+    """Config fields waiting to be flushed to one CGI endpoint."""
+    data: Dict[str, str] = field(default_factory=dict)
+    waiters: List[asyncio.Future] = field(default_factory=list)
+    flush_task: Optional[asyncio.Task] = None
+
+
+_pending_config_writes: Dict[Tuple[str, str], _PendingConfigWrite] = {}
+
+
+# ── chip_hr.json parsing ──────────────────────────────────────────
+# Each hashboard arrives as {"Asic00": "69", "Asic01": "67", ...}.  Boards of
+# the same model share a key layout, so the sorted key order is computed
+# once per layout rather than re-sorting every board on every poll.
+@lru_cache(maxsize=64)
+def _chip_key_order(keys: Tuple[str, ...]) -> Tuple[Tuple[str, int], ...]:
+    order = []
+    for key in keys:
+        if key.startswith("Asic"):
+            try:
+                order.append((key, int(key[4:])))
+            except ValueError:
+                pass
+    order.sort(key=itemgetter(1))
+    return tuple(order)
+
+
+def parse_chip_board(board: Dict[str, Any]) -> Tuple[List[int], List[int]]:
+    """
+    Parse one chip_hr.json hashboard into chip indices and hashrates.
+    
+    Args:
+        board: Mapping of AsicNN keys to hashrate strings (MH/s)
+        
+    Returns:
+        Tuple of (chip indices, hashrates in MH/s), ordered by chip index.
+        Chips with unparseable values are skipped; empty values count as 0.
+    """
+    indices = []
+    hashrates = []
+    for key, chip_idx in _chip_key_order(tuple(board)):
+        value = board[key]
+        try:
+            hashrates.append(int(value) if value else 0)
+        except (ValueError, TypeError):
+            continue
+        indices.append(chip_idx)
+    return indices, hashrates
+
+
+# ── Network scanning ──────────────────────────────────────────────
+def _host_strings(
+    network: Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+) -> Iterator[str]:
+    """
+    Yield the usable host addresses of a network as dotted strings.
+    
+    For IPv4 networks the strings are formatted straight from the integer
+    address, without building an IPv4Address object per host.
+    """
+    if network.version == 4 and network.num_addresses > 2:
+        base = int(network.network_address)
+        pack = struct.Struct(">I").pack
+        for offset in range(1, network.num_addresses - 1):
+            yield socket.inet_ntoa(pack(base + offset))
+    else:
+        for ip in network.hosts():
+            yield str(ip)
+
+
+# ── CGMiner stats reduction ───────────────────────────────────────
+def _reduce_stat(stat: Dict[str, Any]) -> Tuple[float, float, float, float]:
+    """
+    Reduce one CGMiner STATS entry in a single pass over its keys.
+    
+    Only positive numeric values count.  Pure function of the dict, kept
+    free of miner state so the hot loop is easy to profile or compile.
+    Keys are dispatched on their first character so the many unrelated
+    STATS keys (ID, Elapsed, chain_acn*, freq*, ...) skip the prefix checks.
+    
+    Returns:
+        Tuple of (max temp2_*, max temp*, max fan*, sum of chain_consumption*)
+    """
+    max_temp2 = max_temp = max_fan = 0
+    chain_sum = 0
+    for k, v in stat.items():
+        c0 = k[:1]
+        if c0 == "t":
+            if not k.startswith("temp") or not isinstance(v, (int, float)) or v <= 0:
+                continue
+            if v > max_temp:
+                max_temp = v
+            if v > max_temp2 and k.startswith("temp2_"):
+                max_temp2 = v
+        elif c0 == "f":
+            if k.startswith("fan") and isinstance(v, (int, float)) and v > max_fan:
+                max_fan = v
+        elif c0 == "c":
+            if k.startswith("chain_consumption") and isinstance(v, (int, float)) and v > 0:
+                chain_sum += v
+    return max_temp2, max_temp, max_fan, chain_sum
+
+
+@dataclass(slots=True)
 class DiscoveredMiner:
-    """Information about a discovered miner."""
+    """Information about a discovered miner (slotted: no per-instance __dict__)."""
     ip: str
     port: int = 4028
     miner_type: MinerType = MinerType.UNKNOWN
@@ -153,6 +466,7 @@ class DiscoveredMiner:
     
     # State transition tracking - miners take 45-60s to wake from idle
     last_command_time: Optional[datetime] = None
+    last_command_monotonic: Optional[float] = None  # time.monotonic() twin of last_command_time
     last_command_type: Optional[str] = None  # 'wake', 'sleep', 'restart', 'reboot', 'config'
     transition_grace_seconds: int = 60  # Grace period after commands
     
@@ -167,10 +481,9 @@ class DiscoveredMiner:
     @property
     def is_transitioning(self) -> bool:
         """Check if miner is in a state transition grace period."""
-        if not self.last_command_time:
+        if self.last_command_monotonic is None:
             return False
-        elapsed = (datetime.utcnow() - self.last_command_time).total_seconds()
-        return elapsed < self.transition_grace_seconds
+        return time.monotonic() - self.last_command_monotonic < self.transition_grace_seconds
     
     @property
     def is_wake_backed_off(self) -> bool:
@@ -195,9 +508,12 @@ class DiscoveredMiner:
     def mark_command_sent(self, command_type: str, grace_seconds: int = None):
         """Mark that a command was sent to this miner."""
         self.last_command_time = datetime.utcnow()
+        self.last_command_monotonic = time.monotonic()
         self.last_command_type = command_type
         if grace_seconds:
             self.transition_grace_seconds = grace_seconds
+        if command_type in ('reboot', 'config'):
+            invalidate_vnish_cache(self.ip)
     
     @property
     def id(self) -> str:
@@ -215,6 +531,41 @@ class DiscoveredMiner:
         return self.rated_power_watts / 1000.0
 
 
+class SummaryTuple(NamedTuple):
+    """Numeric CGMiner summary fields, converted once at the API layer."""
+    hashrate_ghs: float
+    elapsed_s: int
+    
+    @classmethod
+    def from_response(cls, summary: Dict[str, Any]) -> "SummaryTuple":
+        """
+        Parse a raw "summary" response.
+        
+        CGMiner sometimes returns numbers as strings; GHS 5s falls back to
+        GHS av when the 5s figure is missing or zero.
+        """
+        data = summary.get("SUMMARY", [{}])[0]
+        hashrate_raw = data.get("GHS 5s", 0) or data.get("GHS av", 0)
+        return cls(
+            float(hashrate_raw) if hashrate_raw else 0.0,
+            int(data.get("Elapsed", 0) or 0),
+        )
+
+
+_NO_STATUS = ({},)
+
+
+def _cgminer_status(result: Dict[str, Any]) -> Tuple[Optional[str], str]:
+    """
+    Unpack the first STATUS entry of a CGMiner response.
+    
+    Returns:
+        Tuple of (status code such as "S" or "E", message)
+    """
+    status = (result.get("STATUS") or _NO_STATUS)[0] or {}
+    return status.get("STATUS"), status.get("Msg", "Unknown error")
+
+
 class CGMinerAPI:
     """
     Async client for CGMiner/BTMiner API.
@@ -312,6 +663,10 @@ class CGMinerAPI:
         """Get miner summary."""
         return await self.send_command("summary")
     
+    async def get_summary_typed(self) -> SummaryTuple:
+        """Get miner summary with hashrate and uptime already converted."""
+        return SummaryTuple.from_response(await self.get_summary())
+    
     async def get_stats(self) -> Dict[str, Any]:
         """Get detailed miner stats."""
         return await self.send_command("stats")
@@ -329,6 +684,202 @@ class CGMinerAPI:
         return await self.send_command("devs")
 
 
+class VnishResponse(NamedTuple):
+    """Backend-neutral HTTP response returned by a VnishTransport."""
+    status_code: int
+    text: str
+    headers: Mapping[str, str]
+    
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class VnishTransport(ABC):
+    """
+    HTTP transport used by VnishWebAPI for its CGI calls.
+    
+    Implementations share one connection pool per process so repeated
+    calls to the same miner reuse keep-alive sockets.  Timeouts surface as
+    asyncio.TimeoutError, every other transport failure as ConnectionError.
+    """
+    
+    @abstractmethod
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        timeout: float,
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[Dict[str, str]] = None,
+        content: Optional[str] = None,
+        basic_auth: Optional[Tuple[str, str]] = None,
+        digest_auth: Optional[Tuple[str, str]] = None
+    ) -> VnishResponse:
+        """Send one request and return the backend-neutral response."""
+    
+    async def aclose(self):
+        """Release pooled connections."""
+
+
+def _reject_all_cookies() -> http.cookiejar.CookieJar:
+    """Cookie jar that stores nothing, so one miner's cookies never reach another."""
+    return http.cookiejar.CookieJar(
+        policy=http.cookiejar.DefaultCookiePolicy(allowed_domains=[])
+    )
+
+
+class HttpxVnishTransport(VnishTransport):
+    """httpx-based transport (fallback; select with VNISH_HTTP_BACKEND=httpx)."""
+    
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        self._client = client
+        self._owns_client = client is None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        if not self._owns_client:
+            return self._client
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+                cookies=_reject_all_cookies(),
+            )
+            self._loop = loop
+        return self._client
+    
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        timeout: float,
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[Dict[str, str]] = None,
+        content: Optional[str] = None,
+        basic_auth: Optional[Tuple[str, str]] = None,
+        digest_auth: Optional[Tuple[str, str]] = None
+    ) -> VnishResponse:
+        auth = None
+        if digest_auth is not None:
+            auth = httpx.DigestAuth(*digest_auth)
+        elif basic_auth is not None:
+            auth = httpx.BasicAuth(*basic_auth)
+        try:
+            response = await self._get_client().request(
+                method, url, headers=headers, data=data, content=content,
+                auth=auth, timeout=timeout
+            )
+        except httpx.TimeoutException as e:
+            raise asyncio.TimeoutError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise ConnectionError(f"HTTP error: {e}") from e
+        return VnishResponse(response.status_code, response.text, response.headers)
+    
+    async def aclose(self):
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class AiohttpVnishTransport(VnishTransport):
+    """
+    aiohttp-based transport with a single shared TCPConnector.
+    
+    aiohttp has no digest auth of its own: VnishWebAPI builds the digest
+    header itself, and the rare digest_auth fallback is handed to httpx.
+    """
+    
+    def __init__(
+        self,
+        limit: int = 256,
+        limit_per_host: int = 4,
+        ttl_dns_cache: int = 300,
+        keepalive_timeout: float = 60.0
+    ):
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._ttl_dns_cache = ttl_dns_cache
+        self._keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._digest_fallback = HttpxVnishTransport()
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            if self._session is not None and not self._session.closed:
+                # Left over from another event loop: close it so its connector
+                # isn't leaked ("Unclosed client session").  aiohttp skips the
+                # socket teardown itself if that loop is already closed.
+                await self._session.close()
+            connector = aiohttp.TCPConnector(
+                limit=self._limit,
+                limit_per_host=self._limit_per_host,
+                ttl_dns_cache=self._ttl_dns_cache,
+                use_dns_cache=True,
+                keepalive_timeout=self._keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                cookie_jar=aiohttp.DummyCookieJar(),
+            )
+            self._loop = loop
+        return self._session
+    
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        timeout: float,
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[Dict[str, str]] = None,
+        content: Optional[str] = None,
+        basic_auth: Optional[Tuple[str, str]] = None,
+        digest_auth: Optional[Tuple[str, str]] = None
+    ) -> VnishResponse:
+        if digest_auth is not None:
+            return await self._digest_fallback.request(
+                method, url, timeout=timeout, headers=headers, data=data,
+                content=content, digest_auth=digest_auth
+            )
+        auth = aiohttp.BasicAuth(*basic_auth) if basic_auth is not None else None
+        session = await self._get_session()
+        try:
+            async with session.request(
+                method, url, headers=headers,
+                data=data if data is not None else content,
+                auth=auth, timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                text = await response.text(errors="replace")
+                return VnishResponse(response.status, text, response.headers)
+        except aiohttp.ClientError as e:
+            raise ConnectionError(f"HTTP error: {e}") from e
+    
+    async def aclose(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        await self._digest_fallback.aclose()
+
+
+# Process-wide transport shared by all VnishWebAPI instances
+_vnish_transport: Optional[VnishTransport] = None
+
+
+def get_vnish_transport() -> VnishTransport:
+    """Get the shared Vnish transport for the configured HTTP backend."""
+    global _vnish_transport
+    if _vnish_transport is None:
+        if get_settings().vnish_http_backend == "httpx":
+            _vnish_transport = HttpxVnishTransport()
+        else:
+            _vnish_transport = AiohttpVnishTransport()
+    return _vnish_transport
+
+
 class VnishWebAPI:
     """
     Async client for Vnish firmware Web API (CGI-based for S9/T9/L3+).
@@ -371,7 +922,8 @@ class VnishWebAPI:
         port: Optional[int] = None,
         username: Optional[str] = None,
         password: Optional[str] = None,
-        timeout: float = 5.0
+        timeout: float = 5.0,
+        transport: Optional[VnishTransport] = None
     ):
         settings = get_settings()
         self.host = host
@@ -380,6 +932,58 @@ class VnishWebAPI:
         self.password = password if password is not None else settings.vnish_password
         self.timeout = timeout
         self.base_url = f"http://{host}:{self.port}"
+        self.transport = transport or get_vnish_transport()
+    
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> VnishResponse:
+        """
+        Send a digest-authenticated request, reusing the cached challenge.
+        
+        With a cached challenge the request goes out with a pre-built
+        Authorization header (one round trip).  On 401 the fresh challenge
+        is parsed from the response and the request retried once; if the
+        miner still refuses (or sends a challenge we can't answer by hand),
+        httpx.DigestAuth takes over.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        headers = dict(kwargs.pop("headers", None) or {})
+        uri = httpx.URL(url).raw_path.decode("ascii")
+        
+        challenge = _digest_challenges.get(self.base_url)
+        if challenge is not None:
+            headers["Authorization"] = _build_digest_header(
+                challenge, self.username, self.password, method, uri
+            )
+        response = await self.transport.request(
+            method, url, timeout=timeout, headers=headers, **kwargs
+        )
+        if response.status_code != 401:
+            return response
+        
+        # Nonce expired (or first contact) - learn the new challenge and retry
+        challenge = _parse_digest_challenge(response.headers.get("www-authenticate", ""))
+        if challenge is not None:
+            _digest_challenges[self.base_url] = challenge
+            headers["Authorization"] = _build_digest_header(
+                challenge, self.username, self.password, method, uri
+            )
+            response = await self.transport.request(
+                method, url, timeout=timeout, headers=headers, **kwargs
+            )
+            if response.status_code != 401:
+                return response
+        
+        _digest_challenges.pop(self.base_url, None)
+        headers.pop("Authorization", None)
+        return await self.transport.request(
+            method, url, timeout=timeout, headers=headers,
+            digest_auth=(self.username, self.password), **kwargs
+        )
     
     async def _request(self, endpoint: str, method: str = "GET", data: str = None) -> Dict[str, Any]:
         """
@@ -395,45 +999,37 @@ class VnishWebAPI:
         """
         url = f"{self.base_url}{endpoint}"
         
+        headers = {"Content-Type": "application/json"} if method == "POST" else None
+        
         try:
-            # Use httpx with digest auth (Vnish uses digest)
-            auth = httpx.DigestAuth(self.username, self.password)
+            # Vnish uses digest auth (see _send)
+            response = await self._send(method, url, content=data, headers=headers)
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                if method == "POST":
-                    headers = {"Content-Type": "application/json"}
-                    response = await client.post(url, auth=auth, content=data, headers=headers)
-                else:
-                    response = await client.get(url, auth=auth)
-                
-                if response.status_code == 200:
+            if response.status_code == 200:
+                try:
+                    return response.json()
+                except:
+                    # Some endpoints return non-JSON success (like "OK")
+                    text = response.text.strip()
+                    return {"success": True, "status": response.status_code, "response": text}
+            elif response.status_code == 401:
+                # Try basic auth as fallback
+                response2 = await self.transport.request(
+                    method, url, timeout=self.timeout, headers=headers, content=data,
+                    basic_auth=(self.username, self.password)
+                )
+                if response2.status_code == 200:
                     try:
-                        return response.json()
+                        return response2.json()
                     except:
-                        # Some endpoints return non-JSON success (like "OK")
-                        text = response.text.strip()
-                        return {"success": True, "status": response.status_code, "response": text}
-                elif response.status_code == 401:
-                    # Try basic auth as fallback
-                    basic_auth = httpx.BasicAuth(self.username, self.password)
-                    if method == "POST":
-                        response2 = await client.post(url, auth=basic_auth, content=data, headers=headers)
-                    else:
-                        response2 = await client.get(url, auth=basic_auth)
-                    if response2.status_code == 200:
-                        try:
-                            return response2.json()
-                        except:
-                            text = response2.text.strip()
-                            return {"success": True, "status": response2.status_code, "response": text}
-                    raise ConnectionError(f"Auth failed: {response2.status_code}")
-                else:
-                    raise ConnectionError(f"HTTP {response.status_code}")
+                        text = response2.text.strip()
+                        return {"success": True, "status": response2.status_code, "response": text}
+                raise ConnectionError(f"Auth failed: {response2.status_code}")
+            else:
+                raise ConnectionError(f"HTTP {response.status_code}")
                         
-        except httpx.TimeoutException:
+        except asyncio.TimeoutError:
             raise ConnectionError(f"Timeout connecting to {self.host}")
-        except httpx.HTTPError as e:
-            raise ConnectionError(f"HTTP error: {e}")
     
     async def set_sleep_mode(self, enable: bool) -> bool:
         """
@@ -454,27 +1050,24 @@ class VnishWebAPI:
         mode = "1" if enable else "0"
         
         try:
-            auth = httpx.DigestAuth(self.username, self.password)
-            
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    url,
-                    auth=auth,
-                    data={"mode": mode},
-                    headers={"Content-Type": "application/x-www-form-urlencoded"}
-                )
-                
-                if response.status_code == 200:
-                    resp_text = response.text.strip().lower()
-                    if resp_text == "ok" or "success" in resp_text or response.status_code == 200:
-                        action = "enabled" if enable else "disabled"
-                        logger.info(f"Vnish: Sleep mode {action}", host=self.host)
-                        return True
-                
-                logger.warning("Vnish: Sleep mode command returned unexpected response", 
-                             host=self.host, status=response.status_code, response=response.text[:100])
-                return False
-                
+            response = await self._send(
+                "POST",
+                url,
+                data={"mode": mode},
+                headers={"Content-Type": "application/x-www-form-urlencoded"}
+            )
+            
+            if response.status_code == 200:
+                resp_text = response.text.strip().lower()
+                if resp_text == "ok" or "success" in resp_text or response.status_code == 200:
+                    action = "enabled" if enable else "disabled"
+                    logger.info(f"Vnish: Sleep mode {action}", host=self.host)
+                    return True
+            
+            logger.warning("Vnish: Sleep mode command returned unexpected response", 
+                         host=self.host, status=response.status_code, response=response.text[:100])
+            return False
+            
         except Exception as e:
             logger.error("Vnish: Failed to set sleep mode", host=self.host, error=str(e))
             return False
@@ -508,7 +1101,8 @@ class VnishWebAPI:
         Start/restart the cgminer process (resume mining from idle/sleep).
         
         Uses reboot_cgminer.cgi for reliable start.
-        Note: This endpoint blocks until cgminer starts, so we use short timeout.
+        Note: This endpoint blocks until cgminer starts, so the request
+        timing out (after self.timeout) counts as sent.
         
         Returns:
             True if the request was sent successfully
@@ -517,20 +1111,17 @@ class VnishWebAPI:
         url = f"{self.base_url}/cgi-bin/reboot_cgminer.cgi"
         
         try:
-            # Use a short timeout - we don't need to wait for cgminer to fully start
-            auth = httpx.DigestAuth(self.username, self.password)
-            
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                try:
-                    response = await client.get(url, auth=auth)
-                    if response.status_code in [200]:
-                        logger.info("Vnish: CGMiner start command sent", host=self.host)
-                        return True
-                except httpx.TimeoutException:
-                    # Timeout is expected - the endpoint blocks until cgminer starts
-                    # The request was sent, so consider it successful
-                    logger.info("Vnish: CGMiner start command sent (response timed out, this is normal)", host=self.host)
+            # We don't need to wait for cgminer to fully start
+            try:
+                response = await self._send("GET", url)
+                if response.status_code in [200]:
+                    logger.info("Vnish: CGMiner start command sent", host=self.host)
                     return True
+            except asyncio.TimeoutError:
+                # Timeout is expected - the endpoint blocks until cgminer starts
+                # The request was sent, so consider it successful
+                logger.info("Vnish: CGMiner start command sent (response timed out, this is normal)", host=self.host)
+                return True
                     
             return False
             
@@ -542,11 +1133,23 @@ class VnishWebAPI:
         """Get miner status from web API."""
         return await self._request("/cgi-bin/get_miner_status.cgi")
     
-    async def get_system_info(self) -> Dict[str, Any]:
-        """Get system info from web API."""
-        return await self._request("/cgi-bin/get_system_info.cgi")
+    async def get_system_info(self, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Get system info from web API.
+        
+        Args:
+            use_cache: Serve from the per-IP cache (24h TTL) when possible.
+                       Pass False when the call doubles as a liveness check.
+        """
+        if use_cache:
+            cached = _cache_get(_sysinfo_cache, self.host, _SYSINFO_TTL_SECONDS)
+            if cached is not None:
+                return cached
+        info = await self._request("/cgi-bin/get_system_info.cgi")
+        _sysinfo_cache[self.host] = (time.monotonic(), info)
+        return dict(info)
     
-    async def get_config(self) -> Dict[str, Any]:
+    async def get_config(self, use_cache: bool = True) -> Dict[str, Any]:
         """
         Get current miner configuration.
         
@@ -556,8 +1159,17 @@ class VnishWebAPI:
         - bitmain-fan-pwm: Fan PWM value
         - bitmain-freq: Mining frequency
         - bitmain-voltage: Core voltage
+        
+        Args:
+            use_cache: Serve from the per-IP cache (60s TTL) when possible.
         """
-        return await self._request("/cgi-bin/get_miner_conf.cgi")
+        if use_cache:
+            cached = _cache_get(_config_cache, self.host, _CONFIG_TTL_SECONDS)
+            if cached is not None:
+                return cached
+        config = await self._request("/cgi-bin/get_miner_conf.cgi")
+        _config_cache[self.host] = (time.monotonic(), config)
+        return dict(config)
     
     async def set_pools(
         self, 
@@ -590,7 +1202,7 @@ class VnishWebAPI:
             data[f"_ant_pool{idx}user"] = pool.get("user", "")
             data[f"_ant_pool{idx}pw"] = pool.get("pass", "")
         
-        return await self._post_config("/cgi-bin/set_miner_conf.cgi", data)
+        return await self._queue_config("/cgi-bin/set_miner_conf.cgi", data)
     
     async def set_fan_config(
         self,
@@ -617,7 +1229,7 @@ class VnishWebAPI:
         if immersion_mode is not None:
             data["_ant_fan_rpm_off"] = "1" if immersion_mode else "0"
         
-        return await self._post_config("/cgi-bin/set_miner_conf_custom.cgi", data)
+        return await self._queue_config("/cgi-bin/set_miner_conf_custom.cgi", data)
     
     async def reboot_system(self) -> bool:
         """
@@ -631,25 +1243,82 @@ class VnishWebAPI:
         """
         url = f"{self.base_url}/cgi-bin/reboot.cgi"
         try:
-            auth = httpx.DigestAuth(self.username, self.password)
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                try:
-                    response = await client.post(
-                        url, auth=auth, data={"reboot": "1"},
-                        headers={"Content-Type": "application/x-www-form-urlencoded"},
-                    )
-                    if response.status_code == 200:
-                        logger.info("System reboot initiated", host=self.host)
-                        return True
-                except httpx.TimeoutException:
-                    # Reboot may kill the connection before response arrives
-                    logger.info("System reboot initiated (connection closed, expected)", host=self.host)
+            try:
+                response = await self._send(
+                    "POST", url, data={"reboot": "1"},
+                    headers={"Content-Type": "application/x-www-form-urlencoded"},
+                )
+                if response.status_code == 200:
+                    logger.info("System reboot initiated", host=self.host)
                     return True
+            except asyncio.TimeoutError:
+                # Reboot may kill the connection before response arrives
+                logger.info("System reboot initiated (connection closed, expected)", host=self.host)
+                return True
             return False
         except Exception as e:
             logger.error("Failed to reboot", host=self.host, error=str(e))
             return False
     
+    async def _queue_config(
+        self,
+        endpoint: str,
+        data: Dict[str, str],
+        delay: float = _CONFIG_DEBOUNCE_SECONDS
+    ) -> Dict[str, Any]:
+        """
+        Buffer a config write and wait for the coalesced POST.
+        
+        Writes to the same host and endpoint within `delay` seconds are
+        merged (last write wins per field) and flushed as one _post_config
+        call; every caller receives that call's result.
+        
+        Args:
+            endpoint: CGI endpoint path
+            data: Form data to merge into the pending write
+            delay: Debounce window in seconds
+            
+        Returns:
+            Response dict from the flushed POST
+        """
+        key = (self.host, endpoint)
+        pending = _pending_config_writes.get(key)
+        if pending is None:
+            pending = _pending_config_writes[key] = _PendingConfigWrite()
+            pending.flush_task = asyncio.create_task(self._flush_after(key, delay))
+        pending.data.update(data)
+        waiter = asyncio.get_running_loop().create_future()
+        pending.waiters.append(waiter)
+        return await waiter
+    
+    async def _flush_after(self, key: Tuple[str, str], delay: float):
+        """Send the pending write for `key` once the debounce window closes."""
+        pending = _pending_config_writes[key]
+        try:
+            await asyncio.sleep(delay)
+            del _pending_config_writes[key]
+            result = await self._post_config(key[1], pending.data)
+        except Exception as e:
+            for waiter in pending.waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+        else:
+            logger.debug(
+                "Vnish: Flushed coalesced config write",
+                host=self.host, endpoint=key[1], writes=len(pending.waiters)
+            )
+            for waiter in pending.waiters:
+                if not waiter.done():
+                    waiter.set_result(result)
+        finally:
+            # Cancelled (e.g. shutdown): unhook the batch so later writes start
+            # a new one, and cancel its waiters rather than leave them hanging
+            if _pending_config_writes.get(key) is pending:
+                del _pending_config_writes[key]
+            for waiter in pending.waiters:
+                if not waiter.done():
+                    waiter.cancel()
+    
     async def _post_config(self, endpoint: str, data: Dict[str, str]) -> Dict[str, Any]:
         """
         POST configuration to Vnish CGI endpoint.
@@ -664,28 +1333,27 @@ class VnishWebAPI:
         url = f"{self.base_url}{endpoint}"
         
         try:
-            auth = httpx.DigestAuth(self.username, self.password)
-            
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(url, auth=auth, data=data)
-                
-                if response.status_code == 200:
-                    try:
-                        return response.json()
-                    except:
-                        return {"success": True, "status": response.status_code}
-                else:
-                    raise ConnectionError(f"HTTP {response.status_code}")
-                        
-        except httpx.TimeoutException:
+            response = await self._send("POST", url, data=data)
+        except asyncio.TimeoutError:
             raise ConnectionError(f"Timeout connecting to {self.host}")
-        except httpx.HTTPError as e:
-            raise ConnectionError(f"HTTP error: {e}")
+        finally:
+            # Only once the write is done: a get_config racing the POST would
+            # otherwise re-cache the old config for the whole TTL.  Failed
+            # writes may still have landed, so drop the cache either way.
+            invalidate_vnish_cache(self.host, config_only=True)
+        
+        if response.status_code == 200:
+            try:
+                return response.json()
+            except:
+                return {"success": True, "status": response.status_code}
+        else:
+            raise ConnectionError(f"HTTP {response.status_code}")
     
     async def is_vnish_available(self) -> bool:
         """Check if Vnish web API is available."""
         try:
-            await self.get_system_info()
+            await self.get_system_info(use_cache=False)
             return True
         except:
             return False
@@ -711,22 +1379,20 @@ class VnishWebAPI:
             url = f"{self.base_url}/cgi-bin/find_mode.cgi"
             mode_value = "1" if enable else "0"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url,
-                    data=f"mode={mode_value}",
-                    auth=httpx.DigestAuth(self.username, self.password),
-                    timeout=self.timeout,
-                    headers={"Content-Type": "application/x-www-form-urlencoded"}
-                )
-                result = response.text
-                # Response is "Enabled" or "Disabled"
-                success = response.status_code == 200 and result.strip() in ["Enabled", "Disabled"]
-                if success:
-                    logger.info("Vnish: Find mode set", host=self.host, enabled=enable, response=result.strip())
-                else:
-                    logger.warning("Vnish: Find mode failed", host=self.host, response=result)
-                return success, result.strip()
+            response = await self._send(
+                "POST",
+                url,
+                content=f"mode={mode_value}",
+                headers={"Content-Type": "application/x-www-form-urlencoded"}
+            )
+            result = response.text
+            # Response is "Enabled" or "Disabled"
+            success = response.status_code == 200 and result.strip() in ["Enabled", "Disabled"]
+            if success:
+                logger.info("Vnish: Find mode set", host=self.host, enabled=enable, response=result.strip())
+            else:
+                logger.warning("Vnish: Find mode failed", host=self.host, response=result)
+            return success, result.strip()
             
         except Exception as e:
             logger.error("Vnish: Failed to set find mode", host=self.host, error=str(e))
@@ -924,21 +1590,12 @@ class VnishWebAPI:
         Detect the firmware type running on the miner.
         
         Returns:
-            Firmware type string: "vnish", "braiins", "stock", or "unknown"
+            Firmware type string: "vnish", "braiins", "marathon", "stock", or "unknown"
         """
         try:
             info = await self.get_system_info()
-            minertype = info.get("minertype", "").lower()
-            
-            if "vnish" in minertype:
-                return "vnish"
-            elif "braiins" in minertype or "bos" in minertype:
-                return "braiins"
-            elif "antminer" in minertype:
-                # Stock firmware just shows model
-                return "stock"
-            else:
-                return "unknown"
+            firmware_type, _ = _classify_firmware(info.get("minertype", ""))
+            return firmware_type.value
         except Exception:
             return "unknown"
     
@@ -951,19 +1608,79 @@ class VnishWebAPI:
         """
         try:
             info = await self.get_system_info()
-            minertype = info.get("minertype", "")
             
             # Parse version from "Antminer S9 (vnish 3.9.0)"
-            if "vnish" in minertype.lower():
-                import re
-                match = re.search(r'vnish\s*(\d+\.\d+\.?\d*)', minertype, re.IGNORECASE)
-                if match:
-                    return match.group(1)
-            return None
+            _, version = _classify_firmware(info.get("minertype", ""))
+            return version or None
         except Exception:
             return None
 
 
+# Fields written by MinerDiscoveryService.export_miners, fetched in one call
+_export_fields = attrgetter("ip", "port", "rated_power_watts", "miner_type", "model")
+_miner_ip = attrgetter("ip")
+
+
+# ── Factory reset payload ─────────────────────────────────────────
+# Default Vnish config posted by factory_reset_miner; miner-independent,
+# so built once.  Read-only: callers post a dict() copy.
+DEFAULT_S9_FACTORY_CONFIG: Mapping[str, str] = MappingProxyType({
+    # Clear all pools
+    "_ant_pool1url": "",
+    "_ant_pool1user": "",
+    "_ant_pool1pw": "",
+    "_ant_pool2url": "",
+    "_ant_pool2user": "",
+    "_ant_pool2pw": "",
+    "_ant_pool3url": "",
+    "_ant_pool3user": "",
+    "_ant_pool3pw": "",
+    # Default mining settings for S9
+    "_ant_freq": "550",
+    "_ant_voltage": "8.8",
+    "_ant_fan_customize_switch": "false",
+    "_ant_fan_customize_value": "100",
+    "_ant_fan_rpm_off": "0",
+    "_ant_target_temp": "75",
+    "_ant_tempoff": "105",
+    "_ant_asicboost": "true",
+    "_ant_nobeeper": "false",
+    "_ant_notempoverctrl": "false",
+    # Auto-downscale settings
+    "_ant_autodownscale_timer": "2",
+    "_ant_autodownscale_after": "10",
+    "_ant_autodownscale_step": "25",
+    "_ant_autodownscale_min": "400",
+    "_ant_autodownscale_prec": "75",
+    "_ant_autodownscale_profile": "1",
+})
+
+
+# ── Command coalescing ────────────────────────────────────────────
+def _singleflight(cmd_name: str):
+    """
+    Coalesce concurrent identical commands to one miner.
+    
+    While a (miner_id, cmd_name) call is in flight, further calls await
+    the same task instead of sending the command again (e.g. a
+    double-clicked restart).  The entry is dropped once the task finishes.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(self, miner_id: str, *args, **kwargs):
+            key = (miner_id, cmd_name)
+            task = self._inflight_commands.get(key)
+            if task is None:
+                task = asyncio.create_task(func(self, miner_id, *args, **kwargs))
+                self._inflight_commands[key] = task
+                task.add_done_callback(
+                    lambda _: self._inflight_commands.pop(key, None)
+                )
+            return await asyncio.shield(task)
+        return wrapper
+    return decorator
+
+
 class MinerDiscoveryService:
     """
     Service for discovering and managing miners directly.
@@ -995,6 +1712,8 @@ class MinerDiscoveryService:
         
         # Registry of discovered miners
         self._miners: Dict[str, DiscoveredMiner] = {}
+        self._miners_by_ip: Dict[str, DiscoveredMiner] = {}
+        self._sorted_by_ip: Optional[Tuple[DiscoveredMiner, ...]] = None
         
         # Lock for thread safety
         self._lock = asyncio.Lock()
@@ -1012,8 +1731,36 @@ class MinerDiscoveryService:
         # Semaphore to limit concurrent miner polls (prevent network storm)
         self._poll_semaphore = asyncio.Semaphore(50)
         
-        # Snapshot timing - track last snapshot time per miner
-        self._last_snapshot_time: Dict[str, datetime] = {}
+        # VnishWebAPI clients per miner IP (default timeout), see _get_vnish
+        self._vnish_clients: Dict[str, VnishWebAPI] = {}
+        # CGMinerAPI clients per (ip, port) with api_timeout, see _get_cgminer
+        self._cgminer_clients: Dict[Tuple[str, int], CGMinerAPI] = {}
+        
+        # Recent is_vnish_available() answers (ip -> (time.monotonic(), available))
+        self._vnish_avail_cache: Dict[str, Tuple[float, bool]] = {}
+        self._vnish_avail_ttl: float = 30.0
+        
+        # In-flight update_miner_status polls, shared by concurrent callers
+        self._inflight_updates: Dict[str, asyncio.Task] = {}
+        # In-flight control commands keyed by (miner_id, command), see _singleflight
+        self._inflight_commands: Dict[Tuple[str, str], asyncio.Task] = {}
+        
+        # IPs whose Vnish fallback probe failed recently (ip -> time.monotonic()).
+        # Sweeps skip the fallback for these until the entry expires.
+        self._no_vnish_cache: Dict[str, float] = {}
+        self._no_vnish_ttl: float = 3600.0
+        
+        # LED find-mode state per miner IP, tracked locally (default off)
+        self._find_mode_states: Dict[str, bool] = {}
+        
+        # Write-behind miner saves: add_miner queues, _save_writer_loop batches
+        self._save_queue: asyncio.Queue = asyncio.Queue()
+        self._save_task: Optional[asyncio.Task] = None
+        self._save_batch_size: int = 50
+        self._save_batch_delay: float = 0.1
+        
+        # Snapshot timing - track last snapshot time per miner (time.monotonic())
+        self._last_snapshot_time: Dict[str, float] = {}
         self._snapshot_interval = self.settings.snapshot_interval_seconds
         
         # ── Wake-poke subsystem ──────────────────────────────────────
@@ -1027,6 +1774,15 @@ class MinerDiscoveryService:
         self._poke_give_up_after: float = 600.0  # stop poking after 10 min
         self._vnish_username: str = self.settings.vnish_username
         self._vnish_password: str = self.settings.vnish_password
+        
+        # Pooled HTTP transport shared by every VnishWebAPI this service creates
+        self._vnish_transport: VnishTransport = get_vnish_transport()
+    
+    async def aclose(self):
+        """Stop background work and release pooled HTTP connections."""
+        await self.stop_poke_loop()
+        await self._flush_save_queue()
+        await self._vnish_transport.aclose()
     
     # =========================================================================
     # Wake-Poke Subsystem
@@ -1151,61 +1907,249 @@ class MinerDiscoveryService:
         from app.services.miner_control import estimate_miner_power_kw
         return estimate_miner_power_kw(model) * 1000.0
     
-    def _save_miner_to_db(self, miner: DiscoveredMiner):
-        """Save or update miner in database."""
+    @staticmethod
+    def _miner_record(miner: DiscoveredMiner) -> Dict[str, Any]:
+        """Database fields for a miner record."""
+        return {
+            "ip": miner.ip,
+            "name": miner.hostname or f"Miner-{miner.ip.split('.')[-1]}",
+            "model": miner.model,
+            "firmware": miner.firmware_type.value if miner.firmware_type else None,
+            "firmware_version": miner.firmware_version,
+            "mac_address": miner.mac_address,
+            "rated_power_watts": int(miner.rated_power_watts) if miner.rated_power_watts else 1400,
+            "pool_url": miner.pool_url,
+            "pool_worker": None,  # Not currently tracked
+        }
+    
+    def _queue_miner_save(self, miner: DiscoveredMiner):
+        """Queue a miner for the write-behind saver, starting it if needed."""
+        self._save_queue.put_nowait(miner)
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._save_writer_loop())
+    
+    async def _save_writer_loop(self):
+        """Drain the save queue in batches of up to _save_batch_size."""
+        while True:
+            batch = [await self._save_queue.get()]
+            # Give adds arriving together a moment to join this batch
+            try:
+                await asyncio.sleep(self._save_batch_delay)
+            except asyncio.CancelledError:
+                # Hand the miner back so _flush_save_queue still saves it
+                self._save_queue.put_nowait(batch[0])
+                raise
+            while len(batch) < self._save_batch_size and not self._save_queue.empty():
+                batch.append(self._save_queue.get_nowait())
+            await self._save_miners_to_db(batch)
+    
+    async def _flush_save_queue(self):
+        """Stop the write-behind saver and persist anything still queued."""
+        if self._save_task is not None:
+            self._save_task.cancel()
+            try:
+                await self._save_task
+            except asyncio.CancelledError:
+                pass
+            self._save_task = None
+        pending = []
+        while not self._save_queue.empty():
+            pending.append(self._save_queue.get_nowait())
+        await self._save_miners_to_db(pending)
+    
+    async def _save_miners_to_db(self, miners: List[DiscoveredMiner]):
+        """Save or update many miners in one transaction, off the event loop."""
+        if not miners:
+            return
+        records = [self._miner_record(miner) for miner in miners]
         try:
-            self.db.upsert_miner(
-                ip=miner.ip,
-                name=miner.hostname or f"Miner-{miner.ip.split('.')[-1]}",
-                model=miner.model,
-                firmware=miner.firmware_type.value if miner.firmware_type else None,
-                firmware_version=miner.firmware_version,
-                mac_address=miner.mac_address,
-                rated_power_watts=int(miner.rated_power_watts) if miner.rated_power_watts else 1400,
-                pool_url=miner.pool_url,
-                pool_worker=None  # Not currently tracked
-            )
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.db.upsert_miners_batch, records)
         except Exception as e:
-            logger.debug("Failed to save miner to database", ip=miner.ip, error=str(e))
+            logger.debug("Failed to save miners to database", count=len(records), error=str(e))
     
-    def _should_save_snapshot(self, miner_id: str) -> bool:
-        """Check if enough time has passed to save a new snapshot."""
-        now = datetime.utcnow()
+    def _should_save_snapshot(self, miner_id: str, now: Optional[float] = None) -> bool:
+        """
+        Check if enough time has passed to save a new snapshot.
+        
+        Args:
+            miner_id: The miner ID
+            now: time.monotonic() reading for this cycle
+        """
+        if now is None:
+            now = time.monotonic()
         last_time = self._last_snapshot_time.get(miner_id)
         
         if last_time is None:
             return True
         
-        elapsed = (now - last_time).total_seconds()
-        return elapsed >= self._snapshot_interval
+        return now - last_time >= self._snapshot_interval
     
-    def _save_miner_snapshot(self, miner: DiscoveredMiner):
-        """Save miner snapshot for historical data (time-throttled)."""
-        # Check if we should save (time-based throttling)
-        if not self._should_save_snapshot(miner.id):
+    async def _save_miner_snapshots(
+        self,
+        miners: List[DiscoveredMiner],
+        now: Optional[datetime] = None
+    ):
+        """
+        Save snapshots for historical data (time-throttled per miner).
+        
+        All due snapshots are written in one transaction on the default
+        executor, so the event loop isn't blocked on the database.
+        
+        Args:
+            miners: Miners polled this cycle
+            now: Cycle timestamp, shared by every snapshot in the batch
+        """
+        if now is None:
+            now = datetime.utcnow()
+        now_mono = time.monotonic()
+        due = [miner for miner in miners if self._should_save_snapshot(miner.id, now_mono)]
+        if not due:
             return
         
+        rows = [
+            {
+                "miner_ip": miner.ip,
+                "timestamp": now,
+                "hashrate_ghs": miner.hashrate_ghs,
+                "power_watts": miner.power_watts,
+                "temperature": miner.temperature_c,
+                "fan_speed": miner.fan_speed_pct,
+                "frequency": miner.current_frequency,
+                "is_mining": miner.is_mining,
+                "uptime_seconds": miner.uptime_seconds,
+            }
+            for miner in due
+        ]
         try:
-            self.db.save_miner_snapshot(
-                miner_ip=miner.ip,
-                hashrate_ghs=miner.hashrate_ghs,
-                power_watts=miner.power_watts,
-                temperature=miner.temperature_c,
-                fan_speed=miner.fan_speed_pct,
-                frequency=miner.current_frequency,
-                is_mining=miner.is_mining,
-                uptime_seconds=miner.uptime_seconds
-            )
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.db.save_miner_snapshots_batch, rows)
             # Update last snapshot time on success
-            self._last_snapshot_time[miner.id] = datetime.utcnow()
+            for miner in due:
+                self._last_snapshot_time[miner.id] = now_mono
         except Exception as e:
-            logger.debug("Failed to save miner snapshot", ip=miner.ip, error=str(e))
+            logger.debug("Failed to save miner snapshots", count=len(rows), error=str(e))
     
     @property
     def miners(self) -> List[DiscoveredMiner]:
         """Get list of all discovered miners."""
         return list(self._miners.values())
     
+    @property
+    def miners_sorted_by_ip(self) -> Tuple[DiscoveredMiner, ...]:
+        """All miners ordered by IP string; rebuilt only when the registry changes."""
+        if self._sorted_by_ip is None:
+            self._sorted_by_ip = tuple(sorted(self._miners.values(), key=_miner_ip))
+        return self._sorted_by_ip
+    
+    @property
+    def online_count(self) -> int:
+        """Number of miners currently marked online."""
+        return sum(1 for m in self._miners.values() if m.is_online)
+    
+    def _register_miner(self, miner: DiscoveredMiner):
+        """Add a miner to the registry (caller holds self._lock)."""
+        self._miners[miner.id] = miner
+        self._miners_by_ip[miner.ip] = miner
+        self._sorted_by_ip = None
+    
+    def _unregister_miner(self, miner_id: str):
+        """Drop a miner and its per-IP caches."""
+        miner = self._miners.pop(miner_id)
+        self._miners_by_ip.pop(miner.ip, None)
+        self._sorted_by_ip = None
+        self._find_mode_states.pop(miner.ip, None)
+        self._last_snapshot_time.pop(miner_id, None)
+        self._vnish_clients.pop(miner.ip, None)
+        self._cgminer_clients.pop((miner.ip, miner.port), None)
+        self._vnish_avail_cache.pop(miner.ip, None)
+    
+    def _get_vnish(self, ip: str) -> VnishWebAPI:
+        """Cached VnishWebAPI for a miner, sharing the service's transport."""
+        vnish = self._vnish_clients.get(ip)
+        if vnish is None:
+            vnish = VnishWebAPI(ip, transport=self._vnish_transport)
+            self._vnish_clients[ip] = vnish
+        return vnish
+    
+    def _get_cgminer(self, ip: str, port: int) -> CGMinerAPI:
+        """
+        Cached CGMinerAPI for a miner.
+        
+        CGMiner closes the socket after every response, so there is no
+        connection to keep alive; this only saves rebuilding the client.
+        """
+        key = (ip, port)
+        api = self._cgminer_clients.get(key)
+        if api is None:
+            api = CGMinerAPI(ip, port, timeout=self.api_timeout)
+            self._cgminer_clients[key] = api
+        return api
+    
+    async def _bounded(self, coro):
+        """
+        Await a miner command, giving up after api_timeout seconds.
+        
+        Half-alive miners can accept a connection and then never answer;
+        this caps how long one command can hold its caller.  Don't wrap
+        VnishWebAPI commands (start_cgminer, stop_cgminer, reboot_system,
+        set_sleep_mode): they time out on their own and map that to a
+        result, which an outer bound would cancel first.
+        """
+        return await asyncio.wait_for(coro, timeout=self.api_timeout)
+    
+    async def _retry(
+        self,
+        coro_factory,
+        attempts: int = 3,
+        base: float = 1.0,
+        cap: float = 30.0,
+        retry_false: bool = False
+    ):
+        """
+        Await coro_factory() with jittered exponential backoff.
+        
+        Only transient transport failures (ConnectionError, timeout) are
+        retried; anything else, and the last failure, propagates.
+        
+        Args:
+            coro_factory: Zero-arg callable returning a fresh coroutine per attempt
+            attempts: Total attempts including the first
+            base: Backoff for the first retry in seconds, doubling each time
+            cap: Upper bound on a single backoff in seconds
+            retry_false: Also retry a False result, for VnishWebAPI commands
+                         that log transport errors and return False
+        """
+        for attempt in range(attempts):
+            try:
+                result = await coro_factory()
+                if result is not False or not retry_false or attempt == attempts - 1:
+                    return result
+                error = "command returned False"
+            except (ConnectionError, asyncio.TimeoutError) as e:
+                if attempt == attempts - 1:
+                    raise
+                error = str(e)
+            delay = min(cap, base * (2 ** attempt)) + random.uniform(0, base * 0.5)
+            logger.debug("Retrying miner command", attempt=attempt + 1,
+                         delay_s=round(delay, 2), error=error)
+            await asyncio.sleep(delay)
+    
+    async def _vnish_available(self, ip: str) -> bool:
+        """
+        is_vnish_available() for a miner, memoized for _vnish_avail_ttl seconds.
+        
+        Management commands probe before acting; repeated commands to the
+        same miner reuse the answer instead of paying an extra round trip.
+        """
+        now = time.monotonic()
+        entry = self._vnish_avail_cache.get(ip)
+        if entry is not None and now - entry[0] < self._vnish_avail_ttl:
+            return entry[1]
+        available = await self._get_vnish(ip).is_vnish_available()
+        self._vnish_avail_cache[ip] = (now, available)
+        return available
+    
     def get_miner(self, miner_id: str) -> Optional[DiscoveredMiner]:
         """Get a specific miner by ID."""
         return self._miners.get(miner_id)
@@ -1232,45 +2176,80 @@ class MinerDiscoveryService:
         cidr = network_cidr or self.network_cidr
         logger.info("Starting miner discovery", network=cidr)
         
+        # Forget expired "no Vnish here" entries from earlier sweeps
+        expire_before = time.monotonic() - self._no_vnish_ttl
+        self._no_vnish_cache = {
+            ip: failed_at for ip, failed_at in self._no_vnish_cache.items()
+            if failed_at >= expire_before
+        }
+        
         try:
             network = ipaddress.ip_network(cidr, strict=False)
         except ValueError as e:
             logger.error("Invalid network CIDR", cidr=cidr, error=str(e))
             return []
         
-        # Generate all IPs to scan, excluding known non-miner devices
+        # IPs to scan are streamed from network.hosts(), excluding known
+        # non-miner devices, rather than materialised up front
         exclude_set = set(
             ip.strip() for ip in self.settings.discovery_exclude_ips.split(",") if ip.strip()
         )
-        hosts = [ip for ip in network.hosts() if str(ip) not in exclude_set]
-        logger.info(f"Scanning {len(hosts)} hosts for miners (excluded {len(exclude_set)} IPs)")
+        num_hosts = network.num_addresses - 2 if network.num_addresses > 2 else network.num_addresses
+        logger.info(f"Scanning up to {num_hosts} hosts for miners (excluded {len(exclude_set)} IPs)")
         
         discovered = []
-        semaphore = asyncio.Semaphore(concurrent_scans)
+        scanned = 0
+        
+        # Fixed pool of workers pulling from a bounded queue, so memory and
+        # scheduler load stay constant regardless of network size
+        queue: asyncio.Queue = asyncio.Queue(maxsize=concurrent_scans * 2)
         
         async def scan_host(ip: str) -> Optional[DiscoveredMiner]:
-            async with semaphore:
-                for port in self.scan_ports:
-                    miner = await self._probe_miner(str(ip), port)
-                    if miner:
-                        return miner
+            for port in self.scan_ports:
+                miner = await self._probe_miner(ip, port)
+                if miner:
+                    return miner
             return None
         
-        # Scan all hosts concurrently
-        tasks = [scan_host(str(ip)) for ip in hosts]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        async def worker():
+            while True:
+                ip = await queue.get()
+                try:
+                    miner = await scan_host(ip)
+                    if miner:
+                        discovered.append(miner)
+                except Exception as e:
+                    logger.debug("Host scan failed", ip=ip, error=str(e))
+                finally:
+                    queue.task_done()
+        
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(concurrent_scans, num_hosts))
+        ]
+        try:
+            for ip in _host_strings(network):
+                if ip in exclude_set:
+                    continue
+                scanned += 1
+                await queue.put(ip)
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        
+        # Register every hit in one critical section
+        async with self._lock:
+            for miner in discovered:
+                self._register_miner(miner)
         
-        for result in results:
-            if isinstance(result, DiscoveredMiner):
-                discovered.append(result)
-                async with self._lock:
-                    self._miners[result.id] = result
-                    # Save to database
-                    self._save_miner_to_db(result)
+        # Save to database
+        await self._save_miners_to_db(discovered)
         
         logger.info(
             "Discovery complete",
-            total_scanned=len(hosts),
+            total_scanned=scanned,
             miners_found=len(discovered)
         )
         
@@ -1309,21 +2288,22 @@ class MinerDiscoveryService:
         except ConnectionError:
             # CGMiner API not responding - try Vnish Web API
             # This allows discovering miners in idle mode (cgminer stopped)
-            vnish = VnishWebAPI(ip, timeout=self.scan_timeout * 2)
+            failed_at = self._no_vnish_cache.get(ip)
+            if failed_at is not None and time.monotonic() - failed_at < self._no_vnish_ttl:
+                return None
+            
+            vnish = VnishWebAPI(ip, timeout=self.scan_timeout * 2, transport=self._vnish_transport)
             try:
-                sysinfo = await vnish.get_system_info()
+                # Uncached: a response here is what marks the miner online
+                sysinfo = await vnish.get_system_info(use_cache=False)
                 if sysinfo and "minertype" in sysinfo:
                     minertype = sysinfo.get("minertype", "")
                     
                     # If the Vnish web API responds, this IS a Vnish miner.
                     # Stock firmware does not have these CGI endpoints.
                     firmware_type = FirmwareType.VNISH
-                    firmware_version = ""
-                    if "vnish" in minertype.lower():
-                        # Parse version from "Antminer S9 (vnish 3.9.0)"
-                        match = re.search(r'vnish\s*(\d+\.\d+\.?\d*)', minertype, re.IGNORECASE)
-                        if match:
-                            firmware_version = match.group(1)
+                    # Parse version from "Antminer S9 (vnish 3.9.0)"
+                    _, firmware_version = _classify_firmware(minertype)
                     
                     # It's a Vnish miner in idle mode!
                     miner = DiscoveredMiner(
@@ -1353,6 +2333,7 @@ class MinerDiscoveryService:
                     return miner
             except Exception as e:
                 logger.debug("Vnish probe also failed", ip=ip, error=str(e))
+                self._no_vnish_cache[ip] = time.monotonic()
             
             return None
         except Exception as e:
@@ -1365,14 +2346,11 @@ class MinerDiscoveryService:
         summary: Dict[str, Any]
     ):
         """Identify miner type and extract information from summary."""
-        api = CGMinerAPI(miner.ip, miner.port, timeout=self.api_timeout)
+        api = self._get_cgminer(miner.ip, miner.port)
         
         # Extract summary info
-        summary_data = summary.get("SUMMARY", [{}])[0]
-        
-        # Common fields - CGMiner sometimes returns strings, so convert to float
-        hashrate_raw = summary_data.get("GHS 5s", 0) or summary_data.get("GHS av", 0)
-        hashrate_val = float(hashrate_raw) if hashrate_raw else 0.0
+        parsed = SummaryTuple.from_response(summary)
+        hashrate_val = parsed.hashrate_ghs
         if hashrate_val > _MAX_MINER_HASHRATE_GHS:
             logger.warning(
                 "Miner reports unrealistic hashrate during discovery — clamped",
@@ -1384,70 +2362,86 @@ class MinerDiscoveryService:
             miner.clamped_reason = f"hashrate {round(hashrate_val)}GH/s→{int(_MAX_MINER_HASHRATE_GHS)}GH/s"
             hashrate_val = _MAX_MINER_HASHRATE_GHS
         miner.hashrate_ghs = hashrate_val
-        miner.uptime_seconds = int(summary_data.get("Elapsed", 0) or 0)
-        
-        # Try to get version for model info
+        miner.uptime_seconds = parsed.elapsed_s
+        
+        # Fetch version, stats and pools concurrently; none depends on
+        # another's response.  Vnish system info is only used for Antminers:
+        # it starts alongside but is cancelled once the version says otherwise,
+        # so hosts without a web UI don't hold identification for api_timeout.
+        vnish = VnishWebAPI(miner.ip, timeout=self.api_timeout, transport=self._vnish_transport)
+        sysinfo_task = asyncio.create_task(vnish.get_system_info())
+        # Consume its outcome even when nobody awaits it (non-Antminers)
+        sysinfo_task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        stats_and_pools = asyncio.gather(api.get_stats(), api.get_pools(), return_exceptions=True)
         try:
-            version = await api.get_version()
-            version_data = version.get("VERSION", [{}])[0]
-            
-            # Detect miner type from version
-            miner_type = version_data.get("Type", "").lower()
-            cgminer = version_data.get("CGMiner", "").lower()
-            miner_str = version_data.get("Miner", "").lower()
-            
-            if "antminer" in miner_type or "antminer" in cgminer:
-                miner.miner_type = MinerType.ANTMINER
-                miner.model = version_data.get("Type", "Antminer")
-                # Set rated power based on Antminer model
-                miner.rated_power_watts = self._estimate_antminer_power(miner.model)
-            elif "whatsminer" in miner_type or "btminer" in cgminer or "whatsminer" in miner_str:
-                miner.miner_type = MinerType.WHATSMINER
-                miner.model = version_data.get("Type", "Whatsminer")
-                miner.rated_power_watts = 3400.0  # Default Whatsminer
-            elif "avalon" in miner_type:
-                miner.miner_type = MinerType.AVALON
-                miner.model = version_data.get("Type", "Avalon")
-                miner.rated_power_watts = 3200.0  # Default Avalon
-            else:
-                miner.miner_type = MinerType.CGMINER
-                miner.model = version_data.get("Type", "Unknown CGMiner")
-                
-        except Exception:
-            miner.miner_type = MinerType.CGMINER
-            miner.model = "Unknown"
-        
-        # Try to detect firmware type via Vnish Web API
-        if miner.miner_type == MinerType.ANTMINER:
+            # Try to get version for model info
             try:
-                vnish = VnishWebAPI(miner.ip, timeout=self.api_timeout)
-                sysinfo = await vnish.get_system_info()
-                if sysinfo and "minertype" in sysinfo:
-                    minertype = sysinfo.get("minertype", "")
-                    
-                    # Update model with full info from web API
-                    miner.model = minertype
-                    
-                    # If the Vnish web API responds, this IS a Vnish miner.
-                    # Stock firmware does not have these CGI endpoints.
-                    miner.firmware_type = FirmwareType.VNISH
-                    if "vnish" in minertype.lower():
-                        match = re.search(r'vnish\s*(\d+\.\d+\.?\d*)', minertype, re.IGNORECASE)
-                        if match:
-                            miner.firmware_version = match.group(1)
+                version = await api.get_version()
+                version_data = version.get("VERSION", [{}])[0]
+                
+                # Detect miner type from version
+                miner_type = version_data.get("Type", "").lower()
+                cgminer = version_data.get("CGMiner", "").lower()
+                miner_str = version_data.get("Miner", "").lower()
+                
+                if "antminer" in miner_type or "antminer" in cgminer:
+                    miner.miner_type = MinerType.ANTMINER
+                    miner.model = version_data.get("Type", "Antminer")
+                    # Set rated power based on Antminer model
+                    miner.rated_power_watts = self._estimate_antminer_power(miner.model)
+                elif "whatsminer" in miner_type or "btminer" in cgminer or "whatsminer" in miner_str:
+                    miner.miner_type = MinerType.WHATSMINER
+                    miner.model = version_data.get("Type", "Whatsminer")
+                    miner.rated_power_watts = 3400.0  # Default Whatsminer
+                elif "avalon" in miner_type:
+                    miner.miner_type = MinerType.AVALON
+                    miner.model = version_data.get("Type", "Avalon")
+                    miner.rated_power_watts = 3200.0  # Default Avalon
+                else:
+                    miner.miner_type = MinerType.CGMINER
+                    miner.model = version_data.get("Type", "Unknown CGMiner")
                     
-                    # Get MAC address if not already set
-                    if not miner.mac_address:
-                        miner.mac_address = sysinfo.get("macaddr", "")
-                    if not miner.hostname:
-                        miner.hostname = sysinfo.get("hostname", "")
             except Exception:
-                # Vnish API not available, assume stock firmware
-                miner.firmware_type = FirmwareType.STOCK
+                miner.miner_type = MinerType.CGMINER
+                miner.model = "Unknown"
+            
+            # Try to detect firmware type via Vnish Web API
+            if miner.miner_type == MinerType.ANTMINER:
+                try:
+                    sysinfo = await sysinfo_task
+                    if sysinfo and "minertype" in sysinfo:
+                        minertype = sysinfo.get("minertype", "")
+                        
+                        # Update model with full info from web API
+                        miner.model = minertype
+                        
+                        # If the Vnish web API responds, this IS a Vnish miner.
+                        # Stock firmware does not have these CGI endpoints.
+                        miner.firmware_type = FirmwareType.VNISH
+                        _, firmware_version = _classify_firmware(minertype)
+                        if firmware_version:
+                            miner.firmware_version = firmware_version
+                        
+                        # Get MAC address if not already set
+                        if not miner.mac_address:
+                            miner.mac_address = sysinfo.get("macaddr", "")
+                        if not miner.hostname:
+                            miner.hostname = sysinfo.get("hostname", "")
+                except Exception:
+                    # Vnish API not available, assume stock firmware
+                    miner.firmware_type = FirmwareType.STOCK
+            else:
+                sysinfo_task.cancel()
+            
+            stats, pools = await stats_and_pools
+        finally:
+            sysinfo_task.cancel()
+            stats_and_pools.cancel()
         
         # Try to get stats for power info (varies by miner type)
         try:
-            stats = await api.get_stats()
+            if isinstance(stats, BaseException):
+                raise stats
             await self._extract_power_info(miner, stats)
             # Only update rated power if current reading is higher than estimate,
             # but never exceed the sanity ceiling.
@@ -1458,7 +2452,8 @@ class MinerDiscoveryService:
         
         # Check if mining (has valid pool with accepted shares)
         try:
-            pools = await api.get_pools()
+            if isinstance(pools, BaseException):
+                raise pools
             pool_data = pools.get("POOLS", [])
             if pool_data:
                 active_pool = pool_data[0]
@@ -1476,36 +2471,29 @@ class MinerDiscoveryService:
         stats_data = stats.get("STATS", [])
         
         for stat in stats_data:
+            max_temp2, max_temp, max_fan, chain_sum = _reduce_stat(stat)
+            
             # Antminer/Vnish style - look for temp2_X fields (chip temps) or temp_max
             if "temp_max" in stat:
                 miner.temperature_c = float(stat["temp_max"])
             elif "temp2_1" in stat or "temp2_6" in stat:
                 # Get max temperature from temp2_X fields (chip temps)
-                temps = [v for k, v in stat.items() 
-                        if k.startswith("temp2_") and isinstance(v, (int, float)) and v > 0]
-                if temps:
-                    miner.temperature_c = max(temps)
+                if max_temp2:
+                    miner.temperature_c = max_temp2
             elif "temp_chip" in stat:
-                temps = [v for k, v in stat.items() 
-                        if k.startswith("temp") and isinstance(v, (int, float)) and v > 0]
-                if temps:
-                    miner.temperature_c = max(temps)
+                if max_temp:
+                    miner.temperature_c = max_temp
             
             # Get fan speed - fans are in RPM, convert to approximate %
-            fans = [v for k, v in stat.items() 
-                   if k.startswith("fan") and isinstance(v, (int, float)) and v > 0]
-            if fans:
-                max_fan_rpm = max(fans)
+            if max_fan:
                 # Antminer S9 max fan RPM is ~6000, estimate percentage
-                miner.fan_speed_pct = min(100.0, (max_fan_rpm / 6000.0) * 100.0)
+                miner.fan_speed_pct = min(100.0, (max_fan / 6000.0) * 100.0)
             
             # Power - check various formats
             # Vnish reports chain_consumption per hashboard
             raw_power: Optional[float] = None
-            chain_power = [v for k, v in stat.items() 
-                          if k.startswith("chain_consumption") and isinstance(v, (int, float)) and v > 0]
-            if chain_power:
-                raw_power = sum(chain_power)
+            if chain_sum:
+                raw_power = chain_sum
             elif "Power" in stat:
                 raw_power = float(stat["Power"])
             elif "chain_power" in stat:
@@ -1534,7 +2522,11 @@ class MinerDiscoveryService:
     # Miner Status Updates
     # =========================================================================
     
-    async def _poll_via_vnish(self, miner: DiscoveredMiner) -> Optional[DiscoveredMiner]:
+    async def _poll_via_vnish(
+        self,
+        miner: DiscoveredMiner,
+        now: Optional[datetime] = None
+    ) -> Optional[DiscoveredMiner]:
         """
         Fast-path poll for miners known to be sleeping/idle.
         
@@ -1542,11 +2534,11 @@ class MinerDiscoveryService:
         to the Vnish Web API (port 80, always available).  If hashrate > 0,
         the miner has woken up and we switch back to normal polling next cycle.
         """
-        vnish = VnishWebAPI(miner.ip, timeout=self.api_timeout)
+        vnish = VnishWebAPI(miner.ip, timeout=self.api_timeout, transport=self._vnish_transport)
         try:
             status = await vnish.get_status()
             miner.is_online = True
-            miner.last_seen = datetime.utcnow()
+            miner.last_seen = now or datetime.utcnow()
             miner.consecutive_failures = 0
 
             summary_data = status.get("summary") or status.get("SUMMARY", {})
@@ -1594,16 +2586,43 @@ class MinerDiscoveryService:
             logger.warning("Sleeping miner offline (fast-path)", ip=miner.ip, error=str(e))
             return miner
 
-    async def update_miner_status(self, miner_id: str) -> Optional[DiscoveredMiner]:
+    async def update_miner_status(
+        self,
+        miner_id: str,
+        now: Optional[datetime] = None
+    ) -> Optional[DiscoveredMiner]:
         """
         Update status for a single miner.
         
         Args:
             miner_id: The miner ID to update
+            now: Poll-cycle timestamp, naive UTC like every other datetime here (defaults to now)
             
         Returns:
             Updated miner or None if not found/offline
+        
+        Concurrent calls for the same miner (e.g. a poll cycle overlapping a
+        discovery run) share one in-flight poll instead of querying the
+        miner twice.
         """
+        task = self._inflight_updates.get(miner_id)
+        if task is None:
+            task = asyncio.create_task(self._poll_miner_status(miner_id, now))
+            self._inflight_updates[miner_id] = task
+            task.add_done_callback(
+                lambda _, mid=miner_id: self._inflight_updates.pop(mid, None)
+            )
+        return await asyncio.shield(task)
+    
+    async def _poll_miner_status(
+        self,
+        miner_id: str,
+        now: Optional[datetime] = None
+    ) -> Optional[DiscoveredMiner]:
+        """Poll one miner and update its DiscoveredMiner in place."""
+        if now is None:
+            now = datetime.utcnow()
+        
         async with self._lock:
             miner = self._miners.get(miner_id)
             if not miner:
@@ -1613,18 +2632,14 @@ class MinerDiscoveryService:
         # is closed during sleep) and go straight to Vnish Web API.  This avoids
         # a 5s timeout per sleeping miner and makes the poll cycle much faster.
         if miner.power_mode == MinerPowerMode.IDLE and not miner.is_mining:
-            return await self._poll_via_vnish(miner)
+            return await self._poll_via_vnish(miner, now)
         
-        api = CGMinerAPI(miner.ip, miner.port, timeout=self.api_timeout)
+        api = self._get_cgminer(miner.ip, miner.port)
         
         try:
             # Get summary
-            summary = await api.get_summary()
-            summary_data = summary.get("SUMMARY", [{}])[0]
-            
-            # CGMiner sometimes returns strings, so convert to float
-            hashrate_raw = summary_data.get("GHS 5s", 0) or summary_data.get("GHS av", 0)
-            hashrate_val = float(hashrate_raw) if hashrate_raw else 0.0
+            parsed = await api.get_summary_typed()
+            hashrate_val = parsed.hashrate_ghs
             if hashrate_val > _MAX_MINER_HASHRATE_GHS:
                 logger.warning(
                     "Miner reports unrealistic hashrate — clamped",
@@ -1637,22 +2652,33 @@ class MinerDiscoveryService:
                 miner.clamped_reason = f"{miner.clamped_reason}; {reason}" if miner.clamped_reason else reason
                 hashrate_val = _MAX_MINER_HASHRATE_GHS
             miner.hashrate_ghs = hashrate_val
-            miner.uptime_seconds = int(summary_data.get("Elapsed", 0) or 0)
+            miner.uptime_seconds = parsed.elapsed_s
             miner.is_online = True
-            miner.last_seen = datetime.utcnow()
+            miner.last_seen = now
             miner.consecutive_failures = 0
             miner.power_mode = MinerPowerMode.NORMAL
             
+            # Stats, pools and config are independent - fetch them together
+            vnish = self._get_vnish(miner.ip)
+            stats, pools, config = await asyncio.gather(
+                api.get_stats(),
+                api.get_pools(),
+                vnish.get_config(),
+                return_exceptions=True
+            )
+            
             # Get detailed stats
             try:
-                stats = await api.get_stats()
+                if isinstance(stats, BaseException):
+                    raise stats
                 await self._extract_power_info(miner, stats)
             except Exception:
                 pass
             
             # Check pools for mining status
             try:
-                pools = await api.get_pools()
+                if isinstance(pools, BaseException):
+                    raise pools
                 pool_data = pools.get("POOLS", [])
                 if pool_data:
                     active_pool = pool_data[0]
@@ -1676,7 +2702,7 @@ class MinerDiscoveryService:
                 logger.info(
                     "Miner booting: CGMiner open but hashrate=0, keeping transition",
                     ip=miner.ip,
-                    elapsed_s=round((datetime.utcnow() - miner.last_command_time).total_seconds()),
+                    elapsed_s=round(time.monotonic() - miner.last_command_monotonic),
                     grace_s=miner.transition_grace_seconds,
                 )
             
@@ -1695,8 +2721,8 @@ class MinerDiscoveryService:
             
             # Get current frequency from miner config (for frequency-based power control)
             try:
-                vnish = VnishWebAPI(miner.ip)
-                config = await vnish.get_config()
+                if isinstance(config, BaseException):
+                    raise config
                 freq_str = config.get("bitmain-freq", "")
                 if freq_str:
                     miner.current_frequency = int(freq_str)
@@ -1718,12 +2744,12 @@ class MinerDiscoveryService:
             # whether cgminer is actually running and mining.
             logger.info("CGMiner port closed, checking Vnish Web API", ip=miner.ip)
             
-            vnish = VnishWebAPI(miner.ip)
+            vnish = self._get_vnish(miner.ip)
             try:
                 # Try get_miner_status.cgi first — it tells us if mining is active
                 status = await vnish.get_status()
                 miner.is_online = True
-                miner.last_seen = datetime.utcnow()
+                miner.last_seen = now
                 miner.consecutive_failures = 0
                 
                 # Parse mining status from Vnish web API response
@@ -1795,13 +2821,14 @@ class MinerDiscoveryService:
             # But if we recently sent a command, the miner might be transitioning
             if miner.is_transitioning:
                 # Keep current online state during transition grace period
-                logger.debug(
-                    "Miner not responding but in transition grace period",
-                    miner_id=miner_id,
-                    ip=miner.ip,
-                    command=miner.last_command_type,
-                    elapsed_s=(datetime.utcnow() - miner.last_command_time).total_seconds()
-                )
+                if _stdlib_logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Miner not responding but in transition grace period",
+                        miner_id=miner_id,
+                        ip=miner.ip,
+                        command=miner.last_command_type,
+                        elapsed_s=time.monotonic() - miner.last_command_monotonic
+                    )
                 # Don't mark offline during transition, but don't reset failures either
                 return miner
             
@@ -1820,20 +2847,19 @@ class MinerDiscoveryService:
     async def update_all_miners(self) -> List[DiscoveredMiner]:
         """Update status for all registered miners."""
         miner_ids = list(self._miners.keys())
+        now = datetime.utcnow()
         
         async def _poll_with_semaphore(mid: str):
             async with self._poll_semaphore:
-                return await self.update_miner_status(mid)
+                return await self.update_miner_status(mid, now=now)
         
         tasks = [_poll_with_semaphore(mid) for mid in miner_ids]
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        updated = []
-        for result in results:
-            if isinstance(result, DiscoveredMiner):
-                updated.append(result)
-                # Save snapshot for historical data
-                self._save_miner_snapshot(result)
+        updated = [result for result in results if isinstance(result, DiscoveredMiner)]
+        
+        # Save snapshots for historical data
+        await self._save_miner_snapshots(updated, now)
         
         return updated
     
@@ -1841,6 +2867,7 @@ class MinerDiscoveryService:
     # Miner Control
     # =========================================================================
     
+    @_singleflight("idle")
     async def set_miner_idle(self, miner_id: str) -> Tuple[bool, str]:
         """
         Put a miner into idle mode.
@@ -1871,6 +2898,7 @@ class MinerDiscoveryService:
             # Generic: Try to disable pools or switch to invalid pool
             return await self._disable_miner_pools(miner)
     
+    @_singleflight("active")
     async def set_miner_active(self, miner_id: str) -> Tuple[bool, str]:
         """
         Resume a miner from idle mode.
@@ -1896,6 +2924,7 @@ class MinerDiscoveryService:
         else:
             return await self._enable_miner_pools(miner)
     
+    @_singleflight("restart")
     async def restart_miner(self, miner_id: str) -> Tuple[bool, str]:
         """
         Soft restart a miner (restart cgminer software only).
@@ -1920,9 +2949,12 @@ class MinerDiscoveryService:
         miner.mark_command_sent('restart', grace_seconds=60)
         
         # Try Vnish Web API first for more reliable restart
-        vnish = VnishWebAPI(miner.ip)
+        vnish = self._get_vnish(miner.ip)
         try:
-            if await vnish.is_vnish_available():
+            if await self._vnish_available(miner.ip):
+                self._vnish_avail_cache.pop(miner.ip, None)
+                # Not _bounded: start_cgminer owns its request timeout and
+                # reports the expected no-answer timeout as "sent"
                 try:
                     await vnish.start_cgminer()
                 except Exception:
@@ -1934,10 +2966,10 @@ class MinerDiscoveryService:
             logger.debug("Vnish restart failed, trying CGMiner API", error=str(e))
         
         # Fallback to CGMiner API
-        api = CGMinerAPI(miner.ip, miner.port, timeout=self.api_timeout)
+        api = self._get_cgminer(miner.ip, miner.port)
         
         try:
-            await api.send_command("restart")
+            await self._bounded(api.send_command("restart"))
         except Exception:
             # Restart command often doesn't return a response - that's expected
             pass
@@ -1945,6 +2977,7 @@ class MinerDiscoveryService:
         logger.info("Miner restart command sent", miner_id=miner_id)
         return True, "Restart command sent (takes ~30-45s)"
     
+    @_singleflight("reboot")
     async def reboot_miner(self, miner_id: str) -> Tuple[bool, str]:
         """
         Full system reboot of a miner.
@@ -1966,11 +2999,13 @@ class MinerDiscoveryService:
         
         # Mark that we're sending a reboot command - miner will be unavailable for a while
         miner.mark_command_sent('reboot', grace_seconds=120)
+        self._vnish_avail_cache.pop(miner.ip, None)
         
-        vnish = VnishWebAPI(miner.ip)
+        vnish = self._get_vnish(miner.ip)
         
         try:
-            # Reboot command usually doesn't return a response
+            # Reboot command usually doesn't return a response; reboot_system
+            # times out on its own, so an outer bound would only cancel it
             try:
                 await vnish.reboot_system()
             except Exception:
@@ -1982,7 +3017,7 @@ class MinerDiscoveryService:
             logger.error("Failed to send reboot command", miner_id=miner_id, ip=miner.ip, error=str(e))
             return False, f"Reboot command failed: {e}"
 
-    async def blink_miner(self, miner_ip: str) -> Tuple[bool, str]:
+    async def blink_miner(self, miner_ip: str) -> Tuple[bool, str, bool]:
         """
         Toggle a miner's find mode (LED blinking) on or off.
         
@@ -1995,23 +3030,13 @@ class MinerDiscoveryService:
         Returns:
             Tuple of (success, message, is_enabled)
         """
-        # Find miner by IP
-        miner = None
-        for m in self._miners.values():
-            if m.ip == miner_ip:
-                miner = m
-                break
-        
+        miner = self._miners_by_ip.get(miner_ip)
         if not miner:
             return False, f"Miner at {miner_ip} not found", False
         
-        vnish = VnishWebAPI(miner_ip)
+        vnish = self._get_vnish(miner_ip)
         
         try:
-            # Track find mode state per miner (default to False/off)
-            if not hasattr(self, '_find_mode_states'):
-                self._find_mode_states = {}
-            
             current_state = self._find_mode_states.get(miner_ip, False)
             new_state = not current_state
             
@@ -2027,6 +3052,7 @@ class MinerDiscoveryService:
             logger.error("Failed to toggle miner find mode", ip=miner_ip, error=str(e))
             return False, f"Toggle failed: {e}", False
     
+    @_singleflight("factory_reset")
     async def factory_reset_miner(self, miner_id: str) -> Tuple[bool, str]:
         """
         Factory reset a miner to default configuration.
@@ -2048,46 +3074,16 @@ class MinerDiscoveryService:
         if not miner:
             return False, f"Miner {miner_id} not found"
         
-        vnish = VnishWebAPI(miner.ip)
+        vnish = self._get_vnish(miner.ip)
         
         try:
-            if not await vnish.is_vnish_available():
+            if not await self._vnish_available(miner.ip):
                 return False, "Vnish Web API not available - factory reset requires Vnish firmware"
             
-            # Reset to default Vnish config
-            # Clear pools and set default mining parameters
-            default_config = {
-                # Clear all pools
-                "_ant_pool1url": "",
-                "_ant_pool1user": "",
-                "_ant_pool1pw": "",
-                "_ant_pool2url": "",
-                "_ant_pool2user": "",
-                "_ant_pool2pw": "",
-                "_ant_pool3url": "",
-                "_ant_pool3user": "",
-                "_ant_pool3pw": "",
-                # Default mining settings for S9
-                "_ant_freq": "550",
-                "_ant_voltage": "8.8",
-                "_ant_fan_customize_switch": "false",
-                "_ant_fan_customize_value": "100",
-                "_ant_fan_rpm_off": "0",
-                "_ant_target_temp": "75",
-                "_ant_tempoff": "105",
-                "_ant_asicboost": "true",
-                "_ant_nobeeper": "false",
-                "_ant_notempoverctrl": "false",
-                # Auto-downscale settings
-                "_ant_autodownscale_timer": "2",
-                "_ant_autodownscale_after": "10",
-                "_ant_autodownscale_step": "25",
-                "_ant_autodownscale_min": "400",
-                "_ant_autodownscale_prec": "75",
-                "_ant_autodownscale_profile": "1",
-            }
-            
-            result = await vnish._post_config("/cgi-bin/set_miner_conf_custom.cgi", default_config)
+            # Clear pools and restore default mining parameters
+            result = await vnish._post_config(
+                "/cgi-bin/set_miner_conf_custom.cgi", dict(DEFAULT_S9_FACTORY_CONFIG)
+            )
             
             if result.get("success") or result.get("status") == 200:
                 logger.info("Miner factory reset completed", miner_id=miner_id, ip=miner.ip)
@@ -2109,19 +3105,19 @@ class MinerDiscoveryService:
         
         Whatsminer supports: low, normal, high modes via API.
         """
-        api = CGMinerAPI(miner.ip, miner.port, timeout=self.api_timeout)
+        api = self._get_cgminer(miner.ip, miner.port)
         
         try:
             # Whatsminer uses "set_power_pct" or similar commands
             # The exact command varies by firmware version
-            result = await api.send_command("set_power_mode", mode)
+            result = await self._bounded(api.send_command("set_power_mode", mode))
             
-            status = result.get("STATUS", [{}])[0]
-            if status.get("STATUS") == "S":
+            code, msg = _cgminer_status(result)
+            if code == "S":
                 miner.power_mode = MinerPowerMode.LOW if mode == "low" else MinerPowerMode.NORMAL
                 return True, f"Power mode set to {mode}"
             else:
-                return False, f"Failed: {status.get('Msg', 'Unknown error')}"
+                return False, f"Failed: {msg}"
                 
         except Exception as e:
             logger.warning(
@@ -2142,7 +3138,7 @@ class MinerDiscoveryService:
         and Vnish firmware.  Falls back to do_sleep_mode.cgi for older
         Vnish builds that lack stop_bmminer.cgi.
         """
-        vnish = VnishWebAPI(miner.ip)
+        vnish = self._get_vnish(miner.ip)
         
         try:
             logger.info("Stopping bmminer on miner", ip=miner.ip)
@@ -2150,7 +3146,9 @@ class MinerDiscoveryService:
             # Mark that we're sending a command - miner may fluctuate for ~30s
             miner.mark_command_sent('sleep', grace_seconds=45)
             
-            # Primary: stop_bmminer.cgi — works on stock Bitmain and Vnish
+            # Primary: stop_bmminer.cgi — works on stock Bitmain and Vnish.
+            # Not _bounded: stop_cgminer has its own request timeout and
+            # returns False on failure, which must reach the fallback below.
             if await vnish.stop_cgminer():
                 miner.power_mode = MinerPowerMode.IDLE
                 miner.is_mining = False
@@ -2162,7 +3160,9 @@ class MinerDiscoveryService:
             
             # Fallback: sleep mode API (Vnish only)
             logger.info("stop_bmminer failed, trying sleep mode", ip=miner.ip)
-            if await vnish.set_sleep_mode(enable=True):
+            # set_sleep_mode reports transport failures as False and bounds
+            # itself with its request timeout; retry on False, unbounded
+            if await self._retry(lambda: vnish.set_sleep_mode(enable=True), retry_false=True):
                 miner.power_mode = MinerPowerMode.IDLE
                 miner.is_mining = False
                 miner.hashrate_ghs = 0
@@ -2198,7 +3198,7 @@ class MinerDiscoveryService:
                         ip=miner.ip, booting_for_s=round(elapsed))
             return True, "Already waking"
 
-        vnish = VnishWebAPI(miner.ip)
+        vnish = self._get_vnish(miner.ip)
         
         try:
             logger.info("Waking miner via reboot", ip=miner.ip)
@@ -2207,7 +3207,9 @@ class MinerDiscoveryService:
             # _wake_grace_seconds so the regulation loop doesn't re-trigger.
             miner.mark_command_sent('wake', grace_seconds=180)
             
-            # Try cgminer-only restart first (Vnish firmware — faster, ~30s)
+            # Try cgminer-only restart first (Vnish firmware — faster, ~30s).
+            # Both wake calls are fire-and-forget with their own request
+            # timeout (treated as "sent"), so they are not _bounded.
             try:
                 if await vnish.start_cgminer():
                     logger.info("Wake via reboot_cgminer sent", ip=miner.ip)
@@ -2254,10 +3256,10 @@ class MinerDiscoveryService:
         if not miner:
             return False, f"Miner {miner_id} not found"
         
-        vnish = VnishWebAPI(miner.ip)
+        vnish = self._get_vnish(miner.ip)
         
         try:
-            if not await vnish.is_vnish_available():
+            if not await self._vnish_available(miner.ip):
                 return False, "Vnish Web API not available - frequency control requires Vnish firmware"
             
             # Mark that we're sending a config change - saving config may reboot the miner
@@ -2301,10 +3303,10 @@ class MinerDiscoveryService:
         if not miner:
             return None
         
-        vnish = VnishWebAPI(miner.ip)
+        vnish = self._get_vnish(miner.ip)
         
         try:
-            if not await vnish.is_vnish_available():
+            if not await self._vnish_available(miner.ip):
                 return None
             
             config = await vnish.get_miner_config()
@@ -2339,27 +3341,41 @@ class MinerDiscoveryService:
         Returns:
             Tuple of (success, miner or None)
         """
-        miner = await self._probe_miner(ip, port)
+        miner = await self._probe_and_register(ip, port, rated_power_watts)
         
         if miner:
-            miner.rated_power_watts = rated_power_watts
-            async with self._lock:
-                self._miners[miner.id] = miner
-            # Save to database
-            self._save_miner_to_db(miner)
+            # Save to database (batched by the write-behind saver)
+            self._queue_miner_save(miner)
             logger.info("Miner added manually", ip=ip, model=miner.model)
             return True, miner
         else:
             logger.warning("Failed to add miner - not responding", ip=ip)
             return False, None
     
-    def remove_miner(self, miner_id: str) -> bool:
-        """Remove a miner from the registry."""
-        if miner_id in self._miners:
-            del self._miners[miner_id]
-            logger.info("Miner removed", miner_id=miner_id)
-            return True
-        return False
+    async def _probe_and_register(
+        self,
+        ip: str,
+        port: int,
+        rated_power_watts: float
+    ) -> Optional[DiscoveredMiner]:
+        """Probe an explicitly requested IP and register it if it answers."""
+        # Explicit request - always try the Vnish fallback
+        self._no_vnish_cache.pop(ip, None)
+        miner = await self._probe_miner(ip, port)
+        if miner:
+            miner.rated_power_watts = rated_power_watts
+            async with self._lock:
+                self._register_miner(miner)
+        return miner
+    
+    async def remove_miner(self, miner_id: str) -> bool:
+        """Remove a miner from the registry along with its cached clients."""
+        async with self._lock:
+            if miner_id not in self._miners:
+                return False
+            self._unregister_miner(miner_id)
+        logger.info("Miner removed", miner_id=miner_id)
+        return True
     
     def configure_miner_power(self, miner_id: str, rated_power_watts: float):
         """Configure rated power for a miner."""
@@ -2379,32 +3395,53 @@ class MinerDiscoveryService:
         """Export miner registry for persistence."""
         return [
             {
-                "ip": m.ip,
-                "port": m.port,
-                "rated_power_watts": m.rated_power_watts,
-                "miner_type": m.miner_type.value,
-                "model": m.model
+                "ip": ip,
+                "port": port,
+                "rated_power_watts": rated_power_watts,
+                "miner_type": miner_type.value,
+                "model": model
             }
-            for m in self._miners.values()
+            for ip, port, rated_power_watts, miner_type, model
+            in map(_export_fields, self._miners.values())
         ]
     
-    async def import_miners(self, miner_configs: List[Dict[str, Any]]):
-        """Import miners from saved configuration."""
-        for config in miner_configs:
-            await self.add_miner(
-                ip=config["ip"],
-                port=config.get("port", 4028),
-                rated_power_watts=config.get("rated_power_watts", 3000.0)
-            )
-
-
-# Singleton instance
-_discovery_service: Optional[MinerDiscoveryService] = None
+    async def import_miners(
+        self,
+        miner_configs: List[Dict[str, Any]],
+        max_concurrent: int = 32
+    ):
+        """
+        Import miners from saved configuration.
+        
+        Probes run concurrently (at most max_concurrent at once); the miners
+        that answer are saved to the database in one batch at the end.
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+        
+        async def _import_one(config: Dict[str, Any]) -> Optional[DiscoveredMiner]:
+            async with semaphore:
+                return await self._probe_and_register(
+                    config["ip"],
+                    config.get("port", 4028),
+                    config.get("rated_power_watts", 3000.0)
+                )
+        
+        results = await asyncio.gather(
+            *(_import_one(config) for config in miner_configs),
+            return_exceptions=True
+        )
+        imported = [m for m in results if isinstance(m, DiscoveredMiner)]
+        for config, result in zip(miner_configs, results):
+            if isinstance(result, BaseException):
+                logger.warning("Failed to import miner", ip=config.get("ip"), error=str(result))
+            elif result is None:
+                logger.warning("Failed to import miner - not responding", ip=config["ip"])
+        
+        await self._save_miners_to_db(imported)
+        logger.info("Miners imported", imported=len(imported), requested=len(miner_configs))
 
 
+@lru_cache
 def get_discovery_service() -> MinerDiscoveryService:
     """Get the singleton discovery service instance."""
-    global _discovery_service
-    if _discovery_service is None:
-        _discovery_service = MinerDiscoveryService()
-    return _discovery_service
+    return MinerDiscoveryService()
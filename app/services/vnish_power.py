@@ -11,14 +11,27 @@ Key features:
 - Power estimation from current frequency
 """
 import asyncio
+import json
+import time
+from bisect import bisect_left
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional, Dict, Any, List, Tuple
 import httpx
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPDigestAuth
 import structlog
 
+from app.services.miner_discovery import cache_pools, get_cached_pools, invalidate_vnish_cache
+
+try:
+    # Optional: faster parsing of the Vnish config payload
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = structlog.get_logger()
 
 
@@ -50,7 +63,8 @@ S9_POWER_CURVE = [
 ]
 
 # Valid frequencies available on Vnish firmware (from web UI dropdown)
-VALID_FREQUENCIES = [
+# Kept sorted ascending: _snap_to_valid_frequency bisects it.
+VALID_FREQUENCIES = (
     100, 125, 150, 175, 200, 225, 250, 275, 300, 325, 350, 375, 400,
     404, 406, 408, 412, 416, 418, 420, 425, 429, 431, 433, 437, 441,
     443, 445, 450, 454, 456, 458, 462, 466, 468, 470, 475, 479, 481,
@@ -60,7 +74,212 @@ VALID_FREQUENCIES = [
     675, 681, 687, 693, 700, 706, 712, 718, 725, 731, 737, 743, 750,
     756, 762, 768, 775, 781, 787, 793, 800, 825, 850, 875, 900, 925,
     950, 975, 1000, 1025, 1050, 1075, 1100, 1125, 1150, 1175
-]
+)
+
+
+# Entries kept per lookup memo before it is reset
+_MEMO_MAX_ENTRIES = 4096
+
+
+def _memo_put(memo: Dict, key: Any, value: Any) -> Any:
+    """Store value in a bounded lookup memo and return it."""
+    if len(memo) >= _MEMO_MAX_ENTRIES:
+        memo.clear()
+    memo[key] = value
+    return value
+
+
+# ── Vnish config form ───────────────────────────────────────────────
+
+# set_miner_conf_custom.cgi expects every field in this exact order.  Only
+# the pools, _ant_freq and _ant_voltage vary; the constant runs between
+# them are built once here.
+_FORM_FIELDS_BEFORE_FREQ: Tuple[Tuple[str, str], ...] = (
+    ("_ant_nobeeper", "false"),
+    ("_ant_notempoverctrl", "false"),
+    ("_ant_fan_customize_switch", "false"),
+    ("_ant_fan_customize_value", "100"),
+)
+_FORM_FIELDS_BEFORE_VOLTAGE: Tuple[Tuple[str, str], ...] = (
+    ("_ant_freq1", "0"),
+    ("_ant_freq2", "0"),
+    ("_ant_freq3", "0"),
+)
+_STATIC_FORM_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("_ant_voltage1", "0"),
+    ("_ant_voltage2", "0"),
+    ("_ant_voltage3", "0"),
+    ("_ant_fan_rpm_off", "0"),
+    ("_ant_chip_freq", ""),
+    ("_ant_autodownscale", "false"),
+    ("_ant_autodownscale_watch", "false"),
+    ("_ant_autodownscale_watchtimer", "false"),
+    ("_ant_autodownscale_timer", "1"),
+    ("_ant_autodownscale_after", "120"),
+    ("_ant_autodownscale_step", "2"),
+    ("_ant_autodownscale_min", "650"),
+    ("_ant_autodownscale_prec", "75"),
+    ("_ant_autodownscale_profile", "0"),
+    ("_ant_minhr", "0"),
+    ("_ant_asicboost", "false"),
+    ("_ant_tempoff", "0"),
+    ("_ant_altdf", "true"),
+    ("_ant_presave", "1"),
+    ("_ant_name", "0"),
+    ("_ant_warn", ""),
+    ("_ant_maxx", ""),
+    ("_ant_trigger_reboot", ""),
+    ("_ant_target_temp", "0"),
+    ("_ant_silentstart", "false"),
+    ("_ant_altdfno", "0"),
+    ("_ant_autodownscale_reboot", "false"),
+    ("_ant_hotel_fee", "false"),
+    ("_ant_lpm_mode", "false"),
+    ("_ant_dchain5", "false"),
+    ("_ant_dchain6", "false"),
+    ("_ant_dchain7", "false"),
+)
+_EMPTY_POOL: Dict[str, str] = {}
+_POOL_FIELD_NAMES: Tuple[Tuple[str, str, str], ...] = tuple(
+    (f"_ant_pool{n}url", f"_ant_pool{n}user", f"_ant_pool{n}pw") for n in (1, 2, 3)
+)
+
+
+@lru_cache(maxsize=256)
+def _frequency_form_fields(frequency_mhz: int, voltage_int: int) -> Tuple[Tuple[str, str], ...]:
+    """
+    Everything after the pool fields for one (frequency, voltage) pair.
+    
+    A fleet update sends the same few pairs to many miners, so the tail is
+    built once per pair and shared.
+    """
+    return (
+        *_FORM_FIELDS_BEFORE_FREQ,
+        ("_ant_freq", str(frequency_mhz)),
+        *_FORM_FIELDS_BEFORE_VOLTAGE,
+        ("_ant_voltage", str(voltage_int)),
+        *_STATIC_FORM_FIELDS,
+    )
+
+
+def _build_form_data(
+    pools: List[Dict[str, Any]],
+    frequency_mhz: int,
+    voltage_int: int
+) -> List[Tuple[str, str]]:
+    """
+    Build the set_miner_conf_custom.cgi form for a frequency change.
+    
+    Args:
+        pools: Pool list from get_miner_conf.cgi (first three are kept)
+        frequency_mhz: Target frequency in MHz
+        voltage_int: Target voltage in hundredths of a volt (890 = 8.9V)
+        
+    Returns:
+        Ordered (field, value) pairs
+    """
+    form_data: List[Tuple[str, str]] = []
+    for n, (url_key, user_key, pw_key) in enumerate(_POOL_FIELD_NAMES):
+        pool = pools[n] if len(pools) > n else _EMPTY_POOL
+        form_data.append((url_key, pool.get("url", "")))
+        form_data.append((user_key, pool.get("user", "")))
+        form_data.append((pw_key, pool.get("pass", "")))
+    form_data.extend(_frequency_form_fields(frequency_mhz, voltage_int))
+    return form_data
+
+
+def _fetch_pools(
+    session: requests.Session,
+    base_url: str
+) -> Tuple[Optional[List[Dict[str, Any]]], str]:
+    """
+    Read the miner's pool list from get_miner_conf.cgi, with retry.
+    
+    Returns:
+        (pools, "") on success, (None, error message) on failure
+    """
+    # Retry logic for connection issues (miner might be restarting)
+    max_retries = 3
+    retry_delay = 10  # seconds
+    
+    for attempt in range(max_retries):
+        try:
+            resp = session.get(
+                f"{base_url}/cgi-bin/get_miner_conf.cgi",
+                timeout=30
+            )
+            if resp.status_code == 200:
+                break  # Success, continue
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if attempt < max_retries - 1:
+                time.sleep(retry_delay)
+                continue
+            return None, f"Connection failed after {max_retries} attempts: {e}"
+    
+    if resp.status_code != 200:
+        return None, f"Failed to get config: HTTP {resp.status_code}"
+    
+    return _json_loads(resp.content).get("pools", []), ""
+
+
+def _set_config_sync(
+    session: requests.Session,
+    host: str,
+    frequency_mhz: int,
+    voltage_int: int,
+    voltage: float,
+    pools: Optional[List[Dict[str, Any]]] = None
+) -> Tuple[bool, str, Optional[List[Dict[str, Any]]]]:
+    """
+    Synchronous Vnish config update using requests with retry.
+    
+    Runs on an executor thread.  Touches nothing but its arguments, so
+    several miners can be reconfigured in parallel.
+    
+    Args:
+        pools: Known pool list for the miner; when given, the config read
+            is skipped unless the write is rejected
+            
+    Returns:
+        (success, message, pools read from the miner or None if none were)
+    """
+    base_url = f"http://{host}"
+    fetched = None
+    
+    while True:
+        # Step 1: Get current config to preserve pool settings
+        if pools is None:
+            pools, error = _fetch_pools(session, base_url)
+            if pools is None:
+                return False, error, None
+            fetched = pools
+        
+        # Step 2: Build form data in exact order vnish expects
+        form_data = _build_form_data(pools, frequency_mhz, voltage_int)
+        
+        # Step 3: Post config
+        resp = session.post(
+            f"{base_url}/cgi-bin/set_miner_conf_custom.cgi",
+            data=form_data,
+            timeout=30
+        )
+        if resp.status_code == 200:
+            break
+        if fetched is not None:
+            return False, f"Failed to set config: HTTP {resp.status_code}", None
+        # Rejected with remembered pools - re-read the config and try once more
+        pools = None
+    
+    # Step 4: Restart CGMiner - use very short timeout, it never responds
+    try:
+        session.get(
+            f"{base_url}/cgi-bin/reboot_cgminer.cgi",
+            timeout=2
+        )
+    except (requests.Timeout, requests.exceptions.ReadTimeout, requests.exceptions.ConnectionError):
+        pass  # Expected - endpoint never responds
+    
+    return True, f"Frequency set to {frequency_mhz}MHz @ {voltage}V", fetched
 
 
 class VnishPowerService:
@@ -75,13 +294,29 @@ class VnishPowerService:
     """
     
     def __init__(self):
-        # Power curve - can be customized per miner model
+        # Power curve - can be customized per miner model.  The point list
+        # is kept for the API; lookups only read the columns below.
         self.power_curve = S9_POWER_CURVE
         
+        # Curve columns as tuples, sorted ascending, for bisect lookups
+        self._powers = tuple(p.power_watts for p in self.power_curve)
+        self._freqs = tuple(p.frequency_mhz for p in self.power_curve)
+        self._voltages = tuple(p.voltage for p in self.power_curve)
+        self._power_min = self._powers[0]
+        self._power_span = self._powers[-1] - self._powers[0]
+        
+        # Below this a swing miner is parked at min_frequency
+        self._min_power_threshold = self._power_min * 0.5
+        
+        # Memoized curve lookups; allocations repeat the same few targets
+        self._p2f_memo: Dict[Tuple[float, int, int], Tuple[int, float]] = {}
+        self._f2p_memo: Dict[float, int] = {}
+        self._voltage_memo: Dict[float, float] = {}
+        
         # Cache of current miner frequencies
         self._miner_frequencies: Dict[str, int] = {}
         
-        # Default settings
+        # Default settings (min_frequency also sets _min_useful_power)
         self.min_frequency = 300  # Don't go below this
         self.max_frequency = 800  # Don't go above this for safety
         self.default_frequency = 650  # Full power frequency
@@ -89,6 +324,27 @@ class VnishPowerService:
         # Hysteresis to avoid constant changes
         self.min_power_change_watts = 50  # Ignore changes smaller than this
         self.min_frequency_change = 25  # Don't change freq by less than 25 MHz
+        
+        # Keep-alive HTTP clients: one requests.Session per miner for the
+        # get-config -> post-config -> restart sequence, and one shared
+        # httpx client for frequency reads
+        self._sessions: Dict[str, requests.Session] = {}
+        self._async_client: Optional[httpx.AsyncClient] = None
+        
+        # Worker threads for the blocking requests-based config writes
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._max_config_workers = 32
+    
+    @property
+    def min_frequency(self) -> int:
+        """Lowest frequency a miner is driven to."""
+        return self._min_frequency
+    
+    @min_frequency.setter
+    def min_frequency(self, value: int):
+        self._min_frequency = value
+        # Power drawn at min_frequency; below it a swing miner just idles
+        self._min_useful_power = self.frequency_to_power(value)
     
     def power_to_frequency(self, target_power_watts: int) -> Tuple[int, float]:
         """
@@ -102,33 +358,75 @@ class VnishPowerService:
         Returns:
             Tuple of (frequency_mhz, voltage)
         """
+        # Snapping depends on the frequency limits, so they are part of the key
+        key = (target_power_watts, self.min_frequency, self.max_frequency)
+        result = self._p2f_memo.get(key)
+        if result is None:
+            result = _memo_put(self._p2f_memo, key, self._power_to_frequency(target_power_watts))
+        return result
+    
+    def _power_to_frequency(self, target_power_watts: int) -> Tuple[int, float]:
+        """Uncached power_to_frequency."""
+        powers, freqs, voltages = self._powers, self._freqs, self._voltages
+        
         # Clamp to valid range
-        min_power = self.power_curve[0].power_watts
-        max_power = self.power_curve[-1].power_watts
+        if target_power_watts <= powers[0]:
+            return self._snap_to_valid_frequency(freqs[0]), voltages[0]
         
-        if target_power_watts <= min_power:
-            point = self.power_curve[0]
-            return self._snap_to_valid_frequency(point.frequency_mhz), point.voltage
+        if target_power_watts >= powers[-1]:
+            return self._snap_to_valid_frequency(freqs[-1]), voltages[-1]
         
-        if target_power_watts >= max_power:
-            point = self.power_curve[-1]
-            return self._snap_to_valid_frequency(point.frequency_mhz), point.voltage
+        i, ratio = self._bracket_by_power(target_power_watts)
         
-        # Find the two points to interpolate between
-        for i in range(len(self.power_curve) - 1):
-            p1 = self.power_curve[i]
-            p2 = self.power_curve[i + 1]
-            
-            if p1.power_watts <= target_power_watts <= p2.power_watts:
-                # Linear interpolation
-                ratio = (target_power_watts - p1.power_watts) / (p2.power_watts - p1.power_watts)
-                freq = int(p1.frequency_mhz + ratio * (p2.frequency_mhz - p1.frequency_mhz))
-                voltage = p1.voltage + ratio * (p2.voltage - p1.voltage)
-                
-                return self._snap_to_valid_frequency(freq), round(voltage, 1)
+        # Linear interpolation
+        freq = int(freqs[i - 1] + ratio * (freqs[i] - freqs[i - 1]))
+        voltage = voltages[i - 1] + ratio * (voltages[i] - voltages[i - 1])
+        
+        return self._snap_to_valid_frequency(freq), round(voltage, 1)
+    
+    def _bracket_by_power(self, target_power_watts: float) -> Tuple[int, float]:
+        """
+        Curve interval and position of a power inside the curve's range.
+        
+        Returns:
+            (i, ratio) with target = powers[i-1] + ratio * (powers[i] - powers[i-1]);
+            any column is interpolated at the same point with the same pair
+        """
+        powers = self._powers
+        i = self._power_interval(target_power_watts)
+        return i, (target_power_watts - powers[i - 1]) / (powers[i] - powers[i - 1])
+    
+    def _bracket_by_frequency(self, frequency_mhz: float) -> Tuple[int, float]:
+        """
+        Curve interval and position of a frequency inside the curve's range.
         
-        # Fallback
-        return self.default_frequency, 8.9
+        Returns:
+            (i, ratio) with frequency = freqs[i-1] + ratio * (freqs[i] - freqs[i-1])
+        """
+        freqs = self._freqs
+        i = max(1, bisect_left(freqs, frequency_mhz))
+        return i, (frequency_mhz - freqs[i - 1]) / (freqs[i] - freqs[i - 1])
+    
+    def _power_interval(self, target_power_watts: float) -> int:
+        """
+        Index i of the curve interval with powers[i-1] < target <= powers[i].
+        
+        The curve's power points are close to evenly spaced, so a single
+        interpolation probe usually lands on the right interval; a
+        neighbouring interval is checked next, then bisect as a fallback.
+        Only valid for targets strictly inside the curve's power range.
+        """
+        powers = self._powers
+        last = len(powers) - 1
+        guess = int((target_power_watts - self._power_min) * last / self._power_span) + 1
+        i = max(1, min(guess, last))
+        if powers[i - 1] < target_power_watts <= powers[i]:
+            return i
+        if i > 1 and powers[i - 2] < target_power_watts <= powers[i - 1]:
+            return i - 1
+        if i < last and powers[i] < target_power_watts <= powers[i + 1]:
+            return i + 1
+        return bisect_left(powers, target_power_watts)
     
     def frequency_to_power(self, frequency_mhz: int) -> int:
         """
@@ -140,50 +438,60 @@ class VnishPowerService:
         Returns:
             Estimated power in watts
         """
-        # Find the two points to interpolate between
-        for i in range(len(self.power_curve) - 1):
-            p1 = self.power_curve[i]
-            p2 = self.power_curve[i + 1]
-            
-            if p1.frequency_mhz <= frequency_mhz <= p2.frequency_mhz:
-                # Linear interpolation
-                ratio = (frequency_mhz - p1.frequency_mhz) / (p2.frequency_mhz - p1.frequency_mhz)
-                power = int(p1.power_watts + ratio * (p2.power_watts - p1.power_watts))
-                return power
+        power = self._f2p_memo.get(frequency_mhz)
+        if power is None:
+            power = _memo_put(self._f2p_memo, frequency_mhz, self._frequency_to_power(frequency_mhz))
+        return power
+    
+    def _frequency_to_power(self, frequency_mhz: int) -> int:
+        """Uncached frequency_to_power."""
+        freqs, powers = self._freqs, self._powers
         
         # Outside range - extrapolate from nearest point
-        if frequency_mhz < self.power_curve[0].frequency_mhz:
+        if frequency_mhz < freqs[0]:
             # Below minimum - linear extrapolation
-            p = self.power_curve[0]
-            ratio = frequency_mhz / p.frequency_mhz
-            return int(p.power_watts * ratio)
-        else:
+            return int(powers[0] * (frequency_mhz / freqs[0]))
+        if frequency_mhz > freqs[-1]:
             # Above maximum
-            p = self.power_curve[-1]
-            ratio = frequency_mhz / p.frequency_mhz
-            return int(p.power_watts * ratio)
+            return int(powers[-1] * (frequency_mhz / freqs[-1]))
+        
+        # Linear interpolation between the bracketing points
+        i, ratio = self._bracket_by_frequency(frequency_mhz)
+        return int(powers[i - 1] + ratio * (powers[i] - powers[i - 1]))
     
     def _snap_to_valid_frequency(self, freq: int) -> int:
         """Snap a frequency to the nearest valid value."""
-        # Find closest valid frequency
-        closest = min(VALID_FREQUENCIES, key=lambda x: abs(x - freq))
+        # Find closest valid frequency (the lower one on a tie)
+        i = bisect_left(VALID_FREQUENCIES, freq)
+        if i == 0:
+            closest = VALID_FREQUENCIES[0]
+        elif i == len(VALID_FREQUENCIES):
+            closest = VALID_FREQUENCIES[-1]
+        else:
+            below, above = VALID_FREQUENCIES[i - 1], VALID_FREQUENCIES[i]
+            closest = below if freq - below <= above - freq else above
         
         # Apply min/max limits
         return max(self.min_frequency, min(self.max_frequency, closest))
     
     def get_voltage_for_frequency(self, frequency_mhz: int) -> float:
         """Get recommended voltage for a frequency."""
-        # Find surrounding points
-        for i in range(len(self.power_curve) - 1):
-            p1 = self.power_curve[i]
-            p2 = self.power_curve[i + 1]
-            
-            if p1.frequency_mhz <= frequency_mhz <= p2.frequency_mhz:
-                ratio = (frequency_mhz - p1.frequency_mhz) / (p2.frequency_mhz - p1.frequency_mhz)
-                return round(p1.voltage + ratio * (p2.voltage - p1.voltage), 1)
-        
-        # Default voltage
-        return 8.9
+        voltage = self._voltage_memo.get(frequency_mhz)
+        if voltage is None:
+            voltage = _memo_put(
+                self._voltage_memo, frequency_mhz, self._voltage_for_frequency(frequency_mhz)
+            )
+        return voltage
+    
+    def _voltage_for_frequency(self, frequency_mhz: int) -> float:
+        """Uncached get_voltage_for_frequency."""
+        freqs, voltages = self._freqs, self._voltages
+        if not freqs[0] <= frequency_mhz <= freqs[-1]:
+            # Default voltage
+            return 8.9
+        
+        i, ratio = self._bracket_by_frequency(frequency_mhz)
+        return round(voltages[i - 1] + ratio * (voltages[i] - voltages[i - 1]), 1)
     
     def calculate_swing_miner_frequency(
         self,
@@ -204,15 +512,15 @@ class VnishPowerService:
             Tuple of (frequency_mhz, voltage, estimated_power_watts)
         """
         # If remaining power is very small, use minimum frequency
-        if remaining_power_watts < self.power_curve[0].power_watts * 0.5:
-            point = self.power_curve[0]
-            return self.min_frequency, point.voltage, self.frequency_to_power(self.min_frequency)
+        if remaining_power_watts < self._min_power_threshold:
+            return self.min_frequency, self._voltages[0], self._min_useful_power
         
         # If remaining power is close to full, use full power
         if remaining_power_watts >= miner_full_power_watts * 0.95:
             return self.default_frequency, 8.9, miner_full_power_watts
         
-        # Calculate optimal frequency
+        # Calculate optimal frequency.  freq has been snapped to a valid
+        # step, so its power is looked up rather than taken from the target.
         freq, voltage = self.power_to_frequency(remaining_power_watts)
         estimated_power = self.frequency_to_power(freq)
         
@@ -226,6 +534,45 @@ class VnishPowerService:
         
         return freq, voltage, estimated_power
     
+    def _get_session(self, host: str, username: str, password: str) -> requests.Session:
+        """Cached keep-alive requests.Session for a miner, with digest auth."""
+        session = self._sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+            self._sessions[host] = session
+        auth = session.auth
+        if not isinstance(auth, HTTPDigestAuth) or (auth.username, auth.password) != (username, password):
+            session.auth = HTTPDigestAuth(username, password)
+        return session
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Shared httpx client for async reads, created on first use."""
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = httpx.AsyncClient(timeout=10.0)
+        return self._async_client
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Thread pool for config writes, created on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_config_workers,
+                thread_name_prefix="vnish"
+            )
+        return self._executor
+    
+    async def close(self):
+        """Close pooled HTTP connections and the config-write thread pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            session.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+    
     async def set_miner_frequency(
         self,
         host: str,
@@ -264,121 +611,21 @@ class VnishPowerService:
             voltage=voltage
         )
         
-        def _set_config_sync():
-            """Synchronous config update using requests with retry."""
-            import time
-            auth = HTTPDigestAuth(username, password)
-            base_url = f"http://{host}"
-            
-            # Retry logic for connection issues (miner might be restarting)
-            max_retries = 3
-            retry_delay = 10  # seconds
-            
-            for attempt in range(max_retries):
-                try:
-                    # Step 1: Get current config to preserve pool settings
-                    resp = requests.get(
-                        f"{base_url}/cgi-bin/get_miner_conf.cgi",
-                        auth=auth,
-                        timeout=30
-                    )
-                    if resp.status_code == 200:
-                        break  # Success, continue
-                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
-                    if attempt < max_retries - 1:
-                        time.sleep(retry_delay)
-                        continue
-                    return False, f"Connection failed after {max_retries} attempts: {e}"
-            
-            if resp.status_code != 200:
-                return False, f"Failed to get config: HTTP {resp.status_code}"
-            
-            current_config = resp.json()
-            pools = current_config.get("pools", [])
-            
-            pool1 = pools[0] if len(pools) > 0 else {}
-            pool2 = pools[1] if len(pools) > 1 else {}
-            pool3 = pools[2] if len(pools) > 2 else {}
-            
-            # Step 2: Build form data in exact order vnish expects
-            form_data = [
-                ("_ant_pool1url", pool1.get("url", "")),
-                ("_ant_pool1user", pool1.get("user", "")),
-                ("_ant_pool1pw", pool1.get("pass", "")),
-                ("_ant_pool2url", pool2.get("url", "")),
-                ("_ant_pool2user", pool2.get("user", "")),
-                ("_ant_pool2pw", pool2.get("pass", "")),
-                ("_ant_pool3url", pool3.get("url", "")),
-                ("_ant_pool3user", pool3.get("user", "")),
-                ("_ant_pool3pw", pool3.get("pass", "")),
-                ("_ant_nobeeper", "false"),
-                ("_ant_notempoverctrl", "false"),
-                ("_ant_fan_customize_switch", "false"),
-                ("_ant_fan_customize_value", "100"),
-                ("_ant_freq", str(frequency_mhz)),
-                ("_ant_freq1", "0"),
-                ("_ant_freq2", "0"),
-                ("_ant_freq3", "0"),
-                ("_ant_voltage", str(voltage_int)),
-                ("_ant_voltage1", "0"),
-                ("_ant_voltage2", "0"),
-                ("_ant_voltage3", "0"),
-                ("_ant_fan_rpm_off", "0"),
-                ("_ant_chip_freq", ""),
-                ("_ant_autodownscale", "false"),
-                ("_ant_autodownscale_watch", "false"),
-                ("_ant_autodownscale_watchtimer", "false"),
-                ("_ant_autodownscale_timer", "1"),
-                ("_ant_autodownscale_after", "120"),
-                ("_ant_autodownscale_step", "2"),
-                ("_ant_autodownscale_min", "650"),
-                ("_ant_autodownscale_prec", "75"),
-                ("_ant_autodownscale_profile", "0"),
-                ("_ant_minhr", "0"),
-                ("_ant_asicboost", "false"),
-                ("_ant_tempoff", "0"),
-                ("_ant_altdf", "true"),
-                ("_ant_presave", "1"),
-                ("_ant_name", "0"),
-                ("_ant_warn", ""),
-                ("_ant_maxx", ""),
-                ("_ant_trigger_reboot", ""),
-                ("_ant_target_temp", "0"),
-                ("_ant_silentstart", "false"),
-                ("_ant_altdfno", "0"),
-                ("_ant_autodownscale_reboot", "false"),
-                ("_ant_hotel_fee", "false"),
-                ("_ant_lpm_mode", "false"),
-                ("_ant_dchain5", "false"),
-                ("_ant_dchain6", "false"),
-                ("_ant_dchain7", "false"),
-            ]
-            
-            # Step 3: Post config
-            resp = requests.post(
-                f"{base_url}/cgi-bin/set_miner_conf_custom.cgi",
-                auth=auth,
-                data=form_data,
-                timeout=30
-            )
-            if resp.status_code != 200:
-                return False, f"Failed to set config: HTTP {resp.status_code}"
-            
-            # Step 4: Restart CGMiner - use very short timeout, it never responds
-            try:
-                requests.get(
-                    f"{base_url}/cgi-bin/reboot_cgminer.cgi",
-                    auth=auth,
-                    timeout=2
-                )
-            except (requests.Timeout, requests.exceptions.ReadTimeout, requests.exceptions.ConnectionError):
-                pass  # Expected - endpoint never responds
-            
-            return True, f"Frequency set to {frequency_mhz}MHz @ {voltage}V"
+        # Looked up on the event loop so executor threads never touch the cache
+        session = self._get_session(host, username, password)
         
         try:
-            loop = asyncio.get_event_loop()
-            success, message = await loop.run_in_executor(None, _set_config_sync)
+            loop = asyncio.get_running_loop()
+            success, message, fresh_pools = await loop.run_in_executor(
+                self._get_executor(), _set_config_sync,
+                session, host, frequency_mhz, voltage_int, voltage,
+                get_cached_pools(host)
+            )
+            # Our write re-posts the pools unchanged, so a list read along
+            # the way lets the next frequency change skip the config read
+            invalidate_vnish_cache(host, config_only=True, keep_pools=True)
+            if success and fresh_pools is not None:
+                cache_pools(host, fresh_pools)
             
             if success:
                 self._miner_frequencies[host] = frequency_mhz
@@ -395,6 +642,32 @@ class VnishPowerService:
             logger.error("Failed to set frequency", host=host, error=str(e))
             return False, str(e)
     
+    async def set_fleet_frequencies(
+        self,
+        targets: List[Tuple[str, int, Optional[float]]]
+    ) -> List[Tuple[bool, str]]:
+        """
+        Set the frequency of many miners concurrently.
+        
+        Each miner goes through set_miner_frequency; the blocking writes
+        share the service's thread pool, so up to _max_config_workers
+        miners are reconfigured at once.
+        
+        Args:
+            targets: (host, frequency_mhz, voltage or None) per miner
+            
+        Returns:
+            (success, message) per target, in the same order
+        """
+        results = await asyncio.gather(
+            *(self.set_miner_frequency(host, freq, voltage) for host, freq, voltage in targets),
+            return_exceptions=True
+        )
+        return [
+            (False, str(r)) if isinstance(r, BaseException) else r
+            for r in results
+        ]
+    
     async def get_miner_frequency(
         self,
         host: str,
@@ -415,18 +688,17 @@ class VnishPowerService:
         try:
             auth = httpx.DigestAuth(username, password)
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"http://{host}/cgi-bin/get_miner_conf.cgi",
-                    auth=auth
-                )
-                
-                if response.status_code == 200:
-                    config = response.json()
-                    freq_str = config.get("bitmain-freq", "")
-                    if freq_str:
-                        return int(freq_str)
-                        
+            response = await self._get_async_client().get(
+                f"http://{host}/cgi-bin/get_miner_conf.cgi",
+                auth=auth
+            )
+            
+            if response.status_code == 200:
+                config = _json_loads(response.content)
+                freq_str = config.get("bitmain-freq", "")
+                if freq_str:
+                    return int(freq_str)
+                    
         except Exception as e:
             logger.debug("Failed to get miner frequency", host=host, error=str(e))
         
@@ -436,7 +708,8 @@ class VnishPowerService:
         self,
         target_power_kw: float,
         miners: List[Dict[str, Any]],
-        full_power_watts: int = 1460
+        full_power_watts: int = 1460,
+        presorted: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Calculate power allocation for a fleet of miners.
@@ -450,6 +723,7 @@ class VnishPowerService:
             target_power_kw: Total target power in kW
             miners: List of miner info dicts with 'ip', 'is_mining', 'is_online'
             full_power_watts: Power consumption of one miner at full frequency
+            presorted: miners are already in IP order (skips the sort)
             
         Returns:
             List of allocation dicts: {
@@ -469,68 +743,62 @@ class VnishPowerService:
             return []
         
         # Minimum useful power for a swing miner (below this, just idle)
-        min_useful_power = self.frequency_to_power(self.min_frequency)  # ~565W at 300MHz
-        
-        # Calculate allocation
-        allocation = []
-        remaining_power = target_power_watts
+        min_useful_power = self._min_useful_power  # ~565W at 300MHz
         
         # Sort miners by IP for consistent ordering
-        sorted_miners = sorted(online_miners, key=lambda m: m.get('ip', ''))
-        
-        for i, miner in enumerate(sorted_miners):
-            ip = miner.get('ip', '')
-            
-            if remaining_power <= 0:
-                # No more power needed - idle this miner
-                allocation.append({
-                    'ip': ip,
-                    'action': 'idle',
-                    'frequency': 0,
-                    'voltage': 0,
-                    'estimated_power': 0
-                })
-                
-            elif remaining_power >= full_power_watts:
-                # Full power miner
-                allocation.append({
-                    'ip': ip,
-                    'action': 'full',
-                    'frequency': self.default_frequency,
-                    'voltage': 8.9,
-                    'estimated_power': full_power_watts
-                })
-                remaining_power -= full_power_watts
-                
-            elif remaining_power >= min_useful_power:
-                # Swing miner - runs at partial power (only if remaining is useful)
-                freq, voltage, est_power = self.calculate_swing_miner_frequency(
-                    remaining_power,
-                    full_power_watts
-                )
-                allocation.append({
-                    'ip': ip,
-                    'action': 'swing',
-                    'frequency': freq,
-                    'voltage': voltage,
-                    'estimated_power': est_power
-                })
-                remaining_power = 0
-            else:
-                # Remaining power too small to be useful - idle this miner
-                allocation.append({
-                    'ip': ip,
-                    'action': 'idle',
-                    'frequency': 0,
-                    'voltage': 0,
-                    'estimated_power': 0
-                })
+        if presorted:
+            sorted_miners = online_miners
+        else:
+            sorted_miners = sorted(online_miners, key=lambda m: m.get('ip', ''))
+        
+        # Every full miner draws the same power, so the split is closed-form:
+        # as many full miners as fit, one swing miner for a useful remainder,
+        # and the rest idle
+        full_count = min(len(sorted_miners), max(0, target_power_watts // full_power_watts))
+        remaining_power = target_power_watts - full_count * full_power_watts
+        swing_count = int(full_count < len(sorted_miners) and remaining_power >= min_useful_power)
+        
+        allocation = [
+            {
+                'ip': miner.get('ip', ''),
+                'action': 'full',
+                'frequency': self.default_frequency,
+                'voltage': 8.9,
+                'estimated_power': full_power_watts
+            }
+            for miner in sorted_miners[:full_count]
+        ]
+        total_estimated = full_count * full_power_watts
+        
+        if swing_count:
+            # Swing miner - runs at partial power (only if remaining is useful)
+            freq, voltage, est_power = self.calculate_swing_miner_frequency(
+                remaining_power,
+                full_power_watts
+            )
+            allocation.append({
+                'ip': sorted_miners[full_count].get('ip', ''),
+                'action': 'swing',
+                'frequency': freq,
+                'voltage': voltage,
+                'estimated_power': est_power
+            })
+            total_estimated += est_power
+        
+        # No power left, or too little to be useful - idle the rest
+        allocation.extend(
+            {
+                'ip': miner.get('ip', ''),
+                'action': 'idle',
+                'frequency': 0,
+                'voltage': 0,
+                'estimated_power': 0
+            }
+            for miner in sorted_miners[full_count + swing_count:]
+        )
         
         # Log allocation summary
-        full_count = sum(1 for a in allocation if a['action'] == 'full')
-        swing_count = sum(1 for a in allocation if a['action'] == 'swing')
-        idle_count = sum(1 for a in allocation if a['action'] == 'idle')
-        total_estimated = sum(a['estimated_power'] for a in allocation)
+        idle_count = len(allocation) - full_count - swing_count
         
         logger.info(
             "Power allocation calculated",
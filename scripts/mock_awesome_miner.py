@@ -7,9 +7,11 @@ when you don't have access to real mining hardware.
 Run with: python scripts/mock_awesome_miner.py
 """
 import asyncio
+import itertools
 import random
+import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
@@ -18,8 +20,31 @@ import uvicorn
 
 app = FastAPI(title="Mock AwesomeMiner API")
 
+# Noise samples drawn once at startup and cycled, so /api/miners does not
+# call the RNG per miner per request
+_NOISE_SIZE = 8192  # power of two, indexed with a mask
+_NOISE_POWER = [random.uniform(-50, 50) for _ in range(_NOISE_SIZE)]
+_NOISE_HASH = [f"{random.uniform(80, 120):.1f} MH/s" for _ in range(_NOISE_SIZE)]
+_noise_idx = itertools.count()
+
+# "Running since" timestamp, re-rendered at most once per second
+_now_iso_second = -1
+_now_iso_text = ""
+
+
+def _now_iso() -> str:
+    """Current time as ISO text, cached for the current second."""
+    global _now_iso_second, _now_iso_text
+    second = int(time.time())
+    if second != _now_iso_second:
+        _now_iso_second = second
+        _now_iso_text = datetime.now().isoformat()
+    return _now_iso_text
+
 # Simulated miner data
 class MockMiner:
+    __slots__ = ("id", "name", "rated_power", "status", "power_usage", "enabled", "_hostname", "_idle")
+    
     def __init__(self, miner_id: int, name: str, rated_power: float):
         self.id = miner_id
         self.name = name
@@ -27,6 +52,19 @@ class MockMiner:
         self.status = "Stopped"
         self.power_usage = 0.0
         self.enabled = True
+        self._hostname = f"miner-{miner_id}.local"
+        # Stopped miners always report the same thing
+        self._idle = {
+            "id": miner_id,
+            "name": name,
+            "hostname": self._hostname,
+            "status": "Stopped",
+            "statusInfo": "Idle",
+            "powerUsage": 0,
+            "speedInfo": "0 MH/s",
+            "pool": "",
+            "coin": ""
+        }
     
     def start(self):
         if self.enabled:
@@ -38,16 +76,19 @@ class MockMiner:
         self.power_usage = 0.0
     
     def to_dict(self) -> dict:
+        if self.status != "Mining":
+            return dict(self._idle)
+        i = next(_noise_idx) & (_NOISE_SIZE - 1)
         return {
             "id": self.id,
             "name": self.name,
-            "hostname": f"miner-{self.id}.local",
+            "hostname": self._hostname,
             "status": self.status,
-            "statusInfo": f"Running since {datetime.now().isoformat()}" if self.status == "Mining" else "Idle",
-            "powerUsage": self.power_usage + random.uniform(-50, 50) if self.status == "Mining" else 0,
-            "speedInfo": f"{random.uniform(80, 120):.1f} MH/s" if self.status == "Mining" else "0 MH/s",
-            "pool": "stratum+tcp://pool.example.com:3333" if self.status == "Mining" else "",
-            "coin": "ETH" if self.status == "Mining" else ""
+            "statusInfo": f"Running since {_now_iso()}",
+            "powerUsage": self.power_usage + _NOISE_POWER[i],
+            "speedInfo": _NOISE_HASH[i],
+            "pool": "stratum+tcp://pool.example.com:3333",
+            "coin": "ETH"
         }
 
 
@@ -61,10 +102,27 @@ MOCK_MINERS: Dict[int, MockMiner] = {
 }
 
 
+# Short-lived /api/miners response so load-test bursts don't rebuild it;
+# every state-changing endpoint drops it
+_miners_cache: Optional[Tuple[float, List[dict]]] = None
+_MINERS_CACHE_TTL = 0.1  # seconds
+
+
+def _invalidate_miners_cache():
+    global _miners_cache
+    _miners_cache = None
+
+
 @app.get("/api/miners")
 async def get_miners():
     """Get all miners."""
-    return [miner.to_dict() for miner in MOCK_MINERS.values()]
+    global _miners_cache
+    now = time.monotonic()
+    if _miners_cache is not None and now - _miners_cache[0] < _MINERS_CACHE_TTL:
+        return _miners_cache[1]
+    data = [miner.to_dict() for miner in MOCK_MINERS.values()]
+    _miners_cache = (now, data)
+    return data
 
 
 @app.get("/api/miners/{miner_id}")
@@ -83,6 +141,7 @@ async def start_miner(miner_id: int):
     
     miner = MOCK_MINERS[miner_id]
     miner.start()
+    _invalidate_miners_cache()
     print(f"[MOCK] Started miner {miner_id} ({miner.name})")
     return {"success": True, "message": f"Miner {miner_id} started"}
 
@@ -95,6 +154,7 @@ async def stop_miner(miner_id: int):
     
     miner = MOCK_MINERS[miner_id]
     miner.stop()
+    _invalidate_miners_cache()
     print(f"[MOCK] Stopped miner {miner_id} ({miner.name})")
     return {"success": True, "message": f"Miner {miner_id} stopped"}
 
@@ -107,8 +167,10 @@ async def restart_miner(miner_id: int):
     
     miner = MOCK_MINERS[miner_id]
     miner.stop()
+    _invalidate_miners_cache()
     await asyncio.sleep(0.5)
     miner.start()
+    _invalidate_miners_cache()
     print(f"[MOCK] Restarted miner {miner_id} ({miner.name})")
     return {"success": True, "message": f"Miner {miner_id} restarted"}
 
@@ -120,6 +182,7 @@ async def enable_miner(miner_id: int):
         raise HTTPException(status_code=404, detail="Miner not found")
     
     MOCK_MINERS[miner_id].enabled = True
+    _invalidate_miners_cache()
     print(f"[MOCK] Enabled miner {miner_id}")
     return {"success": True}
 
@@ -133,6 +196,7 @@ async def disable_miner(miner_id: int):
     miner = MOCK_MINERS[miner_id]
     miner.enabled = False
     miner.stop()
+    _invalidate_miners_cache()
     print(f"[MOCK] Disabled miner {miner_id}")
     return {"success": True}
 
@@ -10,14 +10,23 @@ Usage:
     python3 scripts/monitor_logs.py
 """
 
+import asyncio
+import re
+import socket
 import threading
 import time
-import requests
-from requests.auth import HTTPDigestAuth
+from collections import deque
+import httpx
 from datetime import datetime
 import sys
 import os
 
+try:
+    # Ships with uvicorn[standard]; blocks on inotify instead of polling
+    import watchfiles
+except ImportError:
+    watchfiles = None
+
 # Miner config
 MINERS = [
     {"ip": "192.168.1.56", "name": "M56"},
@@ -26,6 +35,15 @@ MINERS = [
 USERNAME = "root"
 PASSWORD = "root"
 
+# Keepalive probes notice a miner that vanished while its connection sat
+# idle. No TCP_NODELAY here: asyncio already sets it on every TCP socket.
+SOCKET_OPTIONS = [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+# One digest auth per miner so each keeps reusing its own miner's nonce
+AUTHS = {m["ip"]: httpx.DigestAuth(USERNAME, PASSWORD) for m in MINERS}
+
 # Colors for terminal output
 class Colors:
     HEADER = '\033[95m'
@@ -40,6 +58,9 @@ class Colors:
 # Lock for thread-safe printing
 print_lock = threading.Lock()
 
+# Set on shutdown so the app log tailer can leave its file watch
+stop_tailing = threading.Event()
+
 def timestamp():
     return datetime.now().strftime("%H:%M:%S.%f")[:-3]
 
@@ -56,33 +77,69 @@ def print_miner(name, msg, color=Colors.CYAN):
     """Print miner log line"""
     safe_print(f"{color}[{timestamp()}] {name}: {msg}{Colors.ENDC}")
 
+# Skip these noisy patterns
+SKIP_PATTERNS = [
+    "Asic[", "get RT hashrate", "Check Chain", "ASIC RT error",
+    "asic index", "Done check", "do read temp", "Done read temp",
+    "CRC error counter"
+]
+
+# Always show these keywords
+KEYWORDS = [
+    "freq", "voltage", "start", "stop", "config", "pool",
+    "restart", "error", "fail", "reboot", "init", "cgminer",
+    "chain[", "pwm", "fan", "temp"
+]
+
+# Each list as one case-insensitive alternation, matched in a single pass
+_SKIP_RE = re.compile("|".join(map(re.escape, SKIP_PATTERNS)), re.IGNORECASE)
+_KEYWORD_RE = re.compile("|".join(map(re.escape, KEYWORDS)), re.IGNORECASE)
+
 def should_show_line(line):
     """Filter which miner log lines to show"""
-    # Skip these noisy patterns
-    skip_patterns = [
-        "Asic[", "get RT hashrate", "Check Chain", "ASIC RT error",
-        "asic index", "Done check", "do read temp", "Done read temp",
-        "CRC error counter"
-    ]
-    
-    line_lower = line.lower()
-    
-    for pattern in skip_patterns:
-        if pattern.lower() in line_lower:
-            return False
-    
-    # Always show these keywords
-    keywords = [
-        "freq", "voltage", "start", "stop", "config", "pool",
-        "restart", "error", "fail", "reboot", "init", "cgminer",
-        "chain[", "pwm", "fan", "temp"
-    ]
+    if _SKIP_RE.search(line):
+        return False
+    return _KEYWORD_RE.search(line) is not None
+
+def file_changes(path, poll_interval=0.5):
+    """
+    Yield whenever the file at path may have changed.
     
-    for kw in keywords:
-        if kw.lower() in line_lower:
-            return True
+    Waits on filesystem events (watchfiles) when available, watching the
+    directory so a rotated or recreated file is still seen; otherwise
+    compares os.stat results every poll_interval seconds.
+    """
+    path = os.path.abspath(path)
+    if watchfiles is not None:
+        for _ in watchfiles.watch(
+            os.path.dirname(path),
+            watch_filter=lambda _change, changed: changed == path,
+            debounce=200,
+            stop_event=stop_tailing,
+            recursive=False,
+        ):
+            yield
+        return
     
-    return False
+    last = None
+    while not stop_tailing.is_set():
+        try:
+            st = os.stat(path)
+            current = (st.st_ino, st.st_size, st.st_mtime_ns)
+        except FileNotFoundError:
+            current = None
+        if current != last:
+            last = current
+            yield
+        stop_tailing.wait(poll_interval)
+
+def print_new_app_lines(f):
+    """Print everything appended to the log since the last read"""
+    for line in iter(f.readline, ''):
+        line = line.strip()
+        # Skip HTTP request logs
+        if line and not line.startswith("INFO:") and "HTTP/1.1" not in line:
+            print_app(line)
 
 def tail_app_logs():
     """Tail the application log file"""
@@ -94,45 +151,111 @@ def tail_app_logs():
             time.sleep(1)
     
     # Start from end of file
-    with open(log_file, 'r') as f:
-        f.seek(0, 2)  # Go to end
-        while True:
-            line = f.readline()
-            if line:
-                line = line.strip()
-                # Skip HTTP request logs
-                if line and not line.startswith("INFO:") and "HTTP/1.1" not in line:
-                    print_app(line)
-            else:
-                time.sleep(0.1)
+    f = open(log_file, 'r')
+    f.seek(0, 2)  # Go to end
+    inode = os.fstat(f.fileno()).st_ino
+    try:
+        for _ in file_changes(log_file):
+            print_new_app_lines(f)
+            try:
+                st = os.stat(log_file)
+            except FileNotFoundError:
+                continue  # Rotated away; wait for the new file
+            if st.st_ino != inode or st.st_size < f.tell():
+                # Replaced or truncated - start over on the current file
+                f.close()
+                f = open(log_file, 'r')
+                inode = os.fstat(f.fileno()).st_ino
+                print_new_app_lines(f)
+    finally:
+        f.close()
+
+# How many recent kernel-log lines are remembered per miner
+SEEN_WINDOW = 100
+
+class SeenLines:
+    """Hashes of the last SEEN_WINDOW distinct lines of one miner's log"""
+    __slots__ = ("_order", "_hashes")
+    
+    def __init__(self):
+        self._order = deque()
+        self._hashes = set()
+    
+    def add(self, line):
+        """Remember a line; returns True if it was not already remembered"""
+        h = hash(line)
+        if h in self._hashes:
+            return False
+        if len(self._order) == SEEN_WINDOW:
+            self._hashes.discard(self._order.popleft())
+        self._order.append(h)
+        self._hashes.add(h)
+        return True
 
-def fetch_miner_log(miner, last_lines):
-    """Fetch and diff miner kernel log"""
+def log_tail_mark(data, base=0):
+    """
+    (offset past the last newline, last complete line) for log bytes that
+    start at byte `base` of the file, or None if there is no complete line.
+    """
+    end = data.rfind(b'\n') + 1
+    if not end:
+        return None
+    start = data.rfind(b'\n', 0, end - 1) + 1
+    return base + end, data[start:end]
+
+async def fetch_miner_log(client, miner, seen_lines, log_tails):
+    """Fetch and diff miner kernel log, only the new bytes when Range works"""
     ip = miner["ip"]
     name = miner["name"]
     url = f"http://{ip}/cgi-bin/get_kernel_log.cgi"
     color = Colors.CYAN if name == "M56" else Colors.YELLOW
     
     try:
-        resp = requests.get(url, auth=HTTPDigestAuth(USERNAME, PASSWORD), timeout=5)
+        tail = log_tails.get(ip)
+        if tail is not None:
+            # Ask from the start of the last line we have: if that line isn't
+            # there any more the (ring-buffer) log moved, so re-read it whole
+            offset, anchor = tail
+            base = offset - len(anchor)
+            resp = await client.get(url, auth=AUTHS[ip], timeout=5,
+                                    headers={"Range": f"bytes={base}-"})
+            if resp.status_code == 206 and resp.content.startswith(anchor):
+                body = resp.content
+                mark = log_tail_mark(body, base)
+                log_tails[ip] = mark
+                seen = seen_lines[ip]
+                lines = body[len(anchor):mark[0] - base].decode('utf-8', 'replace').split('\n')
+                for line in lines:
+                    line = line.strip()
+                    if line and seen.add(line) and should_show_line(line):
+                        print_miner(name, line, color)
+                return
+            if resp.status_code != 200:
+                # Shrunk, rotated or Range refused: fall back to a full read
+                del log_tails[ip]
+                resp = await client.get(url, auth=AUTHS[ip], timeout=5)
+        else:
+            resp = await client.get(url, auth=AUTHS[ip], timeout=5)
+        
         if resp.status_code == 200:
             text = resp.text
             lines = text.strip().split('\n')
+            mark = log_tail_mark(resp.content)
+            if mark is not None:
+                log_tails[ip] = mark
             
-            # Find new lines
-            new_lines = []
-            if last_lines.get(ip):
-                # Find where old log ends by looking at last 100 lines
-                old_set = set(last_lines[ip][-100:])
-                for line in lines:
-                    if line not in old_set:
-                        new_lines.append(line)
+            # Find new lines - only the tail can hold lines we haven't seen
+            tail = lines[-SEEN_WINDOW:]
+            seen = seen_lines.get(ip)
+            if seen is not None:
+                new_lines = [line for line in tail if seen.add(line)]
             else:
+                seen = seen_lines[ip] = SeenLines()
+                for line in tail:
+                    seen.add(line)
                 # First fetch - show last 5 interesting lines
                 interesting = [l for l in lines if should_show_line(l)]
-                new_lines = interesting[-5:] if len(interesting) > 5 else interesting
-            
-            last_lines[ip] = lines
+                new_lines = interesting[-5:]
             
             # Print interesting new lines
             for line in new_lines:
@@ -140,21 +263,34 @@ def fetch_miner_log(miner, last_lines):
                 if line and should_show_line(line):
                     print_miner(name, line, color)
                     
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         print_miner(name, "TIMEOUT - not responding", Colors.RED)
-    except requests.exceptions.ConnectionError:
+    except httpx.TransportError:
         print_miner(name, "CONNECTION ERROR - offline?", Colors.RED)
     except Exception as e:
         print_miner(name, f"ERROR: {type(e).__name__}: {e}", Colors.RED)
 
-def poll_miners(interval=3):
-    """Poll miner logs periodically"""
-    last_lines = {}
+async def poll_miners(interval=3):
+    """Poll miner logs periodically, all miners at once"""
+    seen_lines = {}
+    log_tails = {}
+    limits = httpx.Limits(max_connections=2 * len(MINERS), keepalive_expiry=60)
     
-    while True:
-        for miner in MINERS:
-            fetch_miner_log(miner, last_lines)
-        time.sleep(interval)
+    loop = asyncio.get_running_loop()
+    
+    transport = httpx.AsyncHTTPTransport(limits=limits, socket_options=SOCKET_OPTIONS)
+    
+    async with httpx.AsyncClient(transport=transport) as client:
+        # Fixed cadence: sleep until the next deadline, not interval after the work
+        deadline = loop.time()
+        while True:
+            deadline += interval
+            await asyncio.gather(*(fetch_miner_log(client, m, seen_lines, log_tails) for m in MINERS))
+            now = loop.time()
+            if now > deadline:
+                # Overran a whole period; restart the cadence rather than burst
+                deadline = now
+            await asyncio.sleep(deadline - now)
 
 def main():
     safe_print(f"{Colors.BOLD}=== Miner & App Log Monitor ==={Colors.ENDC}")
@@ -168,8 +304,12 @@ def main():
     app_thread = threading.Thread(target=tail_app_logs, daemon=True)
     app_thread.start()
     
-    # Poll miners in main thread
-    poll_miners(interval=2)
+    # Poll miners on the event loop in the main thread
+    try:
+        asyncio.run(poll_miners(interval=2))
+    finally:
+        stop_tailing.set()
+        app_thread.join(timeout=1)
 
 if __name__ == "__main__":
     try:
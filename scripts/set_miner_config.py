@@ -1,14 +1,35 @@
 #!/usr/bin/env python3
 """
 Set miner config from template.
-Usage: python3 set_miner_config.py <miner_ip> [--freq 500] [--voltage 860]
+Usage: python3 set_miner_config.py <miner_ip> [<miner_ip> ...] [--freq 500] [--voltage 860]
 """
+import asyncio
+import socket
 import sys
 import json
+from functools import lru_cache
+from urllib.parse import urlencode
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPDigestAuth
+from urllib3.connection import HTTPConnection
 
+# Keep idle pooled connections probed. TCP_NODELAY is already on: urllib3
+# sets it by default (kept below) and asyncio sets it for httpx.
+SOCKET_OPTIONS = [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled sockets add SOCKET_OPTIONS to urllib3's defaults."""
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = HTTPConnection.default_socket_options + SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+@lru_cache(maxsize=1)
 def load_template():
+    """Parsed config template, read once. Shared - don't mutate it."""
     with open('data/vnish_config_template.json') as f:
         return json.load(f)
 
@@ -76,51 +97,163 @@ def build_form_data(config):
         ('_ant_dchain7', str(m['dchain7']).lower()),
     ]
 
-def set_config(ip, config, restart=True):
-    auth = HTTPDigestAuth('root', 'root')
+@lru_cache(maxsize=1)
+def template_form():
+    """Form for the unmodified template, plus each field's position."""
+    form = tuple(build_form_data(load_template()))
+    return form, {key: i for i, (key, _) in enumerate(form)}
+
+_FREQ_SLOT = b'___F___'
+_VOLTAGE_SLOT = b'___V___'
+FORM_HEADERS = {'Content-Type': 'application/x-www-form-urlencoded'}
+
+@lru_cache(maxsize=1)
+def template_body_slots():
+    """Url-encoded template with slots for the global frequency and voltage."""
+    form, index = template_form()
+    form = list(form)
+    form[index['_ant_freq']] = ('_ant_freq', _FREQ_SLOT.decode())
+    form[index['_ant_voltage']] = ('_ant_voltage', _VOLTAGE_SLOT.decode())
+    body = urlencode(form).encode()
+    assert body.count(_FREQ_SLOT) == 1 and body.count(_VOLTAGE_SLOT) == 1
+    return body
+
+def template_body(freq=None, voltage=None):
+    """
+    Encoded template form with the global frequency and/or voltage replaced.
+    
+    Encoding happens once per process; each call only fills in the two slots.
+    """
+    config = load_template()
+    if freq is None:
+        freq = config['frequency']['global']
+    if voltage is None:
+        voltage = config['voltage']['global']
+    return (template_body_slots()
+            .replace(_FREQ_SLOT, str(freq).encode())
+            .replace(_VOLTAGE_SLOT, str(voltage).encode()))
+
+def encode_form(body):
+    """Url-encode a config dict; an already encoded body passes through."""
+    if isinstance(body, dict):
+        return urlencode(build_form_data(body)).encode()
+    return body
+
+def make_session():
+    """Keep-alive session so the POST and the restart share one digest handshake."""
+    session = requests.Session()
+    session.mount('http://', KeepAliveAdapter())
+    session.auth = HTTPDigestAuth('root', 'root')
+    return session
+
+def set_config(ip, body, restart=True, session=None):
+    """Post a config dict, or an already url-encoded form (see template_body)."""
+    body = encode_form(body)
+    if session is None:
+        session = make_session()
     url = f'http://{ip}/cgi-bin/set_miner_conf_custom.cgi'
     
-    form_data = build_form_data(config)
-    resp = requests.post(url, auth=auth, data=form_data, timeout=30)
+    resp = session.post(url, data=body, headers=FORM_HEADERS, timeout=30)
     
     if resp.status_code != 200:
         return False, f"HTTP {resp.status_code}"
     
     if restart:
         try:
-            requests.get(f'http://{ip}/cgi-bin/reboot_cgminer.cgi', 
-                        auth=auth, timeout=2)
+            session.get(f'http://{ip}/cgi-bin/reboot_cgminer.cgi', timeout=2)
         except:
             pass  # Expected - endpoint never responds
     
     return True, resp.text
 
+async def set_config_async(client, ip, body, restart=True):
+    """Async set_config; body is a config dict or an already url-encoded form."""
+    body = encode_form(body)
+    # One digest auth per miner so the restart reuses the POST's nonce
+    auth = httpx.DigestAuth('root', 'root')
+    url = f'http://{ip}/cgi-bin/set_miner_conf_custom.cgi'
+    
+    resp = await client.post(
+        url, auth=auth, content=body, timeout=30, headers=FORM_HEADERS
+    )
+    
+    if resp.status_code != 200:
+        return False, f"HTTP {resp.status_code}"
+    
+    if restart:
+        try:
+            await client.get(f'http://{ip}/cgi-bin/reboot_cgminer.cgi', auth=auth, timeout=2)
+        except Exception:
+            pass  # Expected - endpoint never responds
+    
+    return True, resp.text
+
+async def push_fleet(ips, body, restart=True, max_concurrent=32):
+    """
+    Push the same config (dict or encoded form) to many miners at once.
+    
+    Returns (ok, message) per IP, in order.
+    """
+    body = encode_form(body)
+    limits = httpx.Limits(max_connections=max_concurrent)
+    transport = httpx.AsyncHTTPTransport(limits=limits, socket_options=SOCKET_OPTIONS)
+    async with httpx.AsyncClient(transport=transport) as client:
+        results = await asyncio.gather(
+            *(set_config_async(client, ip, body, restart) for ip in ips),
+            return_exceptions=True
+        )
+    return [
+        (False, f"{type(r).__name__}: {r}") if isinstance(r, Exception) else r
+        for r in results
+    ]
+
 def main():
+    usage = "Usage: python3 set_miner_config.py <ip> [<ip> ...] [--freq N] [--voltage N]"
     if len(sys.argv) < 2:
-        print("Usage: python3 set_miner_config.py <ip> [--freq N] [--voltage N]")
+        print(usage)
         sys.exit(1)
     
-    ip = sys.argv[1]
-    config = load_template()
-    
     # Parse args
-    i = 2
+    freq = voltage = None
+    ips = []
+    i = 1
     while i < len(sys.argv):
         if sys.argv[i] == '--freq' and i+1 < len(sys.argv):
-            config['frequency']['global'] = int(sys.argv[i+1])
+            freq = int(sys.argv[i+1])
             i += 2
         elif sys.argv[i] == '--voltage' and i+1 < len(sys.argv):
-            config['voltage']['global'] = int(sys.argv[i+1])
+            voltage = int(sys.argv[i+1])
             i += 2
+        elif not sys.argv[i].startswith('--'):
+            ips.append(sys.argv[i])
+            i += 1
         else:
             i += 1
     
-    print(f"Setting config on {ip}:")
-    print(f"  Frequency: {config['frequency']['global']} MHz")
-    print(f"  Voltage: {config['voltage']['global']} (={config['voltage']['global']/100}V)")
+    if not ips:
+        print(usage)
+        sys.exit(1)
+    
+    config = load_template()
+    if freq is None:
+        freq = config['frequency']['global']
+    if voltage is None:
+        voltage = config['voltage']['global']
+    
+    print(f"Setting config on {', '.join(ips)}:")
+    print(f"  Frequency: {freq} MHz")
+    print(f"  Voltage: {voltage} (={voltage/100}V)")
+    
+    body = template_body(freq, voltage)
+    if len(ips) == 1:
+        with make_session() as session:
+            ok, msg = set_config(ips[0], body, session=session)
+        print(f"Result: {'OK' if ok else 'FAILED'} - {msg}")
+        return
     
-    ok, msg = set_config(ip, config)
-    print(f"Result: {'OK' if ok else 'FAILED'} - {msg}")
+    results = asyncio.run(push_fleet(ips, body))
+    for ip, (ok, msg) in zip(ips, results):
+        print(f"{ip}: {'OK' if ok else 'FAILED'} - {msg}")
 
 if __name__ == '__main__':
     main()
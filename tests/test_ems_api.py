@@ -4,17 +4,28 @@ Tests for EMS API endpoints.
 These tests verify compliance with the EMS protocol specification.
 """
 import pytest
-from httpx import AsyncClient
-from unittest.mock import AsyncMock, patch
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from unittest.mock import AsyncMock, MagicMock
 
 from app.main import app
 from app.models.ems import RunningStatus
 from app.models.state import FleetState, FleetStatus
+from app.services.maestro import get_maestro
 
+pytestmark = pytest.mark.xdist_group("ems_api")
 
-@pytest.fixture
-def mock_fleet_status():
-    """Create a mock fleet status."""
+
+@pytest_asyncio.fixture(scope="module")
+async def client():
+    """One in-process client for the whole module."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture(scope="module")
+def _fleet_status_template():
+    """Build the fleet status once per module."""
     return FleetStatus(
         state=FleetState.RUNNING,
         is_available_for_dispatch=True,
@@ -28,24 +39,33 @@ def mock_fleet_status():
 
 
 @pytest.fixture
-def mock_fleet_manager(mock_fleet_status):
-    """Create a mock fleet manager."""
-    manager = AsyncMock()
-    manager.status = mock_fleet_status
-    manager.activate = AsyncMock(return_value=(True, "Fleet activated successfully."))
-    manager.deactivate = AsyncMock(return_value=(True, "Fleet deactivation command accepted."))
-    return manager
+def mock_fleet_status(_fleet_status_template):
+    """Create a mock fleet status."""
+    return _fleet_status_template.model_copy(deep=True)
+
+
+@pytest.fixture
+def mock_maestro(mock_fleet_status):
+    """Create a mock maestro and serve it to the EMS endpoints."""
+    maestro = MagicMock()
+    maestro.is_available = mock_fleet_status.is_available_for_dispatch
+    maestro.running_status = mock_fleet_status.running_status
+    maestro.rated_power_kw = mock_fleet_status.rated_power_kw
+    maestro.active_power_kw = mock_fleet_status.active_power_kw
+    maestro.activate = AsyncMock(return_value=(True, "Fleet activated successfully."))
+    maestro.deactivate = AsyncMock(return_value=(True, "Fleet deactivation command accepted."))
+    app.dependency_overrides[get_maestro] = lambda: maestro
+    yield maestro
+    app.dependency_overrides.pop(get_maestro, None)
 
 
 class TestEMSStatusEndpoint:
     """Tests for GET /api/status endpoint."""
     
     @pytest.mark.asyncio
-    async def test_status_returns_correct_format(self, mock_fleet_manager):
+    async def test_status_returns_correct_format(self, client, mock_maestro):
         """Verify status response matches EMS spec."""
-        with patch('app.api.ems.get_fleet_manager', return_value=mock_fleet_manager):
-            async with AsyncClient(app=app, base_url="http://test") as client:
-                response = await client.get("/api/status")
+        response = await client.get("/api/status")
         
         assert response.status_code == 200
         data = response.json()
@@ -63,11 +83,9 @@ class TestEMSStatusEndpoint:
         assert isinstance(data["activePowerInKw"], (int, float))
     
     @pytest.mark.asyncio
-    async def test_status_running_status_values(self, mock_fleet_manager):
+    async def test_status_running_status_values(self, client, mock_maestro):
         """Verify runningStatus uses correct enum values."""
-        with patch('app.api.ems.get_fleet_manager', return_value=mock_fleet_manager):
-            async with AsyncClient(app=app, base_url="http://test") as client:
-                response = await client.get("/api/status")
+        response = await client.get("/api/status")
         
         data = response.json()
         assert data["runningStatus"] in [1, 2]  # 1=StandBy, 2=Running
@@ -77,14 +95,12 @@ class TestEMSActivateEndpoint:
     """Tests for POST /api/activate endpoint."""
     
     @pytest.mark.asyncio
-    async def test_activate_success(self, mock_fleet_manager):
+    async def test_activate_success(self, client, mock_maestro):
         """Verify successful activation."""
-        with patch('app.api.ems.get_fleet_manager', return_value=mock_fleet_manager):
-            async with AsyncClient(app=app, base_url="http://test") as client:
-                response = await client.post(
-                    "/api/activate",
-                    json={"activationPowerInKw": 100.0}
-                )
+        response = await client.post(
+            "/api/activate",
+            json={"activationPowerInKw": 100.0}
+        )
         
         assert response.status_code == 200
         data = response.json()
@@ -92,34 +108,32 @@ class TestEMSActivateEndpoint:
         assert "message" in data
     
     @pytest.mark.asyncio
-    async def test_activate_exceeds_rated_power(self, mock_fleet_manager):
+    async def test_activate_exceeds_rated_power(self, client, mock_maestro):
         """Verify 400 error when power exceeds rated."""
-        mock_fleet_manager.activate = AsyncMock(
+        mock_maestro.activate = AsyncMock(
             return_value=(False, "Requested power exceeds rated limits.")
         )
         
-        with patch('app.api.ems.get_fleet_manager', return_value=mock_fleet_manager):
-            async with AsyncClient(app=app, base_url="http://test") as client:
-                response = await client.post(
-                    "/api/activate",
-                    json={"activationPowerInKw": 1000.0}
-                )
+        response = await client.post(
+            "/api/activate",
+            json={"activationPowerInKw": 1000.0}
+        )
         
         assert response.status_code == 400
         data = response.json()
         assert data["accepted"] is False
     
     @pytest.mark.asyncio
-    async def test_activate_with_override_active(self, mock_fleet_manager):
-        """Verify 409 error when manual override is active."""
-        mock_fleet_manager.status.manual_override_active = True
+    async def test_activate_during_power_loss(self, client, mock_maestro):
+        """Verify 409 error when the fleet refuses to activate on power loss."""
+        mock_maestro.activate = AsyncMock(
+            return_value=(False, "Power loss detected (sustained voltage=0), cannot activate")
+        )
         
-        with patch('app.api.ems.get_fleet_manager', return_value=mock_fleet_manager):
-            async with AsyncClient(app=app, base_url="http://test") as client:
-                response = await client.post(
-                    "/api/activate",
-                    json={"activationPowerInKw": 100.0}
-                )
+        response = await client.post(
+            "/api/activate",
+            json={"activationPowerInKw": 100.0}
+        )
         
         assert response.status_code == 409
         data = response.json()
@@ -130,31 +144,26 @@ class TestEMSDeactivateEndpoint:
     """Tests for POST /api/deactivate endpoint."""
     
     @pytest.mark.asyncio
-    async def test_deactivate_success(self, mock_fleet_manager):
+    async def test_deactivate_success(self, client, mock_maestro):
         """Verify successful deactivation."""
-        with patch('app.api.ems.get_fleet_manager', return_value=mock_fleet_manager):
-            async with AsyncClient(app=app, base_url="http://test") as client:
-                response = await client.post(
-                    "/api/deactivate",
-                    json={}
-                )
+        response = await client.post(
+            "/api/deactivate",
+            json={}
+        )
         
         assert response.status_code == 200
         data = response.json()
         assert data["accepted"] is True
     
     @pytest.mark.asyncio
-    async def test_deactivate_idempotent(self, mock_fleet_manager):
+    async def test_deactivate_idempotent(self, client, mock_maestro):
         """Verify deactivation is idempotent (success when already standby)."""
-        mock_fleet_manager.status.state = FleetState.STANDBY
-        mock_fleet_manager.status.running_status = RunningStatus.STANDBY
+        mock_maestro.running_status = RunningStatus.STANDBY
         
-        with patch('app.api.ems.get_fleet_manager', return_value=mock_fleet_manager):
-            async with AsyncClient(app=app, base_url="http://test") as client:
-                response = await client.post(
-                    "/api/deactivate",
-                    json={}
-                )
+        response = await client.post(
+            "/api/deactivate",
+            json={}
+        )
         
         assert response.status_code == 200
         data = response.json()
@@ -165,18 +174,16 @@ class TestEMSErrorResponses:
     """Tests for error response format compliance."""
     
     @pytest.mark.asyncio
-    async def test_error_response_format(self, mock_fleet_manager):
+    async def test_error_response_format(self, client, mock_maestro):
         """Verify all error responses match EMS spec format."""
-        mock_fleet_manager.activate = AsyncMock(
+        mock_maestro.activate = AsyncMock(
             return_value=(False, "Test error message")
         )
         
-        with patch('app.api.ems.get_fleet_manager', return_value=mock_fleet_manager):
-            async with AsyncClient(app=app, base_url="http://test") as client:
-                response = await client.post(
-                    "/api/activate",
-                    json={"activationPowerInKw": 100.0}
-                )
+        response = await client.post(
+            "/api/activate",
+            json={"activationPowerInKw": 100.0}
+        )
         
         data = response.json()
         
@@ -10,10 +10,13 @@ from app.models.ems import RunningStatus
 from app.models.state import FleetState, MinerState
 from app.models.miner import MinerInfo
 
+# Shares data/grid_stabilization.db with test_miner_discovery; same worker
+pytestmark = pytest.mark.xdist_group("fleet_mgr")
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def mock_settings():
-    """Create mock settings."""
+    """Create mock settings (read-only, shared across the module)."""
     settings = MagicMock()
     settings.poll_interval_seconds = 5
     settings.min_power_threshold_kw = 1.0
@@ -0,0 +1,29 @@
+"""
+Tests for the miner control helpers.
+"""
+import pytest
+
+from app.services.miner_control import DEFAULT_MINER_POWER_KW, estimate_miner_power_kw
+
+
+class TestEstimateMinerPower:
+    """Tests for the model → rated power lookup."""
+
+    @pytest.mark.parametrize("model,expected", [
+        ("Antminer S9 (vnish 3.9.0)", 1.4),
+        ("Antminer S17 Pro", 2.8),
+        ("Antminer S17", 2.4),
+        ("Antminer S19 XP", 3.25),
+        ("Antminer S21", 3.5),
+        ("Antminer T9+", 1.45),
+        ("Antminer T19", 3.15),
+        ("Whatsminer M30S", 3.4),
+        ("Avalon 1246", DEFAULT_MINER_POWER_KW),
+    ])
+    def test_known_models(self, model, expected):
+        """Verify each model family maps to its rated power."""
+        assert estimate_miner_power_kw(model) == expected
+
+    def test_series_priority_when_several_match(self):
+        """S9 wins over T-series tokens appearing earlier in the string."""
+        assert estimate_miner_power_kw("t19 s9") == 1.4
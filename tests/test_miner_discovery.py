@@ -0,0 +1,878 @@
+"""
+Tests for the miner discovery service and its Vnish/CGMiner clients.
+"""
+import httpx
+import pytest
+from unittest.mock import patch
+
+from app.services import miner_discovery
+from app.services.miner_discovery import (
+    HttpxVnishTransport,
+    VnishWebAPI,
+    _build_digest_header,
+    _parse_digest_challenge,
+)
+
+# Shares data/grid_stabilization.db with test_fleet_manager; same worker
+pytestmark = pytest.mark.xdist_group("fleet_mgr")
+
+
+RFC2617_CHALLENGE = (
+    'Digest realm="testrealm@host.com", qop="auth,auth-int", '
+    'nonce="dcd98b7102dd2f0e8b11d0f600bfb0c093", '
+    'opaque="5ccc069c403ebaf9f0171e9517f40e41"'
+)
+
+
+class TestDigestAuth:
+    """Tests for the cached digest-auth challenge."""
+
+    def test_parse_challenge(self):
+        """Verify realm/nonce/qop/opaque are extracted."""
+        challenge = _parse_digest_challenge(RFC2617_CHALLENGE)
+
+        assert challenge.realm == "testrealm@host.com"
+        assert challenge.nonce == "dcd98b7102dd2f0e8b11d0f600bfb0c093"
+        assert challenge.qop == "auth"
+        assert challenge.opaque == "5ccc069c403ebaf9f0171e9517f40e41"
+
+    def test_parse_rejects_unsupported(self):
+        """Non-digest and non-MD5 challenges are left to httpx.DigestAuth."""
+        assert _parse_digest_challenge('Basic realm="x"') is None
+        assert _parse_digest_challenge('Digest realm="x", nonce="n", algorithm=SHA-256') is None
+
+    def test_build_header_matches_rfc2617_example(self):
+        """Verify the response hash against the RFC 2617 worked example."""
+        challenge = _parse_digest_challenge(RFC2617_CHALLENGE)
+
+        with patch.object(miner_discovery.os, "urandom", return_value=bytes.fromhex("0a4f113b")):
+            header = _build_digest_header(
+                challenge, "Mufasa", "Circle Of Life", "GET", "/dir/index.html"
+            )
+
+        assert 'response="6629fae49393a05397450978507c4ef1"' in header
+        assert "nc=00000001" in header
+
+    @pytest.mark.asyncio
+    async def test_challenge_reused_across_calls(self):
+        """Only the first call pays for the 401 round trip."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if "authorization" not in request.headers:
+                return httpx.Response(401, headers={
+                    "WWW-Authenticate": 'Digest realm="antMiner", nonce="abc", qop="auth"'
+                })
+            return httpx.Response(200, json={"minertype": "Antminer S9"})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            vnish = VnishWebAPI(
+                "10.0.0.1", port=80, username="root", password="root",
+                transport=HttpxVnishTransport(client),
+            )
+            miner_discovery._digest_challenges.pop(vnish.base_url, None)
+
+            first = await vnish._send("GET", f"{vnish.base_url}/cgi-bin/get_system_info.cgi")
+            second = await vnish._send("GET", f"{vnish.base_url}/cgi-bin/get_system_info.cgi")
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert len(requests) == 3
+        assert "nc=00000002" in requests[-1].headers["authorization"]
+
+
+class TestVnishTransport:
+    """Tests for the shared Vnish HTTP transport."""
+
+    @pytest.mark.asyncio
+    async def test_httpx_transport_maps_timeout(self):
+        """Backend timeouts surface as asyncio.TimeoutError."""
+        import asyncio
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ReadTimeout("slow", request=request)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            transport = HttpxVnishTransport(client)
+            with pytest.raises(asyncio.TimeoutError):
+                await transport.request("GET", "http://10.0.0.1/", timeout=1.0)
+
+    def test_transport_must_implement_request(self):
+        """A transport without request() fails at construction."""
+        class Incomplete(miner_discovery.VnishTransport):
+            pass
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_aiohttp_session_from_old_loop_is_closed(self):
+        """Moving to a new event loop closes the previous loop's session."""
+        import asyncio
+
+        transport = miner_discovery.AiohttpVnishTransport()
+
+        def run_in_fresh_loop(coro):
+            loop = asyncio.new_event_loop()
+            try:
+                return loop.run_until_complete(coro)
+            finally:
+                loop.close()
+
+        first = run_in_fresh_loop(transport._get_session())
+        second = run_in_fresh_loop(transport._get_session())
+
+        assert first.closed
+        assert second is not first
+        run_in_fresh_loop(transport.aclose())
+
+    def test_default_backend_is_aiohttp(self):
+        """The shared transport uses aiohttp unless configured otherwise."""
+        miner_discovery._vnish_transport = None
+        try:
+            transport = miner_discovery.get_vnish_transport()
+            assert isinstance(transport, miner_discovery.AiohttpVnishTransport)
+            assert miner_discovery.get_vnish_transport() is transport
+        finally:
+            miner_discovery._vnish_transport = None
+
+
+class TestSystemInfoCache:
+    """Tests for the per-IP Vnish system info / config cache."""
+
+    @pytest.mark.asyncio
+    async def test_sysinfo_cached_until_reboot(self):
+        """System info is fetched once, then re-fetched after a reboot command."""
+        from app.services.miner_discovery import DiscoveredMiner
+
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            return httpx.Response(200, json={"minertype": "Antminer S9 (vnish 3.9.0)"})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            vnish = VnishWebAPI("10.0.0.2", transport=HttpxVnishTransport(client))
+            miner_discovery.invalidate_vnish_cache(vnish.host)
+
+            await vnish.get_system_info()
+            await vnish.get_system_info()
+            assert len(calls) == 1
+
+            DiscoveredMiner(ip="10.0.0.2").mark_command_sent('reboot')
+            await vnish.get_system_info()
+            assert len(calls) == 2
+
+            await vnish.get_system_info(use_cache=False)
+            assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_config_invalidated_by_write(self):
+        """Posting a config drops the cached get_config result."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append((request.method, request.url.path))
+            return httpx.Response(200, json={"bitmain-freq": "550"})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            vnish = VnishWebAPI("10.0.0.3", transport=HttpxVnishTransport(client))
+            miner_discovery.invalidate_vnish_cache(vnish.host)
+
+            await vnish.get_config()
+            await vnish.get_config()
+            await vnish.set_fan_config(manual_pwm=50)
+            await vnish.get_config()
+
+        assert [c for c in calls if c[0] == "GET"] == [
+            ("GET", "/cgi-bin/get_miner_conf.cgi"),
+            ("GET", "/cgi-bin/get_miner_conf.cgi"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_read_during_write_is_not_cached(self):
+        """A get_config racing the POST must not pin the pre-write config."""
+        import asyncio
+
+        config = {"bitmain-freq": "550"}
+        post_started = asyncio.Event()
+        release_post = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "POST":
+                post_started.set()
+                await release_post.wait()
+                config["bitmain-freq"] = "600"
+                return httpx.Response(200, text="ok")
+            return httpx.Response(200, json=dict(config))
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            vnish = VnishWebAPI("10.0.0.4", transport=HttpxVnishTransport(client))
+            miner_discovery.invalidate_vnish_cache(vnish.host)
+
+            write = asyncio.create_task(
+                vnish._post_config("/cgi-bin/set_miner_conf_custom.cgi", {"bitmain-freq": "600"})
+            )
+            await post_started.wait()
+            assert (await vnish.get_config())["bitmain-freq"] == "550"
+            release_post.set()
+            await write
+
+            assert (await vnish.get_config())["bitmain-freq"] == "600"
+
+
+class TestChipHashrateParsing:
+    """Tests for chip_hr.json board parsing."""
+
+    def test_parse_board_orders_by_chip_index(self):
+        """Chips come back ordered by index with empty values as 0."""
+        from app.services.miner_discovery import parse_chip_board
+
+        board = {"Asic10": "70", "Asic02": "", "Asic01": "67", "Asic03": "x", "freq": "550"}
+
+        indices, hashrates = parse_chip_board(board)
+
+        assert indices == [1, 2, 10]
+        assert hashrates == [67, 0, 70]
+
+
+class TestConfigWriteCoalescing:
+    """Tests for debounced Vnish config writes."""
+
+    @pytest.mark.asyncio
+    async def test_burst_of_writes_sent_as_one_post(self):
+        """Concurrent fan config writes collapse into one POST, last write wins."""
+        import asyncio
+        from urllib.parse import parse_qs
+
+        posts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            posts.append(parse_qs(request.content.decode()))
+            return httpx.Response(200, text="ok")
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            vnish = VnishWebAPI("10.0.0.4", transport=HttpxVnishTransport(client))
+
+            results = await asyncio.gather(
+                vnish.set_fan_config(manual_pwm=40),
+                vnish.set_fan_config(manual_pwm=60, immersion_mode=True),
+                vnish.set_fan_config(manual_pwm=80),
+            )
+
+        assert len(posts) == 1
+        assert posts[0]["_ant_fan_customize_value"] == ["80"]
+        assert posts[0]["_ant_fan_rpm_off"] == ["1"]
+        assert results[0] == results[2]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_flush_releases_waiters(self):
+        """Cancelling the debounce (e.g. shutdown) cancels waiters and clears the batch."""
+        import asyncio
+
+        vnish = VnishWebAPI("10.0.0.5", transport=HttpxVnishTransport())
+        key = (vnish.host, "/cgi-bin/set_miner_conf_custom.cgi")
+
+        write = asyncio.create_task(vnish.set_fan_config(manual_pwm=40))
+        await asyncio.sleep(0)
+        pending = miner_discovery._pending_config_writes[key]
+        await asyncio.sleep(0)
+        pending.flush_task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(write, timeout=1)
+        assert key not in miner_discovery._pending_config_writes
+
+
+class TestDiscoverMiners:
+    """Tests for the network scan worker pool."""
+
+    @pytest.mark.asyncio
+    async def test_scan_visits_every_host_with_bounded_workers(self):
+        """Every host is probed once and at most concurrent_scans run at a time."""
+        import asyncio
+        from app.services.miner_discovery import DiscoveredMiner, MinerDiscoveryService
+
+        service = MinerDiscoveryService()
+        probed = []
+        in_flight = 0
+        peak = 0
+
+        async def fake_probe(ip, port):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            probed.append(ip)
+            in_flight -= 1
+            if ip.endswith(".7"):
+                raise RuntimeError("boom")
+            return DiscoveredMiner(ip=ip, is_online=True) if ip.endswith("0") else None
+
+        with patch.object(service, "_probe_miner", side_effect=fake_probe), \
+                patch.object(service, "_save_miners_to_db"):
+            found = await service.discover_miners("10.1.0.0/26", concurrent_scans=4)
+
+        assert sorted(probed) == sorted(f"10.1.0.{i}" for i in range(1, 63))
+        assert peak <= 4
+        assert sorted(m.ip for m in found) == sorted(f"10.1.0.{i}" for i in range(10, 61, 10))
+
+
+class TestSnapshotPersistence:
+    """Tests for batched, throttled miner snapshots."""
+
+    @pytest.mark.asyncio
+    async def test_snapshots_written_in_one_batch_and_throttled(self):
+        """Due snapshots go out in one batch call; a second call is throttled."""
+        from unittest.mock import MagicMock
+        from app.services.miner_discovery import DiscoveredMiner, MinerDiscoveryService
+
+        service = MinerDiscoveryService()
+        service.db = MagicMock()
+        miners = [DiscoveredMiner(ip=f"10.2.0.{i}", hashrate_ghs=13500.0) for i in range(3)]
+
+        await service._save_miner_snapshots(miners)
+        await service._save_miner_snapshots(miners)
+
+        service.db.save_miner_snapshots_batch.assert_called_once()
+        rows = service.db.save_miner_snapshots_batch.call_args[0][0]
+        assert [row["miner_ip"] for row in rows] == ["10.2.0.0", "10.2.0.1", "10.2.0.2"]
+
+
+class TestExtractPowerInfo:
+    """Tests for parsing CGMiner stats into temperature/fan/power."""
+
+    @pytest.mark.asyncio
+    async def test_antminer_stats(self):
+        """Chip temps, fan RPM and per-chain consumption are reduced correctly."""
+        from app.services.miner_discovery import DiscoveredMiner, MinerDiscoveryService
+
+        service = MinerDiscoveryService()
+        miner = DiscoveredMiner(ip="10.3.0.1")
+        stats = {"STATS": [
+            {"CGMiner": "4.9.0"},
+            {
+                "temp1": 55, "temp2_1": 71, "temp2_6": 74, "temp2_7": 0,
+                "fan3": 4800, "fan6": 5400, "fan_num": 2,
+                "chain_consumption6": 430, "chain_consumption7": 440.5,
+                "chain_consumption8": 420,
+            },
+        ]}
+
+        await service._extract_power_info(miner, stats)
+
+        assert miner.temperature_c == 74
+        assert miner.fan_speed_pct == pytest.approx(90.0)
+        assert miner.power_watts == pytest.approx(1290.5)
+
+
+class TestIdentifyMiner:
+    """Tests for miner identification during discovery."""
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_does_not_block_others(self):
+        """A failing Vnish lookup still lets version/stats/pools be applied."""
+        from unittest.mock import AsyncMock
+        from app.services.miner_discovery import (
+            CGMinerAPI, DiscoveredMiner, FirmwareType, MinerDiscoveryService, MinerType,
+        )
+
+        service = MinerDiscoveryService()
+        miner = DiscoveredMiner(ip="10.4.0.1")
+
+        with patch.object(CGMinerAPI, "get_version", AsyncMock(return_value={
+                    "VERSION": [{"Type": "Antminer S9", "CGMiner": "4.9.0"}]})), \
+                patch.object(CGMinerAPI, "get_stats", AsyncMock(return_value={
+                    "STATS": [{"chain_consumption6": 450, "chain_consumption7": 450}]})), \
+                patch.object(CGMinerAPI, "get_pools", AsyncMock(return_value={
+                    "POOLS": [{"URL": "stratum+tcp://pool:3333", "Status": "Alive"}]})), \
+                patch.object(VnishWebAPI, "get_system_info",
+                             AsyncMock(side_effect=ConnectionError("refused"))):
+            await service._identify_miner(miner, {"SUMMARY": [{"GHS 5s": "13500"}]})
+
+        assert miner.miner_type == MinerType.ANTMINER
+        assert miner.firmware_type == FirmwareType.STOCK
+        assert miner.power_watts == 900
+        assert miner.pool_url == "stratum+tcp://pool:3333"
+        assert miner.is_mining is True
+
+    @pytest.mark.asyncio
+    async def test_sysinfo_cancelled_for_non_antminer(self):
+        """Hosts that aren't Antminers don't wait on the Vnish web UI."""
+        import asyncio
+        from unittest.mock import AsyncMock
+        from app.services.miner_discovery import (
+            CGMinerAPI, DiscoveredMiner, FirmwareType, MinerDiscoveryService, MinerType,
+        )
+
+        service = MinerDiscoveryService(api_timeout=5.0)
+        miner = DiscoveredMiner(ip="10.4.0.2")
+        cancelled = asyncio.Event()
+
+        async def no_web_ui(*args, **kwargs):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def version(*args, **kwargs):
+            await asyncio.sleep(0.01)  # let the sysinfo request get going
+            return {"VERSION": [{"Type": "WhatsMiner M30S", "CGMiner": "btminer"}]}
+
+        with patch.object(CGMinerAPI, "get_version", side_effect=version), \
+                patch.object(CGMinerAPI, "get_stats", AsyncMock(return_value={"STATS": []})), \
+                patch.object(CGMinerAPI, "get_pools", AsyncMock(return_value={"POOLS": []})), \
+                patch.object(VnishWebAPI, "get_system_info", side_effect=no_web_ui):
+            await asyncio.wait_for(
+                service._identify_miner(miner, {"SUMMARY": [{"GHS 5s": "100000"}]}), timeout=1
+            )
+            await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+        assert miner.miner_type == MinerType.WHATSMINER
+        assert miner.firmware_type == FirmwareType.UNKNOWN
+
+
+class TestProbeMiner:
+    """Tests for single-host probing."""
+
+    @pytest.mark.asyncio
+    async def test_failed_vnish_fallback_is_remembered(self):
+        """A host with neither CGMiner nor Vnish isn't re-probed over HTTP next sweep."""
+        from unittest.mock import AsyncMock
+        from app.services.miner_discovery import CGMinerAPI, MinerDiscoveryService
+
+        service = MinerDiscoveryService()
+        sysinfo = AsyncMock(side_effect=ConnectionError("refused"))
+
+        with patch.object(CGMinerAPI, "get_summary", AsyncMock(side_effect=ConnectionError("refused"))), \
+                patch.object(VnishWebAPI, "get_system_info", sysinfo):
+            assert await service._probe_miner("10.5.0.1", 4028) is None
+            assert await service._probe_miner("10.5.0.1", 4028) is None
+
+            service._no_vnish_ttl = 0.0
+            assert await service._probe_miner("10.5.0.1", 4028) is None
+
+        assert sysinfo.await_count == 2
+
+
+class TestClassifyFirmware:
+    """Tests for minertype → firmware classification."""
+
+    @pytest.mark.parametrize("minertype,expected", [
+        ("Antminer S9 (vnish 3.9.0)", (miner_discovery.FirmwareType.VNISH, "3.9.0")),
+        ("Antminer S9 vnish", (miner_discovery.FirmwareType.VNISH, "")),
+        ("Antminer S9 (Braiins OS+)", (miner_discovery.FirmwareType.BRAIINS, "")),
+        ("Antminer S19j Pro", (miner_discovery.FirmwareType.STOCK, "")),
+        ("", (miner_discovery.FirmwareType.UNKNOWN, "")),
+    ])
+    def test_classify(self, minertype, expected):
+        """Verify firmware type and version parsing."""
+        assert miner_discovery._classify_firmware(minertype) == expected
+
+
+class TestFleetAggregates:
+    """Tests for fleet-level counts."""
+
+    @pytest.mark.asyncio
+    async def test_online_count_follows_register_update_remove(self):
+        """online_count sees direct state changes, not just polls."""
+        from app.services.miner_discovery import DiscoveredMiner, MinerDiscoveryService
+
+        service = MinerDiscoveryService()
+        miners = [
+            DiscoveredMiner(ip=f"10.6.0.{i}", is_online=True,
+                            hashrate_ghs=1000.0 * i, power_watts=100.0 * i)
+            for i in range(1, 4)
+        ]
+        for miner in miners:
+            service._register_miner(miner)
+
+        assert service.online_count == 3
+
+        miners[2].is_online = False
+        assert service.online_count == 2
+
+        assert await service.remove_miner(miners[0].id)
+        assert not await service.remove_miner(miners[0].id)
+        assert "10.6.0.1" not in service._miners_by_ip
+        assert service.online_count == 1
+
+
+class TestUpdateMinerStatus:
+    """Tests for per-miner status polling."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_updates_share_one_poll(self):
+        """Two overlapping updates for the same miner poll it once."""
+        import asyncio
+        from app.services.miner_discovery import DiscoveredMiner, MinerDiscoveryService
+
+        service = MinerDiscoveryService()
+        miner = DiscoveredMiner(ip="10.7.0.1")
+        service._register_miner(miner)
+        polls = 0
+
+        async def fake_poll(miner_id, now):
+            nonlocal polls
+            polls += 1
+            await asyncio.sleep(0.01)
+            return miner
+
+        with patch.object(service, "_poll_miner_status", side_effect=fake_poll):
+            first, second = await asyncio.gather(
+                service.update_miner_status(miner.id),
+                service.update_miner_status(miner.id),
+            )
+            assert first is second is miner
+            assert polls == 1
+
+            await service.update_miner_status(miner.id)
+            assert polls == 2
+
+    def test_transition_grace_uses_monotonic_clock(self):
+        """is_transitioning follows the monotonic stamp, not wall-clock time."""
+        from app.services.miner_discovery import DiscoveredMiner
+
+        miner = DiscoveredMiner(ip="10.7.0.2")
+        assert not miner.is_transitioning
+
+        miner.mark_command_sent("wake", grace_seconds=60)
+        assert miner.is_transitioning
+
+        miner.last_command_monotonic -= 61
+        assert not miner.is_transitioning
+
+    def test_miner_timestamps_are_all_naive_utc(self):
+        """Wall-clock stamps stay comparable with each other and MinerState."""
+        from app.services.miner_discovery import DiscoveredMiner
+
+        miner = DiscoveredMiner(ip="10.7.0.3")
+        miner.mark_command_sent("wake")
+        stamps = (miner.last_seen, miner.discovery_time, miner.last_command_time)
+        assert all(stamp.tzinfo is None for stamp in stamps)
+        assert miner.last_command_time >= miner.last_seen
+
+
+class TestSummaryTuple:
+    """Tests for CGMiner summary numeric decoding."""
+
+    def test_string_fields_are_converted(self):
+        from app.services.miner_discovery import SummaryTuple
+
+        parsed = SummaryTuple.from_response(
+            {"SUMMARY": [{"GHS 5s": "13500.5", "Elapsed": "3600"}]}
+        )
+        assert parsed == (13500.5, 3600)
+
+    def test_falls_back_to_average_and_defaults(self):
+        from app.services.miner_discovery import SummaryTuple
+
+        assert SummaryTuple.from_response(
+            {"SUMMARY": [{"GHS 5s": 0, "GHS av": "12000"}]}
+        ).hashrate_ghs == 12000.0
+        assert SummaryTuple.from_response({}) == (0.0, 0)
+
+
+class TestVnishClientCache:
+    """Tests for per-IP VnishWebAPI reuse."""
+
+    def test_clients_reused_and_dropped_with_miner(self):
+        from app.services.miner_discovery import DiscoveredMiner, MinerDiscoveryService
+
+        service = MinerDiscoveryService()
+        miner = DiscoveredMiner(ip="10.7.0.3")
+        service._register_miner(miner)
+
+        vnish = service._get_vnish(miner.ip)
+        assert service._get_vnish(miner.ip) is vnish
+        assert vnish.transport is service._vnish_transport
+        api = service._get_cgminer(miner.ip, miner.port)
+        assert service._get_cgminer(miner.ip, miner.port) is api
+
+        service._unregister_miner(miner.id)
+        assert service._get_vnish(miner.ip) is not vnish
+        assert service._get_cgminer(miner.ip, miner.port) is not api
+
+    def test_miners_indexed_by_ip(self):
+        from app.services.miner_discovery import DiscoveredMiner, MinerDiscoveryService
+
+        service = MinerDiscoveryService()
+        miner = DiscoveredMiner(ip="10.7.0.5")
+        service._register_miner(miner)
+        assert service._miners_by_ip["10.7.0.5"] is miner
+
+        service._unregister_miner(miner.id)
+        assert "10.7.0.5" not in service._miners_by_ip
+
+    def test_sorted_view_cached_until_registry_changes(self):
+        from app.services.miner_discovery import DiscoveredMiner, MinerDiscoveryService
+
+        service = MinerDiscoveryService()
+        for ip in ("10.7.0.9", "10.7.0.10", "10.7.0.2"):
+            service._register_miner(DiscoveredMiner(ip=ip))
+
+        ordered = service.miners_sorted_by_ip
+        assert [m.ip for m in ordered] == ["10.7.0.10", "10.7.0.2", "10.7.0.9"]
+        assert service.miners_sorted_by_ip is ordered
+
+        service._unregister_miner(ordered[0].id)
+        assert [m.ip for m in service.miners_sorted_by_ip] == ["10.7.0.2", "10.7.0.9"]
+
+    @pytest.mark.asyncio
+    async def test_vnish_availability_memoized_until_reboot(self):
+        from app.services.miner_discovery import DiscoveredMiner, MinerDiscoveryService
+
+        service = MinerDiscoveryService()
+        miner = DiscoveredMiner(ip="10.7.0.4")
+        service._register_miner(miner)
+        vnish = service._get_vnish(miner.ip)
+        probes = 0
+
+        async def fake_probe():
+            nonlocal probes
+            probes += 1
+            return True
+
+        async def fake_reboot():
+            return {}
+
+        with patch.object(vnish, "is_vnish_available", side_effect=fake_probe), \
+                patch.object(vnish, "reboot_system", side_effect=fake_reboot):
+            assert await service._vnish_available(miner.ip)
+            assert await service._vnish_available(miner.ip)
+            assert probes == 1
+
+            await service.reboot_miner(miner.id)
+            assert await service._vnish_available(miner.ip)
+            assert probes == 2
+
+
+class TestImportMiners:
+    """Tests for bulk miner import."""
+
+    @pytest.mark.asyncio
+    async def test_probes_overlap_and_save_once(self):
+        import asyncio
+        from app.services.miner_discovery import DiscoveredMiner, MinerDiscoveryService
+
+        service = MinerDiscoveryService()
+        active = peak = 0
+
+        async def fake_probe(ip, port):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return None if ip.endswith(".9") else DiscoveredMiner(ip=ip, port=port)
+
+        configs = [{"ip": f"10.8.0.{i}", "rated_power_watts": 1400.0} for i in range(10)]
+        with patch.object(service, "_probe_miner", side_effect=fake_probe), \
+                patch.object(service, "_save_miners_to_db") as save:
+            await service.import_miners(configs, max_concurrent=4)
+
+        assert peak == 4
+        assert len(service._miners) == 9
+        assert service._miners["10_8_0_0"].rated_power_watts == 1400.0
+        save.assert_called_once()
+        assert len(save.call_args.args[0]) == 9
+
+
+class TestMinerCommands:
+    """Tests for miner control commands."""
+
+    @pytest.mark.asyncio
+    async def test_unanswered_wake_and_reboot_count_as_sent(self):
+        import asyncio
+        from app.services.miner_discovery import (
+            DiscoveredMiner, MinerDiscoveryService, VnishTransport, VnishWebAPI,
+        )
+
+        class HangingTransport(VnishTransport):
+            """reboot_cgminer.cgi / reboot.cgi never answer: time out late."""
+            def __init__(self):
+                self.urls = []
+
+            async def request(self, method, url, *, timeout, **kwargs):
+                self.urls.append(url)
+                await asyncio.sleep(timeout + 0.02)
+                raise asyncio.TimeoutError()
+
+        service = MinerDiscoveryService(api_timeout=0.05)
+        miner = DiscoveredMiner(ip="10.7.0.6")
+        service._register_miner(miner)
+        transport = HangingTransport()
+        service._vnish_clients[miner.ip] = VnishWebAPI(
+            miner.ip, timeout=0.05, transport=transport
+        )
+
+        success, message = await service._enable_miner_pools(miner)
+        assert success, message
+        assert [u.rsplit("/", 1)[1] for u in transport.urls] == ["reboot_cgminer.cgi"]
+
+        success, message = await service.reboot_miner(miner.id)
+        assert success, message
+        assert transport.urls[-1].endswith("/reboot.cgi")
+
+    @pytest.mark.asyncio
+    async def test_retry_backs_off_on_transient_errors_only(self):
+        from app.services.miner_discovery import MinerDiscoveryService
+
+        service = MinerDiscoveryService()
+        calls = 0
+
+        async def flaky():
+            nonlocal calls
+            calls += 1
+            if calls < 3:
+                raise ConnectionError("reset")
+            return True
+
+        with patch("app.services.miner_discovery.asyncio.sleep") as sleep:
+            assert await service._retry(flaky, base=1.0)
+        assert calls == 3
+        delays = [c.args[0] for c in sleep.call_args_list]
+        assert 1.0 <= delays[0] <= 1.5 and 2.0 <= delays[1] <= 2.5
+
+        async def broken():
+            raise ValueError("bad payload")
+
+        with pytest.raises(ValueError):
+            await service._retry(broken)
+
+    @pytest.mark.asyncio
+    async def test_sleep_fallback_retries_transport_failure(self):
+        from app.services.miner_discovery import (
+            DiscoveredMiner, MinerDiscoveryService, MinerPowerMode,
+            VnishResponse, VnishTransport, VnishWebAPI,
+        )
+
+        class FlakyTransport(VnishTransport):
+            """No stop_bmminer.cgi; do_sleep_mode.cgi fails once, then works."""
+            def __init__(self):
+                self.sleep_posts = 0
+
+            async def request(self, method, url, *, timeout, **kwargs):
+                if url.endswith("/stop_bmminer.cgi"):
+                    return VnishResponse(404, "", {})
+                self.sleep_posts += 1
+                if self.sleep_posts == 1:
+                    raise ConnectionError("connection reset")
+                return VnishResponse(200, "ok", {})
+
+        service = MinerDiscoveryService()
+        miner = DiscoveredMiner(ip="10.7.0.8", is_mining=True)
+        service._register_miner(miner)
+        transport = FlakyTransport()
+        service._vnish_clients[miner.ip] = VnishWebAPI(miner.ip, transport=transport)
+
+        with patch("app.services.miner_discovery.asyncio.sleep") as sleep:
+            success, message = await service._disable_miner_pools(miner)
+
+        assert success, message
+        assert transport.sleep_posts == 2
+        sleep.assert_called_once()
+        assert miner.power_mode == MinerPowerMode.IDLE
+
+    @pytest.mark.asyncio
+    async def test_idle_falls_back_to_sleep_when_stop_times_out(self):
+        import asyncio
+        from app.services.miner_discovery import (
+            DiscoveredMiner, MinerDiscoveryService, MinerPowerMode,
+            VnishResponse, VnishTransport, VnishWebAPI,
+        )
+
+        class StopHangsTransport(VnishTransport):
+            """stop_bmminer.cgi never answers; do_sleep_mode.cgi works."""
+            def __init__(self):
+                self.urls = []
+
+            async def request(self, method, url, *, timeout, **kwargs):
+                self.urls.append(url)
+                if url.endswith("/stop_bmminer.cgi"):
+                    await asyncio.sleep(timeout + 0.02)
+                    raise asyncio.TimeoutError()
+                return VnishResponse(200, "ok", {})
+
+        service = MinerDiscoveryService(api_timeout=0.05)
+        miner = DiscoveredMiner(ip="10.7.0.9", is_mining=True)
+        service._register_miner(miner)
+        transport = StopHangsTransport()
+        service._vnish_clients[miner.ip] = VnishWebAPI(
+            miner.ip, timeout=0.05, transport=transport
+        )
+
+        success, message = await service._disable_miner_pools(miner)
+
+        assert success, message
+        assert transport.urls[-1].endswith("/do_sleep_mode.cgi")
+        assert miner.power_mode == MinerPowerMode.IDLE
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_commands_are_coalesced(self):
+        import asyncio
+        from app.services.miner_discovery import DiscoveredMiner, MinerDiscoveryService
+
+        service = MinerDiscoveryService()
+        miner = DiscoveredMiner(ip="10.7.0.7")
+        service._register_miner(miner)
+        sent = 0
+
+        async def slow_reboot():
+            nonlocal sent
+            sent += 1
+            await asyncio.sleep(0.01)
+            return True
+
+        with patch.object(service._get_vnish(miner.ip), "reboot_system", side_effect=slow_reboot):
+            results = await asyncio.gather(
+                service.reboot_miner(miner.id),
+                service.reboot_miner(miner.id),
+            )
+            assert sent == 1
+            assert results[0] == results[1]
+            assert not service._inflight_commands
+
+            await service.reboot_miner(miner.id)
+            assert sent == 2
+
+
+class TestMinerSaveQueue:
+    """Tests for write-behind miner persistence."""
+
+    @pytest.mark.asyncio
+    async def test_added_miners_saved_in_one_batch(self):
+        import asyncio
+        from app.services.miner_discovery import DiscoveredMiner, MinerDiscoveryService
+
+        service = MinerDiscoveryService()
+
+        async def fake_probe(ip, port):
+            return DiscoveredMiner(ip=ip, port=port)
+
+        with patch.object(service, "_probe_miner", side_effect=fake_probe), \
+                patch.object(service, "_save_miners_to_db") as save:
+            await asyncio.gather(*(service.add_miner(f"10.9.0.{i}") for i in range(5)))
+            await asyncio.sleep(service._save_batch_delay * 3)
+
+            save.assert_called_once()
+            assert len(save.call_args.args[0]) == 5
+
+            await service.add_miner("10.9.0.9")
+            await service._flush_save_queue()
+            assert save.call_count == 2
+            assert [m.ip for m in save.call_args.args[0]] == ["10.9.0.9"]
+            assert service._save_queue.empty()
+
+
+class TestCGMinerStatus:
+    """Tests for CGMiner STATUS unpacking."""
+
+    def test_status_unpacking(self):
+        from app.services.miner_discovery import _cgminer_status
+
+        assert _cgminer_status({"STATUS": [{"STATUS": "S", "Msg": "ok"}]}) == ("S", "ok")
+        assert _cgminer_status({"STATUS": [{"STATUS": "E"}]}) == ("E", "Unknown error")
+        assert _cgminer_status({}) == (None, "Unknown error")
+        assert _cgminer_status({"STATUS": []}) == (None, "Unknown error")
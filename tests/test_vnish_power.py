@@ -0,0 +1,332 @@
+"""
+Tests for the Vnish power/frequency curve service.
+"""
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+import requests
+
+from app.services.miner_discovery import get_cached_pools, invalidate_vnish_cache
+from app.services.vnish_power import (
+    VnishPowerService, _build_form_data, _frequency_form_fields, _set_config_sync
+)
+
+
+@pytest.fixture
+def service():
+    return VnishPowerService()
+
+
+class TestPowerCurveLookups:
+    """Tests for interpolation over the S9 power curve."""
+
+    @pytest.mark.parametrize("power,expected", [
+        (500, (350, 8.2)),     # below curve: clamped to first point
+        (660, (350, 8.2)),
+        (1460, (650, 8.9)),    # exact curve point
+        (1300, (581, 8.8)),    # between 575 MHz and 600 MHz
+        (2500, (800, 9.2)),    # above curve: clamped to last point
+    ])
+    def test_power_to_frequency(self, service, power, expected):
+        assert service.power_to_frequency(power) == expected
+
+    def test_power_interval_matches_bisect(self, service):
+        """The interpolation probe finds the same interval as bisect."""
+        from bisect import bisect_left
+
+        powers = service._powers
+        for target in range(powers[0] + 1, powers[-1] + 1):
+            assert service._power_interval(target) == bisect_left(powers, target)
+
+    def test_brackets_reconstruct_target(self, service):
+        powers, freqs = service._powers, service._freqs
+        for target in (661, 1000, 1405, 1899):
+            i, ratio = service._bracket_by_power(target)
+            assert 0 < ratio <= 1
+            assert powers[i - 1] + ratio * (powers[i] - powers[i - 1]) == pytest.approx(target)
+        for freq in (350, 462, 625, 800):
+            i, ratio = service._bracket_by_frequency(freq)
+            assert 0 <= ratio <= 1
+            assert freqs[i - 1] + ratio * (freqs[i] - freqs[i - 1]) == pytest.approx(freq)
+
+    @pytest.mark.parametrize("freq,expected", [
+        (175, 330),    # extrapolated below curve
+        (350, 660),
+        (625, 1405),   # midway between 600 MHz and 650 MHz
+        (800, 1900),
+        (900, 2137),   # extrapolated above curve
+    ])
+    def test_frequency_to_power(self, service, freq, expected):
+        assert service.frequency_to_power(freq) == expected
+
+    @pytest.mark.parametrize("freq,expected", [
+        (300, 8.9),    # outside curve: default voltage
+        (350, 8.2),
+        (418, 8.4),
+        (800, 9.2),
+    ])
+    def test_voltage_for_frequency(self, service, freq, expected):
+        assert service.get_voltage_for_frequency(freq) == expected
+
+
+class TestSnapToValidFrequency:
+    """Tests for snapping to the firmware's frequency list."""
+
+    @pytest.mark.parametrize("freq,expected", [
+        (404, 404),    # exact valid value
+        (405, 404),    # tie between 404 and 406 picks the lower
+        (407, 406),    # tie between 406 and 408 picks the lower
+        (410, 408),
+        (540, 537),
+        (50, 300),     # below list, then clamped to min_frequency
+        (2000, 800),   # above list, then clamped to max_frequency
+    ])
+    def test_snap(self, service, freq, expected):
+        assert service._snap_to_valid_frequency(freq) == expected
+
+
+class TestLookupMemo:
+    """Tests for memoized curve lookups."""
+
+    def test_power_to_frequency_memo_tracks_frequency_limits(self, service):
+        assert service.power_to_frequency(1900) == (800, 9.2)
+        assert service.power_to_frequency(1900) == (800, 9.2)
+
+        service.max_frequency = 700
+        assert service.power_to_frequency(1900) == (700, 9.2)
+
+    def test_memo_is_bounded(self, service):
+        from app.services import vnish_power
+
+        for freq in range(vnish_power._MEMO_MAX_ENTRIES + 10):
+            service.frequency_to_power(freq)
+        assert len(service._f2p_memo) <= vnish_power._MEMO_MAX_ENTRIES
+
+    def test_min_useful_power_follows_min_frequency(self, service):
+        assert service._min_useful_power == service.frequency_to_power(300)
+        assert service.calculate_swing_miner_frequency(100, 1400)[2] == service._min_useful_power
+
+        service.min_frequency = 400
+        assert service._min_useful_power == service.frequency_to_power(400)
+        assert service.calculate_swing_miner_frequency(100, 1400)[:1] == (400,)
+
+
+class TestPowerAllocation:
+    """Tests for the full + swing fleet allocation."""
+
+    def test_full_swing_idle_split(self, service):
+        miners = [
+            {"ip": "10.0.0.3", "is_online": True},
+            {"ip": "10.0.0.1", "is_online": True},
+            {"ip": "10.0.0.4", "is_online": False},
+            {"ip": "10.0.0.2", "is_online": True},
+        ]
+        allocation = service.get_power_allocation(3.9, miners, full_power_watts=1460)
+
+        assert [(a["ip"], a["action"]) for a in allocation] == [
+            ("10.0.0.1", "full"),
+            ("10.0.0.2", "full"),
+            ("10.0.0.3", "swing"),
+        ]
+        assert allocation[2]["frequency"] == 462
+        assert allocation[2]["estimated_power"] == service.frequency_to_power(462)
+
+    def test_remainder_below_useful_power_idles(self, service):
+        miners = [{"ip": f"10.0.0.{i}", "is_online": True} for i in range(1, 4)]
+        allocation = service.get_power_allocation(1.7, miners, full_power_watts=1460)
+
+        assert [a["action"] for a in allocation] == ["full", "idle", "idle"]
+        assert sum(a["estimated_power"] for a in allocation) == 1460
+
+    def test_no_online_miners(self, service):
+        assert service.get_power_allocation(5.0, [{"ip": "10.0.0.1"}]) == []
+
+    @pytest.mark.parametrize("target_kw,actions", [
+        (10.0, ["full", "full"]),      # more than the fleet can draw
+        (0.0, ["idle", "idle"]),
+        (-1.0, ["idle", "idle"]),
+    ])
+    def test_target_outside_fleet_range(self, service, target_kw, actions):
+        miners = [{"ip": f"10.0.0.{i}", "is_online": True} for i in range(1, 3)]
+        allocation = service.get_power_allocation(target_kw, miners, full_power_watts=1460)
+
+        assert [a["action"] for a in allocation] == actions
+
+
+class TestHttpClients:
+    """Tests for pooled HTTP clients."""
+
+    @pytest.mark.asyncio
+    async def test_session_reused_per_host_and_closed(self, service):
+        session = service._get_session("10.0.0.1", "root", "root")
+        assert service._get_session("10.0.0.1", "root", "root") is session
+        assert session.auth.username == "root"
+
+        service._get_session("10.0.0.1", "admin", "secret")
+        assert session.auth.username == "admin"
+
+        client = service._get_async_client()
+        assert service._get_async_client() is client
+
+        await service.close()
+        assert service._sessions == {}
+        assert client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_get_miner_frequency_parses_config(self, service):
+        def handler(request):
+            return httpx.Response(200, content=b'{"bitmain-freq": "575", "pools": []}')
+
+        service._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        assert await service.get_miner_frequency("10.0.0.1") == 575
+        await service.close()
+
+
+class TestFleetFrequencies:
+    """Tests for concurrent fleet frequency updates."""
+
+    @pytest.mark.asyncio
+    async def test_config_writes_run_in_parallel(self, service):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def fake_set_config(session, host, frequency_mhz, voltage_int, voltage, pools):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            if host == "10.0.0.3":
+                raise RuntimeError("boom")
+            return True, f"Frequency set to {frequency_mhz}MHz @ {voltage}V", None
+
+        targets = [(f"10.0.0.{i}", 650, None) for i in range(1, 6)]
+        with patch("app.services.vnish_power._set_config_sync", fake_set_config), \
+                patch("app.services.vnish_power.invalidate_vnish_cache"):
+            results = await service.set_fleet_frequencies(targets)
+        await service.close()
+
+        assert peak > 1
+        assert [ok for ok, _ in results] == [True, True, False, True, True]
+        assert results[2][1] == "boom"
+        assert service._miner_frequencies["10.0.0.1"] == 650
+        assert "10.0.0.3" not in service._miner_frequencies
+        assert service._executor is None
+
+
+class TestConfigForm:
+    """Tests for the Vnish config form builder."""
+
+    def test_form_order_and_dynamic_fields(self):
+        pools = [{"url": "stratum+tcp://pool:3333", "user": "w1", "pass": "x"}]
+        form = _build_form_data(pools, 650, 890)
+        keys = [k for k, _ in form]
+
+        assert len(form) == 50
+        assert len(set(keys)) == 50
+        assert form[:4] == [
+            ("_ant_pool1url", "stratum+tcp://pool:3333"),
+            ("_ant_pool1user", "w1"),
+            ("_ant_pool1pw", "x"),
+            ("_ant_pool2url", ""),
+        ]
+        assert form[keys.index("_ant_freq")] == ("_ant_freq", "650")
+        assert form[keys.index("_ant_voltage")] == ("_ant_voltage", "890")
+        assert keys.index("_ant_nobeeper") < keys.index("_ant_freq") < keys.index("_ant_voltage")
+        assert keys[-1] == "_ant_dchain7"
+
+    def test_frequency_fields_shared_across_miners(self):
+        _frequency_form_fields.cache_clear()
+        a = _build_form_data([{"url": "a"}], 575, 880)
+        b = _build_form_data([{"url": "b"}], 575, 880)
+
+        assert a[9:] == b[9:]
+        assert a[0] != b[0]
+        assert _frequency_form_fields.cache_info().hits == 1
+
+
+class _FakeVnishSession:
+    """Records requests; POSTs answer with the queued status codes."""
+
+    def __init__(self, pools, post_statuses=(200,)):
+        self.pools = pools
+        self.post_statuses = list(post_statuses)
+        self.calls = []
+
+    def get(self, url, timeout):
+        self.calls.append(("GET", url.rsplit("/", 1)[-1]))
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"pools": self.pools}).encode()
+        return response
+
+    def post(self, url, data, timeout):
+        self.calls.append(("POST", url.rsplit("/", 1)[-1]))
+        response = requests.Response()
+        response.status_code = self.post_statuses.pop(0)
+        return response
+
+
+class TestPoolCache:
+    """Tests for skipping the config read with remembered pools."""
+
+    POOLS = [{"url": "stratum+tcp://pool:3333", "user": "w1", "pass": "x"}]
+
+    def test_reads_config_without_known_pools(self):
+        session = _FakeVnishSession(self.POOLS)
+        ok, _, fresh = _set_config_sync(session, "10.0.0.1", 575, 880, 8.8)
+
+        assert ok
+        assert fresh == self.POOLS
+        assert session.calls[:2] == [("GET", "get_miner_conf.cgi"), ("POST", "set_miner_conf_custom.cgi")]
+
+    def test_known_pools_skip_config_read(self):
+        session = _FakeVnishSession(self.POOLS)
+        ok, _, fresh = _set_config_sync(session, "10.0.0.1", 575, 880, 8.8, self.POOLS)
+
+        assert ok
+        assert fresh is None
+        assert ("GET", "get_miner_conf.cgi") not in session.calls
+
+    def test_rejected_write_rereads_config_once(self):
+        session = _FakeVnishSession(self.POOLS, post_statuses=(500, 200))
+        ok, _, fresh = _set_config_sync(session, "10.0.0.1", 575, 880, 8.8, [])
+
+        assert ok
+        assert fresh == self.POOLS
+        assert session.calls[:3] == [
+            ("POST", "set_miner_conf_custom.cgi"),
+            ("GET", "get_miner_conf.cgi"),
+            ("POST", "set_miner_conf_custom.cgi"),
+        ]
+
+    def test_rejected_write_with_fresh_pools_fails(self):
+        session = _FakeVnishSession(self.POOLS, post_statuses=(500,))
+        ok, message, fresh = _set_config_sync(session, "10.0.0.1", 575, 880, 8.8)
+
+        assert not ok
+        assert message == "Failed to set config: HTTP 500"
+        assert fresh is None
+
+    @pytest.mark.asyncio
+    async def test_set_miner_frequency_remembers_pools(self, service):
+        host = "10.0.0.77"
+        session = _FakeVnishSession(self.POOLS, post_statuses=(200, 200))
+        with patch.object(service, "_get_session", return_value=session):
+            assert (await service.set_miner_frequency(host, 575))[0]
+            assert get_cached_pools(host) == self.POOLS
+            assert (await service.set_miner_frequency(host, 600))[0]
+        await service.close()
+
+        assert [c for c in session.calls if c[1] == "get_miner_conf.cgi"] == [("GET", "get_miner_conf.cgi")]
+
+        # Pool writes elsewhere go through invalidate_vnish_cache
+        invalidate_vnish_cache(host, config_only=True)
+        assert get_cached_pools(host) is None